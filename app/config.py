@@ -15,4 +15,112 @@ DB_CONFIG = {
     "username": os.getenv("DB_USER"),
     "password": os.getenv("DB_PASSWORD"),
     "driver": os.getenv("DB_DRIVER", "ODBC Driver 17 for SQL Server")
-}
\ No newline at end of file
+}
+
+
+# ✅ 유저별 민감 단어 임베딩 행렬 캐시 (similarity) - TTL 초: 다른 uvicorn 워커의 등록/삭제가 반영되기까지 최대 지연 (0 이면 만료 없음)
+SIMILARITY_CACHE_MAX_BYTES = int(os.getenv("SIMILARITY_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+SIMILARITY_CACHE_MAX_USERS = int(os.getenv("SIMILARITY_CACHE_MAX_USERS", "10000"))
+SIMILARITY_CACHE_TTL_SEC = float(os.getenv("SIMILARITY_CACHE_TTL_SEC", "60"))
+SIMILARITY_BATCH_MAX_ITEMS = int(os.getenv("SIMILARITY_BATCH_MAX_ITEMS", "256"))
+SIMILARITY_MULTI_MAX_USERS = int(os.getenv("SIMILARITY_MULTI_MAX_USERS", "1000"))
+
+# ✅ 메시지 임베딩 캐시 (같은 문구 반복 검사 시 추론 생략 / TTL 초)
+MESSAGE_EMBEDDING_CACHE_MAX_BYTES = int(os.getenv("MESSAGE_EMBEDDING_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+MESSAGE_EMBEDDING_CACHE_MAX_ENTRIES = int(os.getenv("MESSAGE_EMBEDDING_CACHE_MAX_ENTRIES", "100000"))
+MESSAGE_EMBEDDING_CACHE_TTL_SEC = float(os.getenv("MESSAGE_EMBEDDING_CACHE_TTL_SEC", "600"))
+
+# ✅ 민감 단어 일괄 등록 (임베딩 미니 배치 크기 / 최대 문장 수 / IN 조건 묶음 크기 - MSSQL 파라미터 2100개 제한)
+SIMILARITY_REGISTER_BATCH_SIZE = int(os.getenv("SIMILARITY_REGISTER_BATCH_SIZE", "32"))
+SIMILARITY_REGISTER_MAX_ITEMS = int(os.getenv("SIMILARITY_REGISTER_MAX_ITEMS", "5000"))
+SIMILARITY_BULK_CHUNK_SIZE = min(int(os.getenv("SIMILARITY_BULK_CHUNK_SIZE", "1000")), 2000)
+
+# ✅ 임베딩 모델 변경 시 재임베딩 작업 (시작 시 자동 실행 여부 / 스트리밍 묶음 크기 / 추론 배치 크기)
+SIMILARITY_REEMBED_AUTO_START = os.getenv("SIMILARITY_REEMBED_AUTO_START", "true").lower() == "true"
+SIMILARITY_REEMBED_FETCH_SIZE = int(os.getenv("SIMILARITY_REEMBED_FETCH_SIZE", "1000"))
+SIMILARITY_REEMBED_BATCH_SIZE = int(os.getenv("SIMILARITY_REEMBED_BATCH_SIZE", "128"))
+
+# ✅ 마이크로 배치 추론 스케줄러 (sentiment / embedding 공용)
+INFERENCE_BATCHING_ENABLED = os.getenv("INFERENCE_BATCHING_ENABLED", "true").lower() == "true"
+INFERENCE_MAX_BATCH_SIZE = int(os.getenv("INFERENCE_MAX_BATCH_SIZE", "32"))
+INFERENCE_MAX_WAIT_MS = float(os.getenv("INFERENCE_MAX_WAIT_MS", "5"))
+
+# ✅ 추론 백엔드 (torch | onnx | onnx-int8) - ONNX 파일은 모델 경로 아래 ONNX_MODEL_SUBDIR 에 export (없으면 torch 로 대체)
+INFERENCE_BACKEND = os.getenv("INFERENCE_BACKEND", "torch").lower()
+ONNX_MODEL_SUBDIR = os.getenv("ONNX_MODEL_SUBDIR", "onnx")
+# ONNX intra-op 스레드 수 (0 = ONNX Runtime 기본값, 추론 프로세스 풀이 켜져 있으면 워커에서는 INFERENCE_POOL_THREADS 사용)
+ONNX_INTRA_OP_THREADS = int(os.getenv("ONNX_INTRA_OP_THREADS", "0"))
+
+# ✅ 기동 시 모델 warmup (대표 토큰 길이별 forward pass, 길이마다 배치 1 / INFERENCE_MAX_BATCH_SIZE) / 워커 warmup 대기 시간
+INFERENCE_WARMUP_SEQ_LENGTHS = [int(n) for n in os.getenv("INFERENCE_WARMUP_SEQ_LENGTHS", "16,64,128").split(",") if n.strip()]
+INFERENCE_WARMUP_TIMEOUT_SEC = float(os.getenv("INFERENCE_WARMUP_TIMEOUT_SEC", "300"))
+
+# ✅ 추론 워커 프로세스 풀 (0 이면 사용 안 함) - 모델 로드 후 fork 해 가중치 공유, 워커당 코어 1개 고정 + torch 스레드 수
+#    uvicorn 워커는 1개로 두고 이 풀로 코어를 나눠 쓰는 구성을 전제 (uvicorn 워커마다 풀이 따로 생김)
+INFERENCE_POOL_WORKERS = int(os.getenv("INFERENCE_POOL_WORKERS", "0"))
+INFERENCE_POOL_THREADS = int(os.getenv("INFERENCE_POOL_THREADS", "1"))
+INFERENCE_POOL_PIN_CORES = os.getenv("INFERENCE_POOL_PIN_CORES", "true").lower() == "true"
+INFERENCE_POOL_TIMEOUT_SEC = float(os.getenv("INFERENCE_POOL_TIMEOUT_SEC", "30"))
+
+# ✅ 기동 구성 요소 재시도 (required 구성 요소 최대 시도 횟수 / 첫 대기 시간, 이후 2배씩 최대 STARTUP_RETRY_MAX_BACKOFF_SEC)
+#    모두 실패하면 /health/live 도 503 → 오케스트레이터가 프로세스를 재시작
+STARTUP_RETRY_ATTEMPTS = max(1, int(os.getenv("STARTUP_RETRY_ATTEMPTS", "5")))
+STARTUP_RETRY_BACKOFF_SEC = float(os.getenv("STARTUP_RETRY_BACKOFF_SEC", "2"))
+STARTUP_RETRY_MAX_BACKOFF_SEC = float(os.getenv("STARTUP_RETRY_MAX_BACKOFF_SEC", "60"))
+
+# ✅ 감성 분석 배치 엔드포인트 (길이 버킷 크기 / 최대 요청 수)
+SENTIMENT_BATCH_BUCKET_SIZE = int(os.getenv("SENTIMENT_BATCH_BUCKET_SIZE", "32"))
+SENTIMENT_BATCH_MAX_ITEMS = int(os.getenv("SENTIMENT_BATCH_MAX_ITEMS", "5000"))
+
+# ✅ 감성 2단계 추론 (해시 n-gram 1단계 분류기 confidence 가 기준 미만일 때만 transformer) - 파일이 없으면 사용 안 함
+#    기준은 benchmarks.eval_sentiment_tier --write 로 held-out 셋에서 측정해 모델 파일에 저장한 값 사용 (환경변수로 지정하면 그 값 우선)
+#    측정값도 환경변수도 없으면 1단계를 쓰지 않음
+SENTIMENT_TIER_ENABLED = os.getenv("SENTIMENT_TIER_ENABLED", "true").lower() == "true"
+SENTIMENT_TIER_MODEL_PATH = os.getenv("SENTIMENT_TIER_MODEL_PATH", "models/sentiment_models/hashed_ngram_tier.npz")
+SENTIMENT_TIER_MIN_CONFIDENCE = float(os.getenv("SENTIMENT_TIER_MIN_CONFIDENCE")) if os.getenv("SENTIMENT_TIER_MIN_CONFIDENCE") else None
+
+# ✅ 금칙어 트라이 재빌드 debounce (ms)
+AUTOMATON_REBUILD_DEBOUNCE_MS = float(os.getenv("AUTOMATON_REBUILD_DEBOUNCE_MS", "50"))
+
+# ✅ 금칙어 트라이 스냅샷 파일 (빈 값이면 사용 안 함)
+AUTOMATON_SNAPSHOT_PATH = os.getenv("AUTOMATON_SNAPSHOT_PATH", "snapshots/forbidden_automaton.pkl")
+
+# ✅ 워커 간 금칙어 동기화 (change feed 폴링)
+FORBIDDEN_SYNC_INTERVAL_SEC = float(os.getenv("FORBIDDEN_SYNC_INTERVAL_SEC", "5"))
+FORBIDDEN_SYNC_NOTIFY_PATH = os.getenv("FORBIDDEN_SYNC_NOTIFY_PATH", "snapshots/forbidden_sync.notify")
+FORBIDDEN_SYNC_RETENTION_DAYS = int(os.getenv("FORBIDDEN_SYNC_RETENTION_DAYS", "7"))
+# change id 빈 번호(아직 커밋 안 된 트랜잭션일 수 있음)를 다시 확인하는 최대 시간 (초과 시 롤백/IDENTITY 건너뜀으로 간주)
+FORBIDDEN_SYNC_GAP_TIMEOUT_SEC = float(os.getenv("FORBIDDEN_SYNC_GAP_TIMEOUT_SEC", "300"))
+
+# ✅ 금칙어 후보 주변 형태소 분석 범위 (앞뒤 글자 수, 이후 어절 경계까지 확장)
+FORBIDDEN_MECAB_CONTEXT_CHARS = int(os.getenv("FORBIDDEN_MECAB_CONTEXT_CHARS", "10"))
+
+# ✅ 여러 메시지 금칙어 검사 (워커 풀 크기 / 최대 요청 수)
+FORBIDDEN_BATCH_MAX_CONCURRENCY = int(os.getenv("FORBIDDEN_BATCH_MAX_CONCURRENCY", str(os.cpu_count() or 4)))
+FORBIDDEN_BATCH_MAX_ITEMS = int(os.getenv("FORBIDDEN_BATCH_MAX_ITEMS", "100000"))
+
+# ✅ 금칙어 일괄 등록 INSERT 묶음 크기 (MSSQL 파라미터 2100개 제한: 행당 2개)
+FORBIDDEN_BULK_CHUNK_SIZE = max(1, min(int(os.getenv("FORBIDDEN_BULK_CHUNK_SIZE", "500")), 1000))
+
+# ✅ 고아 민감 단어 정리 (배치당 삭제 행 수 / 주기)
+SENSITIVE_GC_BATCH_SIZE = int(os.getenv("SENSITIVE_GC_BATCH_SIZE", "1000"))
+SENSITIVE_GC_INTERVAL_SEC = float(os.getenv("SENSITIVE_GC_INTERVAL_SEC", "300"))
+
+# ✅ 전체 민감 단어 벡터 인덱스 (IVF) - nlist 0 이면 sqrt(단어 수), 저장 경로가 빈 값이면 저장 안 함
+#    SAVE_INTERVAL 마다 DB 와 차이 동기화 (다른 uvicorn 워커의 변경 반영) 후 변경이 있으면 저장
+SIMILARITY_INDEX_PATH = os.getenv("SIMILARITY_INDEX_PATH", "snapshots/sensitive_index.npz")
+SIMILARITY_INDEX_NLIST = int(os.getenv("SIMILARITY_INDEX_NLIST", "0"))
+SIMILARITY_INDEX_NPROBE = int(os.getenv("SIMILARITY_INDEX_NPROBE", "8"))
+SIMILARITY_INDEX_SAVE_INTERVAL_SEC = float(os.getenv("SIMILARITY_INDEX_SAVE_INTERVAL_SEC", "60"))
+
+# ✅ 민감 단어 임베딩 저장/캐시 형식 (float32 | float16 | int8) - 저장 형식은 새로 등록하는 행에만 적용
+SIMILARITY_EMBEDDING_ENCODING = os.getenv("SIMILARITY_EMBEDDING_ENCODING", "float32")
+SIMILARITY_CACHE_ENCODING = os.getenv("SIMILARITY_CACHE_ENCODING", SIMILARITY_EMBEDDING_ENCODING)
+
+# ✅ 통합 필터 파이프라인 (/filter) - 기본 단계 순서 / 모델 단계 동시 실행 / 차단 시 조기 종료 / 차단 기준
+FILTER_PIPELINE_STAGES = [s.strip() for s in os.getenv("FILTER_PIPELINE_STAGES", "forbidden,sentiment,similarity").split(",") if s.strip()]
+FILTER_PIPELINE_CONCURRENT = os.getenv("FILTER_PIPELINE_CONCURRENT", "true").lower() == "true"
+FILTER_PIPELINE_EARLY_EXIT = os.getenv("FILTER_PIPELINE_EARLY_EXIT", "true").lower() == "true"
+FILTER_PIPELINE_MAX_WORKERS = int(os.getenv("FILTER_PIPELINE_MAX_WORKERS", "8"))
+FILTER_SENTIMENT_BLOCK_CONFIDENCE = float(os.getenv("FILTER_SENTIMENT_BLOCK_CONFIDENCE", "0.9"))
+FILTER_SIMILARITY_THRESHOLD = float(os.getenv("FILTER_SIMILARITY_THRESHOLD", "0.8"))
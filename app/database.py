@@ -16,8 +16,8 @@ DATABASE_URL = (
     f"?driver={driver}&TrustServerCertificate=yes&charset=utf8&autocommit=true"
 )
 
-# ✅ SQLAlchemy 엔진 및 세션
-engine = create_engine(DATABASE_URL, echo=False, future=True)
+# ✅ SQLAlchemy 엔진 및 세션 (executemany 는 pyodbc fast_executemany 로 한 번에 전송)
+engine = create_engine(DATABASE_URL, echo=False, future=True, fast_executemany=True)
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
 
 # ✅ ORM 모델 정의용 Base 클래스
@@ -0,0 +1,210 @@
+# app/filter_utils/automaton_builder.py
+
+import threading
+import time
+import ahocorasick
+import app.state as state
+
+
+def build_automaton(entries: dict[str, str], exclude_for_jamo: set[str]) -> tuple[ahocorasick.Automaton | None, int, int]:
+    """
+    {원형: 자모} 목록으로 새 트라이를 처음부터 생성
+    - value: (원형 단어, "original" | "decomposed", 키 길이) → 매칭 위치 계산용
+    :return: (automaton, 원형 개수, 자모 개수) - 목록이 비어 있으면 automaton 은 None
+    """
+    if not entries:
+        return None, 0, 0
+
+    automaton = ahocorasick.Automaton()
+    inserted_words = set()
+    unique_original_words = set()
+
+    for word, decomposed in entries.items():
+        if word and word not in inserted_words:
+            automaton.add_word(word, (word, "original", len(word)))
+            inserted_words.add(word)
+            unique_original_words.add(word)
+
+        if decomposed and word not in exclude_for_jamo:
+            jamo = decomposed.replace(" ", "")
+            if len(jamo) >= 3 and jamo not in inserted_words:
+                automaton.add_word(jamo, (word, "decomposed", len(jamo)))
+                inserted_words.add(jamo)
+
+    automaton.make_automaton()
+    return automaton, len(unique_original_words), len(inserted_words - unique_original_words)
+
+
+class AutomatonBuilder:
+    """
+    금칙어 트라이 copy-on-write 빌더
+    - 등록/삭제 요청은 pending 목록에만 쌓고, 백그라운드 스레드가 debounce 구간 동안 모아 한 번에 재빌드
+    - 새 트라이를 완성한 뒤 state.forbidden_automaton 참조만 교체 → 검사 요청은 항상 완성된 트라이만 봄
+    - 같은 구간 안에서 추가/삭제가 겹치면 마지막 요청이 우선
+    """
+
+    def __init__(self, exclude_for_jamo: set[str], debounce_ms: float):
+        self.exclude_for_jamo = exclude_for_jamo
+        self.debounce = max(0.0, debounce_ms) / 1000
+
+        self._entries: dict[str, str] = {}  # 현재 트라이에 반영된 목록
+        self._target: dict[str, str] = {}   # 빌드 중인 변경까지 포함한 목록 (중복 변경 판별용)
+        self._pending_adds: dict[str, str] = {}
+        self._pending_removes: set[str] = set()
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+
+        self.version = 0
+        self.builds = 0
+        self.original_count = 0
+        self.jamo_count = 0
+        self.last_build_ms = 0.0
+        self.last_build_at = None
+
+    def add(self, word: str, decomposed: str):
+        self.add_many([(word, decomposed)])
+
+    def add_many(self, entries: list[tuple[str, str]]):
+        with self._lock:
+            for word, decomposed in entries:
+                self._pending_removes.discard(word)
+                if self._target.get(word) == decomposed:
+                    # 이미 반영(또는 반영 중)된 상태 → 재빌드 불필요
+                    self._pending_adds.pop(word, None)
+                else:
+                    self._pending_adds[word] = decomposed
+
+    def remove(self, word: str):
+        self.remove_many([word])
+
+    def remove_many(self, words: list[str]):
+        with self._lock:
+            for word in words:
+                self._pending_adds.pop(word, None)
+                if word in self._target:
+                    self._pending_removes.add(word)
+
+    def request_rebuild(self):
+        """debounce 구간 뒤 백그라운드에서 재빌드 (요청 스레드는 기다리지 않음)"""
+        self._ensure_started()
+        self._wakeup.set()
+
+    def replace_all(self, entries: dict[str, str]) -> ahocorasick.Automaton | None:
+        """전체 목록 교체 후 즉시 빌드 (DB 전체 로딩 시)"""
+        with self._build_lock:
+            entries = dict(entries)
+            with self._lock:
+                self._pending_adds.clear()
+                self._pending_removes.clear()
+                self._target = entries
+            return self._build_and_swap(entries)
+
+    def install(self, entries: dict[str, str], automaton: ahocorasick.Automaton | None, original_count: int, jamo_count: int):
+        """이미 컴파일된 트라이를 그대로 적용 (스냅샷 로딩 시)"""
+        with self._build_lock:
+            entries = dict(entries)
+            with self._lock:
+                self._pending_adds.clear()
+                self._pending_removes.clear()
+                self._target = entries
+
+            self._entries = entries
+            state.forbidden_automaton = automaton
+            self.version += 1
+            self.original_count = original_count
+            self.jamo_count = jamo_count
+            return automaton
+
+    def export(self) -> dict:
+        """스냅샷 저장용 현재 상태 (빌드된 트라이는 이후 변경되지 않으므로 참조만 전달)"""
+        with self._build_lock:
+            return {
+                "entries": dict(self._entries),
+                "automaton": state.forbidden_automaton,
+                "original_count": self.original_count,
+                "jamo_count": self.jamo_count,
+            }
+
+    def flush(self) -> ahocorasick.Automaton | None:
+        """쌓여 있는 변경을 호출 스레드에서 즉시 반영"""
+        with self._build_lock:
+            with self._lock:
+                adds, self._pending_adds = self._pending_adds, {}
+                removes, self._pending_removes = self._pending_removes, set()
+
+                if not adds and not removes:
+                    return state.forbidden_automaton
+
+                entries = dict(self._entries)
+                for word in removes:
+                    entries.pop(word, None)
+                entries.update(adds)
+                self._target = entries
+
+            try:
+                return self._build_and_swap(entries)
+            except Exception:
+                # 실패한 변경은 다음 빌드에서 다시 시도 (그 사이 들어온 변경이 우선)
+                with self._lock:
+                    self._target = self._entries
+                    for word in removes:
+                        if word not in self._pending_adds:
+                            self._pending_removes.add(word)
+                    for word, decomposed in adds.items():
+                        if word not in self._pending_removes:
+                            self._pending_adds.setdefault(word, decomposed)
+                raise
+
+    def _build_and_swap(self, entries: dict[str, str]) -> ahocorasick.Automaton | None:
+        started = time.time()
+        automaton, original_count, jamo_count = build_automaton(entries, self.exclude_for_jamo)
+
+        # 완성된 트라이로 참조만 교체 (검사 요청은 교체 전/후 트라이 중 하나를 온전히 사용)
+        self._entries = entries
+        state.forbidden_automaton = automaton
+
+        self.version += 1
+        self.builds += 1
+        self.original_count = original_count
+        self.jamo_count = jamo_count
+        self.last_build_ms = round((time.time() - started) * 1000, 3)
+        self.last_build_at = time.time()
+        print(f"🔁 트라이 재빌드 완료 (v{self.version}): 원형 {original_count}개, 자모 {jamo_count}개, {self.last_build_ms}ms")
+        return automaton
+
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._worker, name="automaton-builder", daemon=True)
+                self._thread.start()
+
+    def _worker(self):
+        while True:
+            self._wakeup.wait()
+            # debounce: 구간 동안 들어오는 변경을 모아서 한 번만 빌드
+            time.sleep(self.debounce)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"❌ [오류] 트라이 재빌드 실패: {e}")
+
+    def stats(self) -> dict:
+        with self._lock:
+            pending_adds = len(self._pending_adds)
+            pending_removes = len(self._pending_removes)
+        return {
+            "version": self.version,
+            "builds": self.builds,
+            "original_count": self.original_count,
+            "jamo_count": self.jamo_count,
+            "pending_adds": pending_adds,
+            "pending_removes": pending_removes,
+            "last_build_ms": self.last_build_ms,
+            "last_build_at": self.last_build_at,
+            "debounce_ms": round(self.debounce * 1000, 3),
+        }
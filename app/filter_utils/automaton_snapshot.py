@@ -0,0 +1,47 @@
+# app/filter_utils/automaton_snapshot.py
+
+import os
+import pickle
+from sqlalchemy import func
+from app.database import db_session
+from db_models.forbidden import ForbiddenWord
+
+# 트라이 value 구조 등 스냅샷 형식이 바뀌면 올려서 기존 스냅샷을 무효화
+SNAPSHOT_FORMAT_VERSION = 2
+
+
+def get_db_fingerprint() -> str:
+    """금칙어 테이블 버전 지문 (행 수 + 최대 id + 최대 created_at)"""
+    with db_session() as session:
+        count, max_id, max_created_at = session.query(
+            func.count(ForbiddenWord.id),
+            func.max(ForbiddenWord.id),
+            func.max(ForbiddenWord.created_at)
+        ).one()
+
+    created = max_created_at.isoformat() if max_created_at else "-"
+    return f"v{SNAPSHOT_FORMAT_VERSION}:rows={count}:max_id={max_id}:max_created_at={created}"
+
+
+def save_snapshot(path: str, fingerprint: str, snapshot: dict):
+    """컴파일된 트라이 + 원본 목록을 pickle 로 저장 (임시 파일에 쓰고 교체 → 반쯤 쓰인 파일 방지)"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump({"fingerprint": fingerprint, **snapshot}, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+
+
+def load_snapshot(path: str) -> dict | None:
+    if not path or not os.path.exists(path):
+        return None
+
+    try:
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    except Exception as e:
+        print(f"⚠️ [주의] 트라이 스냅샷 읽기 실패 → DB에서 재빌드: {e}")
+        return None
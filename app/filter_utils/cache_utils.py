@@ -0,0 +1,283 @@
+# app/filter_utils/cache_utils.py
+
+import hashlib
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass
+
+import numpy as np
+
+from app.filter_utils.embedding_codec import FLOAT32, CompactMatrix, decode_embedding, resolve_encoding
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """행 단위 L2 정규화 (float32, C-contiguous 보장)"""
+    matrix = np.ascontiguousarray(matrix, dtype=np.float32)
+    if matrix.size == 0:
+        return matrix
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return np.ascontiguousarray(matrix / norms, dtype=np.float32)
+
+
+@dataclass
+class UserEmbeddingMatrix:
+    """유저 한 명의 민감 단어 목록 + 정규화된 임베딩 행렬 (n, dim) - 캐시 인코딩(float32/float16/int8) 그대로 보관"""
+    word_ids: list[int]
+    words: list[str]
+    matrix: CompactMatrix
+    nbytes: int
+
+
+def build_user_matrix(rows, encoding: str = FLOAT32) -> UserEmbeddingMatrix:
+    """
+    (word_id, word, embedding bytes, embedding_encoding) 행 목록을 캐시 항목으로 변환
+    - 모든 행이 캐시 인코딩과 같은 형식으로 저장돼 있으면 bytes 를 그대로 쌓음 (등록 시 이미 정규화됨)
+    - 그 외(기존 float32 행, 인코딩 혼재)는 float32 로 풀어 정규화한 뒤 캐시 인코딩으로 압축
+    """
+    word_ids = [row[0] for row in rows]
+    words = [row[1] for row in rows]
+
+    if not rows:
+        matrix = CompactMatrix(np.empty((0, 0), dtype=np.float32), FLOAT32)
+    elif encoding != FLOAT32 and all(resolve_encoding(row[3]) == encoding for row in rows):
+        matrix = CompactMatrix.from_blobs([row[2] for row in rows], encoding)
+    else:
+        vectors = normalize_rows(np.stack([decode_embedding(row[2], row[3]) for row in rows]))
+        matrix = CompactMatrix.from_float32(vectors, encoding)
+
+    # 행렬 + 단어 문자열 대략치 (파이썬 객체 오버헤드 포함)
+    nbytes = matrix.nbytes + sum(len(w) * 4 + 64 for w in words) + len(word_ids) * 32
+    return UserEmbeddingMatrix(word_ids=word_ids, words=words, matrix=matrix, nbytes=nbytes)
+
+
+class UserMatrixCache:
+    """
+    유저별 민감 단어 임베딩 행렬 LRU + TTL 캐시
+    - 메모리 예산(max_bytes)과 최대 유저 수(max_entries) 중 먼저 닿는 쪽 기준으로 오래된 항목 제거
+    - 로딩 도중 invalidate 된 유저는 결과를 캐시에 저장하지 않음 (오래된 데이터 재삽입 방지)
+    - invalidate 는 현재 프로세스에만 적용 → 다른 uvicorn 워커가 바꾼 목록은 ttl_sec 안에 다시 읽음 (0 이면 만료 없음)
+    """
+
+    def __init__(self, max_bytes: int, max_entries: int, ttl_sec: float = 0):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.ttl = ttl_sec
+        self._entries: OrderedDict[str, UserEmbeddingMatrix] = OrderedDict()
+        self._expires: dict[str, float] = {}
+        self._loading: dict[str, object] = {}
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.expirations = 0
+
+    def get_or_load(self, user_id: str, loader) -> UserEmbeddingMatrix:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and self.ttl > 0 and self._expires[user_id] < time.monotonic():
+                self._remove_locked(user_id)
+                self.expirations += 1
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(user_id)
+                self.hits += 1
+                return entry
+            self.misses += 1
+            token = object()
+            self._loading[user_id] = token
+
+        entry = loader(user_id)
+
+        with self._lock:
+            if self._loading.get(user_id) is token:
+                del self._loading[user_id]
+                self._store(user_id, entry)
+        return entry
+
+    def _store(self, user_id: str, entry: UserEmbeddingMatrix):
+        if entry.nbytes > self.max_bytes:
+            return
+
+        self._remove_locked(user_id)
+        self._entries[user_id] = entry
+        self._expires[user_id] = time.monotonic() + self.ttl
+        self._bytes += entry.nbytes
+
+        while self._entries and (self._bytes > self.max_bytes or len(self._entries) > self.max_entries):
+            self._remove_locked(next(iter(self._entries)))
+            self.evictions += 1
+
+    def _remove_locked(self, user_id: str):
+        entry = self._entries.pop(user_id, None)
+        self._expires.pop(user_id, None)
+        if entry is not None:
+            self._bytes -= entry.nbytes
+
+    def invalidate(self, user_id: str):
+        with self._lock:
+            self._loading.pop(user_id, None)
+            self._remove_locked(user_id)
+            self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._expires.clear()
+            self._loading.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "max_entries": self.max_entries,
+                "ttl_sec": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "expirations": self.expirations,
+            }
+
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_message(text: str) -> str:
+    """캐시 키용 메시지 정규화 (NFC + 앞뒤 공백 제거 + 연속 공백 1개로) - 대소문자는 모델이 구분하므로 유지"""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+
+
+def message_cache_key(normalized_text: str, model_name: str) -> bytes:
+    return hashlib.blake2b(f"{model_name}\x00{normalized_text}".encode("utf-8"), digest_size=16).digest()
+
+
+class EmbeddingCache:
+    """
+    메시지 임베딩 LRU + TTL 캐시 (키: 정규화된 메시지 + 모델 이름의 해시)
+    - 메모리 예산(max_bytes)과 최대 항목 수(max_entries) 중 먼저 닿는 쪽 기준으로 오래된 항목 제거
+    - 같은 키를 동시에 계산 중이면 먼저 시작한 계산 결과를 함께 기다림 (도배 메시지가 한꺼번에 miss 나도 추론 1회)
+    """
+
+    ENTRY_OVERHEAD = 160  # 키 bytes + OrderedDict 노드 + 튜플 대략치
+
+    def __init__(self, max_bytes: int, max_entries: int, ttl_sec: float):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.ttl = ttl_sec
+        self._entries: OrderedDict[bytes, tuple[np.ndarray, float]] = OrderedDict()
+        self._inflight: dict[bytes, Future] = {}
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.expirations = 0
+        self.evictions = 0
+
+    def get(self, key: bytes) -> np.ndarray | None:
+        with self._lock:
+            return self._get_locked(key)
+
+    def _get_locked(self, key: bytes) -> np.ndarray | None:
+        item = self._entries.get(key)
+        if item is not None:
+            vector, expires_at = item
+            if expires_at >= time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return vector
+            self._remove_locked(key)
+            self.expirations += 1
+        return None
+
+    def put(self, key: bytes, vector: np.ndarray):
+        # 여러 요청이 같은 배열을 공유하므로 읽기 전용 사본으로 보관
+        vector = np.array(vector, dtype=np.float32)
+        vector.setflags(write=False)
+        size = vector.nbytes + self.ENTRY_OVERHEAD
+        if self.max_entries <= 0 or size > self.max_bytes:
+            return
+        with self._lock:
+            self._remove_locked(key)
+            self._entries[key] = (vector, time.monotonic() + self.ttl)
+            self._bytes += size
+            while self._entries and (self._bytes > self.max_bytes or len(self._entries) > self.max_entries):
+                evicted_key = next(iter(self._entries))
+                self._remove_locked(evicted_key)
+                self.evictions += 1
+
+    def _remove_locked(self, key: bytes):
+        item = self._entries.pop(key, None)
+        if item is not None:
+            self._bytes -= item[0].nbytes + self.ENTRY_OVERHEAD
+
+    def get_or_compute(self, key: bytes, compute) -> np.ndarray:
+        """캐시 hit 이면 바로 반환, 아니면 compute() 결과를 저장 (같은 키 동시 요청은 한 번만 계산)"""
+        with self._lock:
+            vector = self._get_locked(key)
+            if vector is not None:
+                return vector
+            future = self._inflight.get(key)
+            if future is not None:
+                self.coalesced += 1
+                owner = False
+            else:
+                self.misses += 1
+                future = self._inflight[key] = Future()
+                owner = True
+
+        if not owner:
+            return future.result()
+
+        try:
+            vector = compute()
+        except Exception as e:
+            with self._lock:
+                self._inflight.pop(key, None)
+            future.set_exception(e)
+            raise
+
+        self.put(key, vector)
+        with self._lock:
+            self._inflight.pop(key, None)
+        future.set_result(vector)
+        return vector
+
+    def record_misses(self, count: int):
+        """배치 경로에서 get() 이후 직접 계산한 miss 수 반영"""
+        with self._lock:
+            self.misses += count
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses + self.coalesced
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "max_entries": self.max_entries,
+                "ttl_sec": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "hit_rate": round((self.hits + self.coalesced) / lookups, 4) if lookups else 0.0,
+                "expirations": self.expirations,
+                "evictions": self.evictions,
+            }
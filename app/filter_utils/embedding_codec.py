@@ -0,0 +1,119 @@
+# app/filter_utils/embedding_codec.py
+
+import numpy as np
+
+# sensitive_words.embedding_encoding 값 (NULL 은 기존 float32 행)
+FLOAT32 = "float32"
+FLOAT16 = "float16"
+INT8 = "int8"
+ENCODINGS = (FLOAT32, FLOAT16, INT8)
+
+# 압축 행렬을 float32 로 풀어 계산할 때 한 번에 다루는 행 수 (임시 버퍼가 CPU 캐시에 머무는 크기)
+SCORE_BLOCK_ROWS = 256
+
+
+def resolve_encoding(encoding: str | None) -> str:
+    return encoding or FLOAT32
+
+
+def encode_embedding(vector: np.ndarray, encoding: str) -> bytes:
+    """
+    벡터 1개 → 저장용 bytes
+    - float16: 절반 크기
+    - int8: [float32 scale 4바이트][int8 * dim] (scale = max|x| / 127, 벡터마다 따로)
+    """
+    vector = np.asarray(vector, dtype=np.float32)
+    if encoding == FLOAT16:
+        return vector.astype(np.float16).tobytes()
+    if encoding == INT8:
+        scale = float(np.abs(vector).max()) / 127 or 1.0
+        quantized = np.clip(np.rint(vector / scale), -127, 127).astype(np.int8)
+        return np.float32(scale).tobytes() + quantized.tobytes()
+    return vector.tobytes()
+
+
+def decode_embedding(blob: bytes, encoding: str | None) -> np.ndarray:
+    """저장된 bytes → float32 벡터"""
+    encoding = resolve_encoding(encoding)
+    if encoding == FLOAT16:
+        return np.frombuffer(blob, dtype=np.float16).astype(np.float32)
+    if encoding == INT8:
+        scale = np.frombuffer(blob[:4], dtype=np.float32)[0]
+        return np.frombuffer(blob[4:], dtype=np.int8).astype(np.float32) * scale
+    return np.frombuffer(blob, dtype=np.float32)
+
+
+class CompactMatrix:
+    """
+    (n, dim) 임베딩 행렬을 float32 / float16 / int8(+행별 scale) 그대로 보관하고 점수 계산
+    - matvec 은 SCORE_BLOCK_ROWS 행씩 float32 로 올려 내적 → 압축 형태 전체를 풀어 두지 않음
+    - int8 은 정수 행렬과 내적한 뒤 행별 scale 을 곱함
+    """
+
+    def __init__(self, data: np.ndarray, encoding: str, scales: np.ndarray | None = None):
+        self.data = data
+        self.encoding = encoding
+        self.scales = scales
+
+    @classmethod
+    def from_float32(cls, matrix: np.ndarray, encoding: str) -> "CompactMatrix":
+        matrix = np.ascontiguousarray(matrix, dtype=np.float32)
+        if encoding == FLOAT16:
+            return cls(matrix.astype(np.float16), FLOAT16)
+        if encoding == INT8:
+            if not matrix.size:
+                return cls(matrix.astype(np.int8), INT8, np.empty(len(matrix), dtype=np.float32))
+            scales = np.abs(matrix).max(axis=1) / 127
+            scales[scales == 0] = 1.0
+            data = np.clip(np.rint(matrix / scales[:, None]), -127, 127).astype(np.int8)
+            return cls(data, INT8, scales.astype(np.float32))
+        return cls(matrix, FLOAT32)
+
+    @classmethod
+    def from_blobs(cls, blobs: list[bytes], encoding: str) -> "CompactMatrix":
+        """같은 인코딩으로 저장된 bytes 목록을 변환 없이 그대로 쌓음"""
+        if encoding == INT8:
+            scales = np.array([np.frombuffer(blob[:4], dtype=np.float32)[0] for blob in blobs], dtype=np.float32)
+            data = np.stack([np.frombuffer(blob[4:], dtype=np.int8) for blob in blobs])
+            return cls(data, INT8, scales)
+        dtype = np.float16 if encoding == FLOAT16 else np.float32
+        return cls(np.stack([np.frombuffer(blob, dtype=dtype) for blob in blobs]), encoding)
+
+    @classmethod
+    def concat(cls, matrices: list["CompactMatrix"], encoding: str) -> "CompactMatrix":
+        """여러 행렬을 이어 붙임 (인코딩이 다르면 float32 로 풀어 다시 압축)"""
+        if all(m.encoding == encoding for m in matrices):
+            data = np.concatenate([m.data for m in matrices])
+            scales = np.concatenate([m.scales for m in matrices]) if encoding == INT8 else None
+            return cls(data, encoding, scales)
+        return cls.from_float32(np.concatenate([m.to_float32() for m in matrices]), encoding)
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    @property
+    def nbytes(self) -> int:
+        return self.data.nbytes + (self.scales.nbytes if self.scales is not None else 0)
+
+    def take(self, indices) -> "CompactMatrix":
+        return CompactMatrix(self.data[indices], self.encoding, self.scales[indices] if self.scales is not None else None)
+
+    def to_float32(self) -> np.ndarray:
+        matrix = self.data.astype(np.float32)
+        if self.scales is not None:
+            matrix *= self.scales[:, None]
+        return matrix
+
+    def matvec(self, query: np.ndarray) -> np.ndarray:
+        """행렬 @ query (float32 결과)"""
+        query = np.asarray(query, dtype=np.float32)
+        if self.encoding == FLOAT32:
+            return self.data @ query
+
+        scores = np.empty(len(self.data), dtype=np.float32)
+        for start in range(0, len(self.data), SCORE_BLOCK_ROWS):
+            block = self.data[start:start + SCORE_BLOCK_ROWS].astype(np.float32)
+            scores[start:start + len(block)] = block @ query
+        if self.scales is not None:
+            scores *= self.scales
+        return scores
@@ -0,0 +1,177 @@
+# app/filter_utils/filter_pipeline.py
+
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from app.config import (
+    FILTER_PIPELINE_STAGES,
+    FILTER_PIPELINE_CONCURRENT,
+    FILTER_PIPELINE_EARLY_EXIT,
+    FILTER_PIPELINE_MAX_WORKERS,
+    FILTER_SENTIMENT_BLOCK_CONFIDENCE,
+    FILTER_SIMILARITY_THRESHOLD
+)
+from app.filter_utils.forbidden_utils import check_forbidden_message
+from app.filter_utils.sentiment_utils import predict_sentiment
+from app.filter_utils.similarity_utils import check_message_similarity
+
+FORBIDDEN = "forbidden"
+SENTIMENT = "sentiment"
+SIMILARITY = "similarity"
+STAGES = (FORBIDDEN, SENTIMENT, SIMILARITY)
+
+# 모델 추론 단계 (연속으로 배치되면 동시 실행 가능)
+MODEL_STAGES = {SENTIMENT, SIMILARITY}
+
+BLOCK = "block"
+PASS = "pass"
+SKIPPED = "skipped"
+ERROR = "error"
+
+# 모델 단계 동시 실행용 워커 풀 (실제 추론은 각 스케줄러에서 마이크로 배치로 묶임)
+pipeline_executor = ThreadPoolExecutor(max_workers=FILTER_PIPELINE_MAX_WORKERS, thread_name_prefix="filter-pipeline")
+
+
+def resolve_stages(stages: list[str] | None) -> list[str]:
+    """요청/설정의 단계 목록 검증 (알 수 없는 단계는 ValueError, 중복은 한 번만)"""
+    stages = stages or FILTER_PIPELINE_STAGES
+    unknown = [stage for stage in stages if stage not in STAGES]
+    if unknown:
+        raise ValueError(f"알 수 없는 단계: {unknown} (사용 가능: {list(STAGES)})")
+    return list(dict.fromkeys(stages))
+
+
+def _group_stages(stages: list[str], concurrent: bool) -> list[list[str]]:
+    """실행 그룹으로 묶음 - concurrent 이면 연속된 모델 단계를 한 그룹으로 (그룹 안은 동시 실행)"""
+    groups = []
+    for stage in stages:
+        if concurrent and groups and stage in MODEL_STAGES and groups[-1][-1] in MODEL_STAGES:
+            groups[-1].append(stage)
+        else:
+            groups.append([stage])
+    return groups
+
+
+def _run_forbidden(message: str, policy: dict) -> tuple[str, dict, str | None]:
+    result = check_forbidden_message(message)
+    if result["detected_words"]:
+        return BLOCK, result, f"금칙어 포함: {', '.join(result['detected_words'])}"
+    return PASS, result, None
+
+
+def _run_sentiment(message: str, policy: dict) -> tuple[str, dict, str | None]:
+    result = predict_sentiment(message)
+    if result["label"] == "negative" and result["confidence"] >= policy["sentiment_min_confidence"]:
+        return BLOCK, result, f"부정 감성 (confidence {result['confidence']:.3f})"
+    return PASS, result, None
+
+
+def _run_similarity(message: str, policy: dict) -> tuple[str, dict | None, str | None]:
+    if not policy["user_id"]:
+        return SKIPPED, None, "user_id 없음"
+    result = check_message_similarity(policy["user_id"], message, policy["similarity_threshold"])
+    if result is None:
+        return SKIPPED, None, "등록된 민감 단어 없음"
+    if result["match"]:
+        return BLOCK, result, f"민감 단어 유사: {result['most_similar_word']} ({result['max_similarity']:.3f})"
+    return PASS, result, None
+
+
+_RUNNERS = {
+    FORBIDDEN: _run_forbidden,
+    SENTIMENT: _run_sentiment,
+    SIMILARITY: _run_similarity,
+}
+
+
+def _run_stage(stage: str, message: str, policy: dict) -> dict:
+    """단계 하나 실행 → {stage, verdict, reason, elapsed, data, error} (예외는 error 판정으로 기록)"""
+    started = time.time()
+    try:
+        verdict, data, reason = _RUNNERS[stage](message, policy)
+        error = None
+    except Exception as e:
+        verdict, data, reason, error = ERROR, None, None, str(e)
+        print(f"❌ [오류] 필터 파이프라인 {stage} 단계 실패: {e}")
+    return {
+        "stage": stage,
+        "verdict": verdict,
+        "reason": reason,
+        "elapsed": round(time.time() - started, 4),
+        "data": data,
+        "error": error,
+    }
+
+
+def _skipped(stage: str, reason: str) -> dict:
+    return {"stage": stage, "verdict": SKIPPED, "reason": reason, "elapsed": 0.0, "data": None, "error": None}
+
+
+def run_filter_pipeline(
+    message: str,
+    user_id: str | None = None,
+    stages: list[str] | None = None,
+    concurrent: bool | None = None,
+    early_exit: bool | None = None,
+    similarity_threshold: float | None = None,
+    sentiment_min_confidence: float | None = None
+) -> dict:
+    """
+    금칙어 / 감성 / 민감 단어 유사도 검사를 한 번에 실행하고 최종 판정을 합침
+    - 단계는 stages 순서대로 실행 (기본: 값싼 금칙어 트라이 → 모델 단계)
+    - concurrent 이면 연속된 모델 단계(sentiment, similarity)를 워커 풀에서 동시에 실행
+    - early_exit 이면 차단 판정이 나오는 즉시 반환 (아직 시작하지 않은 단계는 취소, 실행 중인 단계는 결과를 기다리지 않음)
+    - 단계 오류는 error 판정으로 기록하고 나머지 단계는 계속 진행
+    """
+    start_time = time.time()
+
+    stages = resolve_stages(stages)
+    concurrent = FILTER_PIPELINE_CONCURRENT if concurrent is None else concurrent
+    early_exit = FILTER_PIPELINE_EARLY_EXIT if early_exit is None else early_exit
+    policy = {
+        "user_id": user_id,
+        "similarity_threshold": FILTER_SIMILARITY_THRESHOLD if similarity_threshold is None else similarity_threshold,
+        "sentiment_min_confidence": FILTER_SENTIMENT_BLOCK_CONFIDENCE if sentiment_min_confidence is None else sentiment_min_confidence,
+    }
+
+    results = {}
+    blocked_by = None
+    for group in _group_stages(stages, concurrent):
+        if blocked_by and early_exit:
+            for stage in group:
+                results[stage] = _skipped(stage, f"{blocked_by} 단계에서 차단")
+            continue
+
+        if len(group) == 1:
+            results[group[0]] = _run_stage(group[0], message, policy)
+            if results[group[0]]["verdict"] == BLOCK and not blocked_by:
+                blocked_by = group[0]
+            continue
+
+        pending = {pipeline_executor.submit(_run_stage, stage, message, policy): stage for stage in group}
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                stage = pending.pop(future)
+                results[stage] = future.result()
+                if results[stage]["verdict"] == BLOCK and not blocked_by:
+                    blocked_by = stage
+
+            if blocked_by and early_exit:
+                for future, stage in pending.items():
+                    future.cancel()
+                    results[stage] = _skipped(stage, f"{blocked_by} 단계에서 차단")
+                break
+
+    ordered = [results[stage] for stage in stages]
+    return {
+        "message": message,
+        "user_id": user_id,
+        "verdict": BLOCK if blocked_by else PASS,
+        "blocked_by": blocked_by,
+        "stages": ordered,
+        "timing": {
+            **{result["stage"]: result["elapsed"] for result in ordered},
+            "total": round(time.time() - start_time, 4),
+        },
+    }
@@ -0,0 +1,224 @@
+# app/filter_utils/forbidden_sync.py
+
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import func, insert
+from app.database import db_session
+from db_models.forbidden import ForbiddenWordChange
+
+NOTIFY_TICK_SEC = 0.2
+FETCH_LIMIT = 5000
+# 한 번에 이만큼 넘게 건너뛴 id 는 빈 번호로 추적하지 않음 (MSSQL 재시작 시 IDENTITY 캐시 점프 등)
+MAX_GAP_SPAN = FETCH_LIMIT
+# 빈 번호 재확인 IN 조건 묶음 크기 (MSSQL 파라미터 2100개 제한)
+GAP_QUERY_CHUNK = 1000
+
+
+def record_changes(session, changes: list[tuple[str, str | None, str]]):
+    """
+    변경 이력 기록 - 호출자의 트랜잭션 안에서 실행 (금칙어 변경과 함께 커밋/롤백)
+    :param changes: [(word, decomposed_word, "add" | "remove"), ...]
+    """
+    if not changes:
+        return
+    session.execute(
+        insert(ForbiddenWordChange),
+        [{"word": word, "decomposed_word": decomposed, "operation": operation} for word, decomposed, operation in changes]
+    )
+
+
+def get_latest_change_id() -> int:
+    with db_session() as session:
+        return session.query(func.max(ForbiddenWordChange.id)).scalar() or 0
+
+
+def touch_notify_file(path: str):
+    """같은 호스트의 다른 워커에게 변경 알림 (파일 mtime 갱신 - pub/sub 대용)"""
+    if not path:
+        return
+    try:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "a"):
+            os.utime(path, None)
+    except OSError as e:
+        print(f"⚠️ [주의] 동기화 알림 파일 갱신 실패: {e}")
+
+
+class ForbiddenSyncWorker:
+    """
+    change feed 폴링으로 워커 프로세스 간 금칙어 트라이 동기화
+    - 알림 파일 mtime 변경(같은 호스트) 또는 interval_sec 주기(다른 호스트 대비)마다 DB 확인
+    - MAX(id) 만 먼저 조회하고, 새 변경이 있을 때만 id 순서대로 읽어 빌더에 반영 → 백그라운드 재빌드
+    - version = 이 워커가 반영한 가장 큰 change id
+    - IDENTITY 는 커밋 순서가 아니므로 (작은 id 가 큰 id 보다 늦게 커밋될 수 있음) version 아래 빈 번호를 gaps 로 기억해 두고
+      gap_timeout_sec 동안 폴링마다 다시 조회 → 늦게 커밋된 변경도 반영 (시간이 지나도 없으면 롤백된 번호로 보고 제외)
+    - 같은 단어의 변경은 forbidden_words 행 잠금으로 직렬화되고 이력은 그 뒤에 기록되므로, 늦게 반영해도 단어별 순서는 id 순서와 같음
+    """
+
+    def __init__(self, builder, interval_sec: float, notify_path: str, retention_days: int, gap_timeout_sec: float = 300):
+        self.builder = builder
+        self.interval = max(NOTIFY_TICK_SEC, interval_sec)
+        self.notify_path = notify_path
+        self.retention_days = retention_days
+        self.gap_timeout = gap_timeout_sec
+
+        self.version = 0
+        self.gaps = {}  # 빈 change id → 처음 발견한 시각
+        self.late_changes = 0
+        self.applied_changes = 0
+        self.polls = 0
+        self.last_poll_at = None
+        self.last_error = None
+
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._notify_mtime = self._read_notify_mtime()
+        self._last_prune = 0.0
+
+    def start(self, initial_version: int):
+        """전체 로딩 직후 호출 - initial_version 은 로딩 전에 읽은 change id (이후 변경은 재적용, 멱등)"""
+        self.version = initial_version
+        self._seed_gaps(initial_version)
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._worker, name="forbidden-sync", daemon=True)
+            self._thread.start()
+
+    def _seed_gaps(self, initial_version: int):
+        """로딩 시점에 아직 커밋되지 않았을 수 있는 initial_version 이하 빈 번호를 gaps 로 등록"""
+        if initial_version <= 0:
+            return
+        low = max(1, initial_version - MAX_GAP_SPAN + 1)
+        with db_session() as session:
+            present = {
+                row[0] for row in session.query(ForbiddenWordChange.id)
+                .filter(ForbiddenWordChange.id >= low, ForbiddenWordChange.id <= initial_version)
+            }
+        now = time.time()
+        oldest = min(present) if present else initial_version
+        self.gaps = {change_id: now for change_id in range(oldest, initial_version + 1) if change_id not in present}
+
+    def notify(self):
+        """현재 워커에서 변경 발생 → 즉시 폴링 + 다른 워커에 알림"""
+        touch_notify_file(self.notify_path)
+        self._wakeup.set()
+
+    def _read_notify_mtime(self) -> float:
+        try:
+            return os.stat(self.notify_path).st_mtime if self.notify_path else 0.0
+        except OSError:
+            return 0.0
+
+    def _worker(self):
+        next_poll = time.time() + self.interval
+        while True:
+            woken = self._wakeup.wait(timeout=NOTIFY_TICK_SEC)
+            self._wakeup.clear()
+
+            mtime = self._read_notify_mtime()
+            notified = mtime != self._notify_mtime
+            self._notify_mtime = mtime
+
+            if woken or notified or time.time() >= next_poll:
+                try:
+                    self.poll()
+                    self._prune_if_due()
+                    self.last_error = None
+                except Exception as e:
+                    self.last_error = str(e)
+                    print(f"❌ [오류] 금칙어 동기화 실패: {e}")
+                next_poll = time.time() + self.interval
+
+    def poll(self) -> int:
+        """새 변경 + 늦게 커밋된 빈 번호 변경을 빌더에 반영하고 반영한 변경 수 반환"""
+        with self._lock:
+            self.polls += 1
+            self.last_poll_at = time.time()
+            self._expire_gaps()
+
+            columns = (
+                ForbiddenWordChange.id,
+                ForbiddenWordChange.word,
+                ForbiddenWordChange.decomposed_word,
+                ForbiddenWordChange.operation
+            )
+            with db_session() as session:
+                late = []
+                gap_ids = sorted(self.gaps)
+                for start in range(0, len(gap_ids), GAP_QUERY_CHUNK):
+                    late.extend(
+                        session.query(*columns)
+                        .filter(ForbiddenWordChange.id.in_(gap_ids[start:start + GAP_QUERY_CHUNK]))
+                        .all()
+                    )
+
+                latest = session.query(func.max(ForbiddenWordChange.id)).scalar() or 0
+                rows = []
+                if latest > self.version:
+                    rows = (
+                        session.query(*columns)
+                        .filter(ForbiddenWordChange.id > self.version)
+                        .order_by(ForbiddenWordChange.id)
+                        .limit(FETCH_LIMIT)
+                        .all()
+                    )
+
+            for change_id, _, _, _ in late:
+                self.gaps.pop(change_id, None)
+            self.late_changes += len(late)
+
+            now = time.time()
+            previous = self.version
+            for change_id, _, _, _ in rows:
+                if change_id - previous - 1 <= MAX_GAP_SPAN:
+                    for missing in range(previous + 1, change_id):
+                        self.gaps.setdefault(missing, now)
+                previous = change_id
+
+            applied = sorted(late, key=lambda row: row[0]) + rows
+            for _, word, decomposed, operation in applied:
+                if operation == "remove":
+                    self.builder.remove(word)
+                else:
+                    self.builder.add(word, decomposed)
+
+            if applied:
+                self.builder.request_rebuild()
+                self.applied_changes += len(applied)
+            if rows:
+                self.version = rows[-1][0]
+                if len(rows) == FETCH_LIMIT:
+                    self._wakeup.set()  # 남은 변경은 바로 이어서 처리
+
+            return len(applied)
+
+    def _expire_gaps(self):
+        """gap_timeout_sec 가 지나도 나타나지 않은 빈 번호는 롤백된 것으로 보고 제외"""
+        cutoff = time.time() - self.gap_timeout
+        self.gaps = {change_id: seen for change_id, seen in self.gaps.items() if seen >= cutoff}
+
+    def _prune_if_due(self):
+        """보관 기간이 지난 변경 이력 정리 (1시간에 한 번)"""
+        if self.retention_days <= 0 or time.time() - self._last_prune < 3600:
+            return
+        self._last_prune = time.time()
+        cutoff = datetime.now() - timedelta(days=self.retention_days)
+        with db_session() as session:
+            session.query(ForbiddenWordChange).filter(ForbiddenWordChange.created_at < cutoff).delete(synchronize_session=False)
+
+    def stats(self) -> dict:
+        return {
+            "pid": os.getpid(),
+            "version": self.version,
+            "pending_gaps": len(self.gaps),
+            "late_changes": self.late_changes,
+            "applied_changes": self.applied_changes,
+            "polls": self.polls,
+            "last_poll_at": self.last_poll_at,
+            "last_error": self.last_error,
+            "interval_sec": self.interval,
+        }
@@ -1,23 +1,82 @@
 # app/filter_utils/forbidden_utils.py
 
 import hgtk
+import os
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from functools import lru_cache
 import ahocorasick
 from app.database import db_session
 from db_models.forbidden import ForbiddenWord
+from sqlalchemy import delete, text
 from sqlalchemy.exc import IntegrityError
 from datetime import datetime, timedelta
 import app.state as state
+from app.config import (
+    AUTOMATON_REBUILD_DEBOUNCE_MS,
+    AUTOMATON_SNAPSHOT_PATH,
+    FORBIDDEN_SYNC_INTERVAL_SEC,
+    FORBIDDEN_SYNC_NOTIFY_PATH,
+    FORBIDDEN_SYNC_RETENTION_DAYS,
+    FORBIDDEN_SYNC_GAP_TIMEOUT_SEC,
+    FORBIDDEN_MECAB_CONTEXT_CHARS,
+    FORBIDDEN_BATCH_MAX_CONCURRENCY,
+    FORBIDDEN_BULK_CHUNK_SIZE
+)
+from app.filter_utils.automaton_builder import AutomatonBuilder
+from app.filter_utils.automaton_snapshot import get_db_fingerprint, save_snapshot, load_snapshot
+from app.filter_utils.forbidden_sync import ForbiddenSyncWorker, record_changes, get_latest_change_id
 
 from konlpy.tag import Mecab
 # mecab = Mecab()
-mecab = Mecab(dicpath="/opt/homebrew/Cellar/mecab-ko-dic/2.1.1-20180720/lib/mecab/dic/mecab-ko-dic")
+MECAB_DICPATH = "/opt/homebrew/Cellar/mecab-ko-dic/2.1.1-20180720/lib/mecab/dic/mecab-ko-dic"
+
+# MeCab tagger 는 스레드 간 공유가 안전하지 않으므로 스레드마다 별도 인스턴스 사용
+_mecab_local = threading.local()
+
+def get_mecab() -> Mecab:
+    tagger = getattr(_mecab_local, "mecab", None)
+    if tagger is None:
+        tagger = _mecab_local.mecab = Mecab(dicpath=MECAB_DICPATH)
+    return tagger
 
 exclude_for_jamo = set()
 
+# 트라이 변경은 빌더를 통해서만 (새 트라이 생성 후 참조 교체)
+automaton_builder = AutomatonBuilder(exclude_for_jamo, debounce_ms=AUTOMATON_REBUILD_DEBOUNCE_MS)
+
+# 다른 워커의 변경을 change feed 로 받아 반영
+forbidden_sync = ForbiddenSyncWorker(
+    automaton_builder,
+    interval_sec=FORBIDDEN_SYNC_INTERVAL_SEC,
+    notify_path=FORBIDDEN_SYNC_NOTIFY_PATH,
+    retention_days=FORBIDDEN_SYNC_RETENTION_DAYS,
+    gap_timeout_sec=FORBIDDEN_SYNC_GAP_TIMEOUT_SEC
+)
+
 def decompose_text(text: str) -> str:
     return hgtk.text.decompose(text).replace('ᴥ', '')
 
+@lru_cache(maxsize=65536)
+def _decompose_char(ch: str) -> str:
+    return decompose_text(ch)
+
+def decompose_with_offsets(text: str) -> tuple[str, list[int]]:
+    """
+    공백을 제외한 자모 분해 문자열 + 자모 위치 → 원문 글자 위치 매핑
+    (트라이의 자모 키도 공백을 제거해 등록하므로 같은 기준으로 분해)
+    """
+    pieces = []
+    offsets = []
+    for i, ch in enumerate(text):
+        if ch.isspace():
+            continue
+        jamo = _decompose_char(ch)
+        pieces.append(jamo)
+        offsets.extend([i] * len(jamo))
+    return "".join(pieces), offsets
+
 def prepare_forbidden_entry(word: str) -> dict:
     decomposed = decompose_text(word)
     return {"word": word, "decomposed_word": decomposed}
@@ -52,25 +111,52 @@ def register_forbidden_word(word: str) -> dict:
         # ORM 객체 생성 및 추가
         new_entry = ForbiddenWord(word=word, decomposed_word=decomposed)
         session.add(new_entry)
+        record_changes(session, [(word, decomposed, "add")])
 
-        # 트라이 반영
-        add_to_automaton(word, decomposed)
+    # 커밋 이후 트라이 반영
+    add_to_automaton(word, decomposed)
 
-        return {
-            "created": True,
-            "word": word,
-            "decomposed_word": decomposed
-        }
+    return {
+        "created": True,
+        "word": word,
+        "decomposed_word": decomposed
+    }
         
 
+def _insert_forbidden_chunk(session, entries: list[dict]) -> list[tuple[str, str]]:
+    """
+    여러 행을 INSERT 한 번으로 등록 (이미 있는 단어는 서버에서 건너뜀)
+    :return: 실제로 삽입된 (word, decomposed_word) 목록
+    """
+    params = {}
+    values = []
+    for i, entry in enumerate(entries):
+        params[f"w{i}"] = entry["word"]
+        params[f"d{i}"] = entry["decomposed_word"]
+        values.append(f"(:w{i}, :d{i})")
+
+    statement = text(f"""
+        INSERT INTO forbidden_words (word, decomposed_word)
+        OUTPUT inserted.word, inserted.decomposed_word
+        SELECT v.word, v.decomposed_word
+        FROM (VALUES {", ".join(values)}) AS v(word, decomposed_word)
+        WHERE NOT EXISTS (
+            SELECT 1 FROM forbidden_words f WITH (UPDLOCK, HOLDLOCK) WHERE f.word = v.word
+        )
+    """)
+    return [(row[0], row[1]) for row in session.execute(statement, params)]
+
+
 def insert_bulk_forbidden_words(words: list[str]) -> dict:
     """
-    여러 금칙어를 DB에 일괄 등록하고 트라이에 반영 (ORM 방식)
-    - 중복 단어는 등록하지 않고 skipped로 안내
-    - 에러 발생한 단어는 failed로 기록
+    여러 금칙어를 DB에 일괄 등록하고 트라이에 반영 (set 기반)
+    - FORBIDDEN_BULK_CHUNK_SIZE 단위 다중 행 INSERT, 중복 단어는 서버에서 건너뛰고 skipped로 안내
+    - 묶음 INSERT 가 실패하면 해당 묶음만 한 행씩 재시도 → 에러 단어는 failed로 기록
+      (엔진이 autocommit 이라 INSERT 문 하나가 곧 원자 단위, 실패한 묶음은 한 행도 남지 않음)
+    - 트라이는 커밋 이후 한 번만 재빌드
     """
     # 1. 입력 정리: 공백 제거 + 중복 제거 + 빈 값 제거
-    cleaned_words = list(set(w.strip() for w in words if w.strip()))
+    cleaned_words = list(dict.fromkeys(w.strip() for w in words if w.strip()))
 
     if not cleaned_words:
         return {
@@ -80,39 +166,41 @@ def insert_bulk_forbidden_words(words: list[str]) -> dict:
             "message": "⚠️ 등록할 유효한 단어가 없습니다."
         }
 
-    # 2. 기존에 DB에 등록된 단어 조회
-    existing_words = set(get_existing_words(cleaned_words))
-    filtered_words = [w for w in cleaned_words if w not in existing_words]
-    registered = []
-    skipped = list(existing_words) 
+    # 2. 자모 분해 일괄 처리
+    entries = prepare_forbidden_entries(cleaned_words)
+    registered_entries = []
     failed = []
 
     with db_session() as session:
-        for word in filtered_words:
+        for offset in range(0, len(entries), FORBIDDEN_BULK_CHUNK_SIZE):
+            chunk = entries[offset:offset + FORBIDDEN_BULK_CHUNK_SIZE]
             try:
-                decomposed = decompose_text(word)
-                entry = ForbiddenWord(word=word, decomposed_word=decomposed)
-                session.add(entry)
-                session.flush()  # 중복 에러 조기 감지
+                registered_entries.extend(_insert_forbidden_chunk(session, chunk))
+                continue
+            except Exception as e:
+                print(f"⚠️ 묶음 등록 실패 → 한 행씩 재시도: {e}")
 
-                add_to_automaton(word, decomposed)
-                registered.append(word)
+            for entry in chunk:
+                try:
+                    registered_entries.extend(_insert_forbidden_chunk(session, [entry]))
+                except IntegrityError:
+                    print(f"⚠️ 중복으로 스킵된 단어: '{entry['word']}'")
+                except Exception as e:
+                    print(f"❌ '{entry['word']}' 등록 실패: {e}")
+                    failed.append(entry["word"])
 
-            except IntegrityError:
-                print(f"⚠️ 중복으로 스킵된 단어: '{word}'")
-                if isinstance(word, str) and word.strip():  # ✅ 유효한 문자열일 때만 추가
-                    skipped.append(word)
-                session.rollback()
+        record_changes(session, [(word, decomposed, "add") for word, decomposed in registered_entries])
 
-            except Exception as e:
-                print(f"❌ '{word}' 등록 실패: {e}")
-                failed.append(word)
-                session.rollback()
-                
-    # 4. skipped 정리
-    skipped = [w for w in skipped if isinstance(w, str) and w.strip()]
-
-    # 3. 안내 메시지 설정
+    # 3. 트라이는 커밋 이후 한 번만 재빌드
+    if registered_entries:
+        add_many_to_automaton(registered_entries)
+
+    registered = [word for word, _ in registered_entries]
+    registered_set = set(registered)
+    failed_set = set(failed)
+    skipped = [w for w in cleaned_words if w not in registered_set and w not in failed_set]
+
+    # 4. 안내 메시지 설정
     if registered and not failed:
         message = f"✅ {len(registered)}개 등록 완료, {len(skipped)}개는 이미 등록됨"
     elif registered and failed:
@@ -132,10 +220,6 @@ def insert_bulk_forbidden_words(words: list[str]) -> dict:
 
 def load_automaton_from_db() -> ahocorasick.Automaton | None:
     """DB에서 금칙어 로딩하여 트라이 생성 (ORM 방식)"""
-    automaton = ahocorasick.Automaton()
-    inserted_words = set()
-    unique_original_words = set()
-
     try:
         with db_session() as session:
             # ✅ 세션 내에서 필요한 데이터만 추출해서 복사해둠
@@ -145,22 +229,9 @@ def load_automaton_from_db() -> ahocorasick.Automaton | None:
             print("⚠️ [주의] 금칙어가 DB에 등록되어 있지 않습니다.")
             return None
 
-        for word, decomposed in rows:
-            if word and word not in inserted_words:
-                automaton.add_word(word, (word, "original"))
-                inserted_words.add(word)
-                unique_original_words.add(word)
-
-            if decomposed and word not in exclude_for_jamo:
-                jamo = decomposed.replace(" ", "")
-                if len(jamo) >= 3 and jamo not in inserted_words:
-                    automaton.add_word(jamo, (word, "decomposed"))
-                    inserted_words.add(jamo)
-
-        automaton.make_automaton()
-        state.forbidden_automaton = automaton
+        automaton = automaton_builder.replace_all({word: decomposed for word, decomposed in rows})
 
-        print(f"✅ 원형 {len(unique_original_words)}개, 자모 {len(inserted_words - unique_original_words)}개 등록 완료")
+        print(f"✅ 원형 {automaton_builder.original_count}개, 자모 {automaton_builder.jamo_count}개 등록 완료")
 
         return automaton
 
@@ -169,39 +240,105 @@ def load_automaton_from_db() -> ahocorasick.Automaton | None:
         return None
 
 
+def load_automaton() -> ahocorasick.Automaton | None:
+    """
+    기동 시 트라이 로딩
+    - 스냅샷의 DB 지문이 현재 DB와 같으면 스냅샷 그대로 사용
+    - 다르거나 없으면 DB 전체 재빌드 후 스냅샷 갱신
+    """
+    start_time = time.time()
+    # 로딩 전에 읽어 둔 change id 이후 변경은 동기화 워커가 다시 반영 (멱등)
+    change_version = get_latest_change_id()
+    fingerprint = get_db_fingerprint()
+    snapshot = load_snapshot(AUTOMATON_SNAPSHOT_PATH)
+
+    if snapshot and snapshot.get("fingerprint") == fingerprint:
+        automaton = automaton_builder.install(
+            snapshot["entries"],
+            snapshot["automaton"],
+            snapshot["original_count"],
+            snapshot["jamo_count"]
+        )
+        source = "snapshot"
+    else:
+        automaton = load_automaton_from_db()
+        source = "database"
+
+        if automaton is not None and AUTOMATON_SNAPSHOT_PATH:
+            try:
+                save_snapshot(AUTOMATON_SNAPSHOT_PATH, fingerprint, automaton_builder.export())
+            except Exception as e:
+                print(f"⚠️ [주의] 트라이 스냅샷 저장 실패: {e}")
+
+    elapsed = round(time.time() - start_time, 4)
+    state.automaton_load_info = {
+        "source": source,
+        "fingerprint": fingerprint,
+        "change_version": change_version,
+        "load_time": elapsed
+    }
+    print(f"✅ 트라이 로딩 경로: {source} ({elapsed}s, {fingerprint})")
+
+    return automaton
+
+
+def start_forbidden_sync():
+    """
+    워커 간 동기화 스레드 시작 (load_automaton 이후, 추론 워커 fork 이후에 호출)
+    - load_automaton 전에 읽어 둔 change id 부터 폴링
+    """
+    forbidden_sync.start(state.automaton_load_info["change_version"])
+
+
 def add_to_automaton(word: str, decomposed: str):
-    """금칙어 단일 등록 시 트라이에 반영"""
-    if not state.forbidden_automaton:
-        state.forbidden_automaton = ahocorasick.Automaton()
-    
-    if not state.forbidden_automaton.kind:
-        state.forbidden_automaton.make_automaton()
+    """금칙어 단일 등록 시 트라이에 반영 (빌더가 debounce 후 새 트라이로 교체)"""
+    add_many_to_automaton([(word, decomposed)])
+
+
+def add_many_to_automaton(entries: list[tuple[str, str]]):
+    automaton_builder.add_many(entries)
+    automaton_builder.request_rebuild()
+    forbidden_sync.notify()
+
+
+def remove_from_automaton(words: list[str]):
+    """금칙어 삭제 시 트라이에서 제거 (원형/자모 키 모두, 한 번의 재빌드)"""
+    automaton_builder.remove_many(words)
+    automaton_builder.request_rebuild()
+    forbidden_sync.notify()
 
-    # 원형 단어 등록
-    if word not in state.forbidden_automaton:
-        state.forbidden_automaton.add_word(word, (word, "original"))
-        print(f"✅ [추가] '{word}' → 원형 금칙어 등록 완료")
-    else:
-        print(f"⚠️ [중복] '{word}' → 이미 원형 등록됨")
-
-    # 자모 단어 등록
-    jamo = decomposed.replace(" ", "")
-    if word not in exclude_for_jamo and len(jamo) >= 3:
-        if jamo == word:
-            print(f"⚠️ [생략] '{jamo}' → 원형과 자모가 같음 (등록 생략)")
-        elif jamo not in state.forbidden_automaton:
-            state.forbidden_automaton.add_word(jamo, (word, "decomposed"))
-            print(f"✅ [추가] '{jamo}' → 자모 금칙어 등록 완료")
-        else:
-            print(f"⚠️ [중복] '{jamo}' → 이미 자모 등록됨")
 
-    # 꼭 다시 빌드해야 함 (ahocorasick는 build 이후에만 탐색 가능)
-    state.forbidden_automaton.make_automaton()
+def get_automaton_status() -> dict:
+    return {**automaton_builder.stats(), "load": state.automaton_load_info, "sync": forbidden_sync.stats()}
+
+
+def get_forbidden_list_version() -> dict:
+    """현재 워커가 반영한 금칙어 목록 버전 (워커 간 수렴 확인용)"""
+    builder_stats = automaton_builder.stats()
+    return {
+        "pid": os.getpid(),
+        "version": forbidden_sync.version,
+        "automaton_version": builder_stats["version"],
+        "pending_changes": builder_stats["pending_adds"] + builder_stats["pending_removes"]
+    }
 
 ALLOWED_POS_PREFIXES = ('N', 'V', 'M', 'VA', 'XR', 'IC')  # 명사, 동사, 부사, 형용사, 어근, 감탄사
 
+# 금칙어 검사 단계별 통계 (fast path 비율, 누적 시간)
+check_stats_lock = threading.Lock()
+check_stats = {
+    "total": 0,
+    "fast_path": 0,
+    "mecab_runs": 0,
+    "message_chars": 0,
+    "mecab_chars": 0,
+    "scan_time": 0.0,
+    "mecab_time": 0.0,
+    "total_time": 0.0
+}
+
 def extract_meaningful_tokens(message: str) -> list[str]:
-    tokens = mecab.pos(message)
+    tokens = get_mecab().pos(message)
     return [token for token, pos in tokens if not pos.startswith('J') and any(pos.startswith(prefix) for prefix in ALLOWED_POS_PREFIXES)]
 
 def generate_ngrams(tokens: list[str], n_range=(2, 3)) -> set[str]:
@@ -212,52 +349,262 @@ def generate_ngrams(tokens: list[str], n_range=(2, 3)) -> set[str]:
             ngram_set.add(ngram)
     return ngram_set
 
-def check_forbidden_message(message: str) -> dict:
-    """메시지 한 개에 대해 금칙어 포함 여부 검사 (형태소 기반 단어만 검사)"""
+def _hit_windows(message: str, spans: list[tuple[int, int]], context: int) -> list[tuple[int, int]]:
+    """
+    트라이 후보 구간 [start, end) 주변만 형태소 분석하도록 분석 구간 계산
+    - 앞뒤 context 글자만큼 넓힌 뒤 어절(공백) 경계까지 확장, 겹치는 구간은 병합
+    """
+    windows = []
+    for start, end in sorted(spans):
+        start = max(0, start - context)
+        end = min(len(message), end + context)
+        while start > 0 and not message[start - 1].isspace():
+            start -= 1
+        while end < len(message) and not message[end].isspace():
+            end += 1
+
+        if windows and start <= windows[-1][1]:
+            windows[-1] = (windows[-1][0], max(end, windows[-1][1]))
+        else:
+            windows.append((start, end))
+    return windows
+
+
+def _record_check_stats(fast_path: bool, message_chars: int, mecab_chars: int, scan_time: float, mecab_time: float, total_time: float):
+    with check_stats_lock:
+        check_stats["total"] += 1
+        check_stats["fast_path"] += int(fast_path)
+        check_stats["mecab_runs"] += int(not fast_path)
+        check_stats["message_chars"] += message_chars
+        check_stats["mecab_chars"] += mecab_chars
+        check_stats["scan_time"] += scan_time
+        check_stats["mecab_time"] += mecab_time
+        check_stats["total_time"] += total_time
+
+
+def get_check_stats() -> dict:
+    """금칙어 검사 fast path 비율 및 단계별 평균 시간"""
+    with check_stats_lock:
+        stats = dict(check_stats)
+
+    total = stats["total"]
+    mecab_runs = stats["mecab_runs"]
+    return {
+        "total": total,
+        "fast_path": stats["fast_path"],
+        "fast_path_rate": round(stats["fast_path"] / total, 4) if total else 0.0,
+        "mecab_runs": mecab_runs,
+        "mecab_char_ratio": round(stats["mecab_chars"] / stats["message_chars"], 4) if stats["message_chars"] else 0.0,
+        "avg_scan_time": round(stats["scan_time"] / total, 6) if total else 0.0,
+        "avg_mecab_time": round(stats["mecab_time"] / mecab_runs, 6) if mecab_runs else 0.0,
+        "avg_total_time": round(stats["total_time"] / total, 6) if total else 0.0
+    }
+
+
+def _is_jamo(ch: str) -> bool:
+    """완성형이 아닌 낱자 자모 여부 (호환 자모 / 첫가끝 자모)"""
+    return '\u3131' <= ch <= '\u318e' or '\u1100' <= ch <= '\u11ff'
+
+
+def _scan_candidates(message: str, automaton) -> list[dict]:
+    """
+    원문 1회 + 자모 분해문 1회 스캔으로 모든 후보 수집
+    - 원문에서는 원형 키만, 자모 분해문에서는 자모 키만 인정
+    - 자모 매칭 위치는 오프셋 매핑으로 원문 글자 구간 [start, end) 으로 변환
+    """
+    candidates = []
+    for end_index, (word, mode, key_length) in automaton.iter(message):
+        if mode == "original":
+            candidates.append({"word": word, "start": end_index - key_length + 1, "end": end_index + 1, "method": "원형"})
+
+    jamo_text, offsets = decompose_with_offsets(message)
+    for end_index, (word, mode, key_length) in automaton.iter(jamo_text):
+        if mode == "decomposed":
+            start = end_index - key_length + 1
+            candidates.append({
+                "word": word,
+                "start": offsets[start],
+                "end": offsets[end_index] + 1,
+                "method": "자모"
+            })
+    return candidates
+
+
+def _is_eojeol_aligned(message: str, start: int, end: int) -> bool:
+    """구간 [start, end) 가 어절 경계에서 시작하고 끝나는지 (앞 글자 / end 글자가 공백이거나 메시지 끝)"""
+    return (start == 0 or message[start - 1].isspace()) and (end == len(message) or message[end].isspace())
+
+
+def _collapsed_eojeols(message: str, start: int, end: int) -> str:
+    """구간이 걸친 어절들을 이어 붙인 문자열 (구간 안의 공백만 제거, 예: '이거 바 보면' 의 '바 보' → '바보면')"""
+    window_start, window_end = start, end
+    while window_start > 0 and not message[window_start - 1].isspace():
+        window_start -= 1
+    while window_end < len(message) and not message[window_end].isspace():
+        window_end += 1
+    return message[window_start:start] + "".join(message[start:end].split()) + message[end:window_end]
+
+
+def _confirm_candidates(message: str, candidates: list[dict], tokens: set[str], tokenize=None) -> list[dict]:
+    """
+    후보 확정
+    - 원형: 후보 단어가 형태소 토큰으로 존재할 때 (예: '시발점'의 '시발'은 제외)
+    - 자모: 구간에 낱자 자모가 섞인 변형 표기일 때 (예: 'ㅅㅣ발')
+    - 자모 + 공백: 어절 경계에 딱 맞는 띄어 쓴 표기는 그대로 인정 (예: '너 바 보')
+      어절 중간에서 시작하거나 끝나면 (예: '이거 바 보면', '이 개 새로') 걸친 어절을 붙여 형태소 분석 → 단어가 토큰일 때만 인정
+    - 완성형 글자로만 이뤄진 구간은 원형 검사가 이미 판단하므로 제외
+    - tokenize: 붙여 쓴 어절 분석 함수 (기본: extract_meaningful_tokens)
+    """
+    tokenize = tokenize or extract_meaningful_tokens
+    confirmed = [c for c in candidates if c["method"] == "원형" and c["word"] in tokens]
+    collapsed_tokens = {}
+
+    for candidate in candidates:
+        if candidate["method"] != "자모":
+            continue
+        start, end = candidate["start"], candidate["end"]
+        segment = message[start:end]
+        if any(_is_jamo(ch) for ch in segment):
+            confirmed.append(candidate)
+        elif any(ch.isspace() for ch in segment):
+            if _is_eojeol_aligned(message, start, end):
+                confirmed.append(candidate)
+                continue
+            text = _collapsed_eojeols(message, start, end)
+            if text not in collapsed_tokens:
+                collapsed_tokens[text] = set(tokenize(text))
+            if candidate["word"] in collapsed_tokens[text]:
+                confirmed.append(candidate)
+
+    unique = {(c["word"], c["start"], c["end"]): c for c in confirmed}
+    return [
+        {"word": c["word"], "start": c["start"], "end": c["end"], "method": c["method"]}
+        for c in sorted(unique.values(), key=lambda c: (c["start"], c["end"]))
+    ]
+
+
+def find_forbidden_matches(message: str) -> dict:
+    """
+    메시지의 모든 금칙어 매칭 (단어, 원문 글자 구간, 매칭 방식)
+    - 1단계: 원문 + 자모 분해문 트라이 스캔 → 후보가 없으면 형태소 분석 없이 종료 (fast path)
+    - 2단계: 후보 주변 구간만 형태소 분석해 실제 단어로 쓰였는지 확인
+    """
     start_time = time.time()
-    automaton = state.forbidden_automaton
-    # decomposed = decompose_text(message)
-
-    tokens = extract_meaningful_tokens(message)
-    token_set = set(tokens)
-    # ngram_set = generate_ngrams(tokens)
-    meaningful_tokens = token_set
-    # meaningful_tokens = token_set | ngram_set  # 단어 + ngram 병합
-    # print(f"✅ 형태소 분석 결과: {meaningful_tokens}")
-
-    # 1차: 원형 검사
-    for _, (word, mode) in automaton.iter(message):
-        if mode == "original" and word in meaningful_tokens:
-            elapsed = time.time() - start_time
-            return {
-                "message": message,
-                "result": "🚫 금칙어 포함",
-                "detected_words": [word],
-                "method": "원형",
-                "inference_time": round(elapsed, 4)
-            }
+    automaton = state.forbidden_automaton  # 검사 도중 교체되어도 이 참조는 그대로 유지
 
-    # 2차: 자모 검사
-    # for _, (word, mode) in automaton.iter(decomposed):
-    for _, (word, mode) in automaton.iter(message):
-        if mode == "decomposed" and word in meaningful_tokens:
-            elapsed = time.time() - start_time
-            return {
-                "message": message,
-                "result": "🚫 금칙어 포함",
-                "detected_words": [word],
-                "method": "자모",
-                "inference_time": round(elapsed, 4)
-            }
+    # 1단계: 트라이 스캔
+    candidates = _scan_candidates(message, automaton) if automaton is not None else []
+    scan_time = time.time() - start_time
+
+    if not candidates:
+        elapsed = time.time() - start_time
+        _record_check_stats(True, len(message), 0, scan_time, 0.0, elapsed)
+        return {
+            "matches": [],
+            "elapsed": elapsed,
+            "stage_times": {"scan": round(scan_time, 6), "mecab": 0.0}
+        }
+
+    # 2단계: 후보 주변만 형태소 분석
+    mecab_start = time.time()
+    windows = _hit_windows(message, [(c["start"], c["end"]) for c in candidates], FORBIDDEN_MECAB_CONTEXT_CHARS)
+
+    meaningful_tokens = set()
+    for window_start, window_end in windows:
+        meaningful_tokens.update(extract_meaningful_tokens(message[window_start:window_end]))
+
+    matches = _confirm_candidates(message, candidates, meaningful_tokens)
+    mecab_time = time.time() - mecab_start
+    mecab_chars = sum(window_end - window_start for window_start, window_end in windows)
 
-    # 통과
     elapsed = time.time() - start_time
+    _record_check_stats(False, len(message), mecab_chars, scan_time, mecab_time, elapsed)
+    return {
+        "matches": matches,
+        "elapsed": elapsed,
+        "stage_times": {"scan": round(scan_time, 6), "mecab": round(mecab_time, 6)}
+    }
+
+
+def _summarize_matches(matches: list[dict]) -> tuple[list[str], str]:
+    """매칭 목록 → (중복 제거된 단어 목록, 매칭 방식 요약)"""
+    detected_words = list(dict.fromkeys(m["word"] for m in matches))
+    methods = {m["method"] for m in matches}
+    if not methods:
+        method = "-"
+    elif len(methods) == 2:
+        method = "원형+자모"
+    else:
+        method = methods.pop()
+    return detected_words, method
+
+
+def check_forbidden_message(message: str) -> dict:
+    """메시지 한 개에 대해 금칙어 포함 여부 검사 (모든 매칭 단어 + 원문 위치 반환)"""
+    found = find_forbidden_matches(message)
+    detected_words, method = _summarize_matches(found["matches"])
+
+    return {
+        "message": message,
+        "result": "🚫 금칙어 포함" if detected_words else "✅ 통과",
+        "detected_words": detected_words,
+        "method": method,
+        "matches": found["matches"],
+        "inference_time": round(found["elapsed"], 4),
+        "stage_times": found["stage_times"]
+    }
+
+
+# 여러 메시지 검사용 공용 워커 풀 (요청별 동시 실행 수는 concurrency 로 추가 제한)
+check_executor = ThreadPoolExecutor(max_workers=FORBIDDEN_BATCH_MAX_CONCURRENCY, thread_name_prefix="forbidden-check")
+
+
+def iter_check_forbidden_messages(messages: list[str], concurrency: int | None = None):
+    """
+    여러 메시지를 워커 풀에서 검사하고 끝나는 순서대로 (index, 결과, 오류) 를 yield
+    - 동시에 처리 중인 메시지는 최대 concurrency 개 (기본/상한: FORBIDDEN_BATCH_MAX_CONCURRENCY)
+    - 메시지 하나가 실패해도 나머지는 계속 검사 (결과 None + 오류 문자열로 전달)
+    """
+    limit = min(concurrency or FORBIDDEN_BATCH_MAX_CONCURRENCY, FORBIDDEN_BATCH_MAX_CONCURRENCY)
+    limit = max(1, limit)
+
+    pending = {}
+    next_index = 0
+    while next_index < len(messages) or pending:
+        while next_index < len(messages) and len(pending) < limit:
+            future = check_executor.submit(check_forbidden_message, messages[next_index])
+            pending[future] = next_index
+            next_index += 1
+
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            index = pending.pop(future)
+            error = future.exception()
+            if error is not None:
+                print(f"❌ [오류] 금칙어 검사 실패 (index {index}): {error}")
+                yield index, None, str(error)
+            else:
+                yield index, future.result(), None
+
+
+def mask_forbidden_message(message: str, mask_char: str = "*") -> dict:
+    """검사와 같은 스캔 결과로 매칭 구간을 가림 처리 (공백은 유지)"""
+    found = find_forbidden_matches(message)
+    detected_words, method = _summarize_matches(found["matches"])
+
+    chars = list(message)
+    for match in found["matches"]:
+        for i in range(match["start"], match["end"]):
+            if not chars[i].isspace():
+                chars[i] = mask_char
+
     return {
         "message": message,
-        "result": "✅ 통과",
-        "detected_words": [],
-        "method": "-",
-        "inference_time": round(elapsed, 4)
+        "masked_message": "".join(chars),
+        "detected_words": detected_words,
+        "method": method,
+        "matches": found["matches"],
+        "inference_time": round(found["elapsed"], 4)
     }
 
 
@@ -285,26 +632,76 @@ def is_forbidden_word(word: str) -> bool:
         return exists is not None
     
     
+def _delete_returning(session, condition) -> list[tuple[str, str]]:
+    """
+    조건에 맞는 금칙어를 DELETE 한 번으로 삭제 (MSSQL: OUTPUT deleted.*)
+    - 삭제된 (word, decomposed_word) 를 바로 돌려받아 변경 이력 기록
+    :return: 실제로 삭제된 (word, decomposed_word) 목록
+    """
+    statement = (
+        delete(ForbiddenWord)
+        .where(condition)
+        .returning(ForbiddenWord.word, ForbiddenWord.decomposed_word)
+    )
+    deleted = [(row[0], row[1]) for row in session.execute(statement, execution_options={"synchronize_session": False})]
+    record_changes(session, [(word, decomposed, "remove") for word, decomposed in deleted])
+    return deleted
+
+
+def _remove_deleted_from_automaton(deleted: list[tuple[str, str]]):
+    """커밋 이후 삭제된 단어를 트라이에서 제거 (원형/자모 키 모두, 한 번의 재빌드)"""
+    if deleted:
+        remove_from_automaton([word for word, _ in deleted])
+
+
 def delete_forbidden_word(word: str) -> bool:
     """
-    특정 금칙어를 DB에서 삭제 (ORM)
+    특정 금칙어를 DB에서 삭제 (DELETE ... OUTPUT 한 번)
     """
     try:
         with db_session() as session:
-            target = session.query(ForbiddenWord).filter(ForbiddenWord.word == word).first()
-            if target:
-                session.delete(target)
-                session.commit()
-                return True
-            return False
+            deleted = _delete_returning(session, ForbiddenWord.word == word)
+        _remove_deleted_from_automaton(deleted)
+        return bool(deleted)
     except Exception as e:
         print("❌ 삭제 에러:", e)
         return False
 
 
+def delete_forbidden_words(words: list[str]) -> dict:
+    """
+    여러 금칙어를 DB에서 일괄 삭제 (set 기반)
+    - FORBIDDEN_BULK_CHUNK_SIZE 단위 IN 조건 DELETE (파라미터 개수 제한 대비), 전체가 한 트랜잭션
+    - 트라이는 커밋 이후 한 번만 재빌드
+    """
+    cleaned_words = list(dict.fromkeys(w.strip() for w in words if w.strip()))
+
+    if not cleaned_words:
+        return {
+            "deleted": [],
+            "not_found": [],
+            "message": "⚠️ 삭제할 유효한 단어가 없습니다."
+        }
+
+    deleted = []
+    with db_session() as session:
+        for i in range(0, len(cleaned_words), FORBIDDEN_BULK_CHUNK_SIZE):
+            chunk = cleaned_words[i:i + FORBIDDEN_BULK_CHUNK_SIZE]
+            deleted.extend(_delete_returning(session, ForbiddenWord.word.in_(chunk)))
+
+    _remove_deleted_from_automaton(deleted)
+
+    deleted_words = {word for word, _ in deleted}
+    return {
+        "deleted": [w for w in cleaned_words if w in deleted_words],
+        "not_found": [w for w in cleaned_words if w not in deleted_words],
+        "message": f"✅ {len(deleted_words)}개 삭제 / {len(cleaned_words) - len(deleted_words)}개 없음"
+    }
+
+
 def delete_forbidden_words_by_date(date_str: str) -> int:
     """
-    특정 날짜에 등록된 금칙어들을 DB에서 삭제
+    특정 날짜에 등록된 금칙어들을 DB에서 삭제 (DELETE ... OUTPUT 한 번 + 트라이 재빌드 한 번)
     :param date_str: YYYY-MM-DD 형식의 문자열
     :return: 삭제된 금칙어 개수
     """
@@ -313,18 +710,13 @@ def delete_forbidden_words_by_date(date_str: str) -> int:
         next_date = date + timedelta(days=1)
 
         with db_session() as session:
-            targets = session.query(ForbiddenWord).filter(
-                ForbiddenWord.created_at >= date,
-                ForbiddenWord.created_at < next_date
-            ).all()
-
-            deleted_count = len(targets)
-
-            for word in targets:
-                session.delete(word)
-            session.commit()
+            deleted = _delete_returning(
+                session,
+                (ForbiddenWord.created_at >= date) & (ForbiddenWord.created_at < next_date)
+            )
 
-            return deleted_count
+        _remove_deleted_from_automaton(deleted)
+        return len(deleted)
     except Exception as e:
         print("❌ 날짜 삭제 에러:", e)
         return -1  # 에러 시 -1 반환
\ No newline at end of file
@@ -0,0 +1,157 @@
+# app/filter_utils/inference_backend.py
+
+import os
+from types import SimpleNamespace
+
+import torch
+from transformers import AutoModel, AutoModelForSequenceClassification, AutoTokenizer
+
+from app.config import INFERENCE_BACKEND, ONNX_MODEL_SUBDIR, ONNX_INTRA_OP_THREADS
+
+TORCH = "torch"
+ONNX = "onnx"
+ONNX_INT8 = "onnx-int8"
+BACKENDS = (TORCH, ONNX, ONNX_INT8)
+
+# 모델 종류 → (transformers 로더, 사용하는 출력 이름)
+SEQUENCE_CLASSIFICATION = "sequence-classification"
+FEATURE_EXTRACTION = "feature-extraction"
+TASKS = {
+    SEQUENCE_CLASSIFICATION: (AutoModelForSequenceClassification, "logits"),
+    FEATURE_EXTRACTION: (AutoModel, "last_hidden_state"),
+}
+
+if INFERENCE_BACKEND not in BACKENDS:
+    raise ValueError(f"지원하지 않는 추론 백엔드: {INFERENCE_BACKEND} (가능: {', '.join(BACKENDS)})")
+
+
+def onnx_path(model_path: str, quantized: bool) -> str:
+    return os.path.join(model_path, ONNX_MODEL_SUBDIR, "model.int8.onnx" if quantized else "model.onnx")
+
+
+class OnnxModel:
+    """
+    ONNX Runtime 세션을 transformers 모델처럼 호출 (model(**inputs) → outputs.logits / outputs.last_hidden_state)
+    - 토크나이저의 torch 텐서 입력을 그대로 받고 출력도 torch 텐서로 돌려줌 → 호출부 변경 없음
+    - name_or_path 는 원본 모델 경로 그대로 (저장된 임베딩의 model_name 과 같은 값 → 백엔드 전환 시 재임베딩 없음)
+    """
+
+    def __init__(self, path: str, name_or_path: str, output_name: str, intra_op_threads: int = ONNX_INTRA_OP_THREADS):
+        import onnxruntime
+
+        options = onnxruntime.SessionOptions()
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if intra_op_threads > 0:
+            options.intra_op_num_threads = intra_op_threads
+
+        self.session = onnxruntime.InferenceSession(path, options, providers=["CPUExecutionProvider"])
+        self.input_names = [item.name for item in self.session.get_inputs()]
+        self.output_name = output_name
+        self.name_or_path = name_or_path
+        self.path = path
+
+    def eval(self) -> "OnnxModel":
+        return self
+
+    def __call__(self, **inputs) -> SimpleNamespace:
+        feed = {
+            name: (value.numpy() if isinstance(value, torch.Tensor) else value).astype("int64")
+            for name, value in inputs.items()
+            if name in self.input_names
+        }
+        output = self.session.run([self.output_name], feed)[0]
+        return SimpleNamespace(**{self.output_name: torch.from_numpy(output)})
+
+
+def load_model(model_path: str, task: str, backend: str = INFERENCE_BACKEND):
+    """
+    INFERENCE_BACKEND 에 맞는 모델 로드
+    - torch: transformers from_pretrained (기존 경로)
+    - onnx / onnx-int8: export 된 ONNX 파일을 ONNX Runtime 으로 실행 (파일이 없거나 onnxruntime 미설치 시 torch 로 대체)
+    """
+    loader, output_name = TASKS[task]
+    if backend != TORCH:
+        path = onnx_path(model_path, backend == ONNX_INT8)
+        if not os.path.exists(path):
+            print(f"⚠️ [주의] ONNX 모델 파일 없음 → torch 로 실행 ({path}, python -m benchmarks.export_onnx 로 생성)")
+        else:
+            try:
+                model = OnnxModel(path, model_path, output_name)
+                print(f"✅ ONNX Runtime 모델 로드: {path}")
+                return model
+            except ImportError:
+                print("⚠️ [주의] onnxruntime 미설치 → torch 로 실행")
+
+    return loader.from_pretrained(model_path).eval()
+
+
+def reload_for_worker(model, threads: int):
+    """
+    추론 워커(fork 된 자식)에서 호출: ONNX Runtime 세션의 스레드 풀은 fork 로 넘어오지 않음
+    → 워커 안에서 intra_op_num_threads=threads 로 세션을 새로 만듦 (torch 모델은 그대로 공유)
+    """
+    if isinstance(model, OnnxModel):
+        return OnnxModel(model.path, model.name_or_path, model.output_name, intra_op_threads=threads)
+    return model
+
+
+def warmup_model(model, tokenizer, seq_lengths: list[int], batch_size: int):
+    """대표 토큰 길이별 forward pass (배치 1 / batch_size) → 첫 요청 전에 lazy 초기화와 버퍼 할당을 끝내 둠"""
+    for seq_len in seq_lengths:
+        for size in dict.fromkeys((1, max(1, batch_size))):
+            inputs = tokenizer(["가나다라마바사 " * seq_len] * size, return_tensors="pt", truncation=True, max_length=seq_len)
+            with torch.no_grad():
+                model(**inputs)
+
+
+class _ExportWrapper(torch.nn.Module):
+    """위치 인자 → 이름 인자로 바꿔 필요한 출력 텐서 하나만 반환 (torch.onnx.export 용)"""
+
+    def __init__(self, model, input_names: list[str], output_name: str):
+        super().__init__()
+        self.model = model
+        self.input_names = input_names
+        self.output_name = output_name
+
+    def forward(self, *tensors):
+        return getattr(self.model(**dict(zip(self.input_names, tensors))), self.output_name)
+
+
+def export_onnx(model_path: str, task: str, quantize: bool = True, opset: int = 14) -> list[str]:
+    """
+    transformers 모델 → ONNX (batch / sequence 축 동적) 저장, quantize 면 int8 동적 양자화본도 함께 저장
+    - 반환: 생성한 파일 경로 목록
+    """
+    loader, output_name = TASKS[task]
+    tokenizer = AutoTokenizer.from_pretrained(model_path)
+    model = loader.from_pretrained(model_path).eval()
+
+    sample = tokenizer(["ONNX export 샘플 문장입니다.", "두 번째"], return_tensors="pt", padding=True)
+    input_names = [name for name in tokenizer.model_input_names if name in sample]
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes[output_name] = {0: "batch"} if task == SEQUENCE_CLASSIFICATION else {0: "batch", 1: "sequence"}
+
+    path = onnx_path(model_path, quantized=False)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with torch.no_grad():
+        torch.onnx.export(
+            _ExportWrapper(model, input_names, output_name),
+            tuple(sample[name] for name in input_names),
+            path,
+            input_names=input_names,
+            output_names=[output_name],
+            dynamic_axes=dynamic_axes,
+            opset_version=opset
+        )
+    print(f"✅ ONNX export: {path}")
+    created = [path]
+
+    if quantize:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        quantized_path = onnx_path(model_path, quantized=True)
+        quantize_dynamic(path, quantized_path, weight_type=QuantType.QInt8)
+        print(f"✅ int8 동적 양자화: {quantized_path}")
+        created.append(quantized_path)
+
+    return created
@@ -0,0 +1,315 @@
+# app/filter_utils/inference_pool.py
+
+import itertools
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, TimeoutError
+
+import torch
+
+from app.config import (
+    INFERENCE_POOL_WORKERS,
+    INFERENCE_POOL_THREADS,
+    INFERENCE_POOL_PIN_CORES,
+    INFERENCE_POOL_TIMEOUT_SEC
+)
+
+# fork 는 부모가 이미 올린 모델 메모리를 복사하지 않고 공유 (copy-on-write)
+_context = multiprocessing.get_context("fork")
+
+
+def read_memory(pid: int) -> dict:
+    """
+    /proc/<pid>/smaps_rollup 기준 메모리 (MB)
+    - shared: 다른 프로세스와 공유 중인 페이지 (fork 이후 모델 가중치) → 워커가 따로 로딩했다면 추가로 들었을 메모리
+    - private: 이 프로세스만 가진 페이지 (활성값, 토크나이저 캐시 등)
+    """
+    fields = {}
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) >= 2 and parts[0].endswith(":") and parts[1].isdigit():
+                    fields[parts[0][:-1]] = int(parts[1])
+    except OSError:
+        return {}
+
+    def mb(*keys):
+        return round(sum(fields.get(key, 0) for key in keys) / 1024, 1)
+
+    return {
+        "rss_mb": mb("Rss"),
+        "pss_mb": mb("Pss"),
+        "shared_mb": mb("Shared_Clean", "Shared_Dirty"),
+        "private_mb": mb("Private_Clean", "Private_Dirty"),
+    }
+
+
+# 결과 큐 메시지 종류 (kind, request_id, worker index, payload)
+READY = "ready"      # warmup 완료 (payload: 실패 시 오류 문자열)
+STARTED = "started"  # 작업을 꺼내 실행 시작 → 워커가 죽으면 이 요청을 바로 실패 처리
+DONE = "done"
+FAILED = "failed"
+DIED = "died"        # 감시 스레드가 넣음 (payload: exit code)
+
+
+def _worker_main(pool: "InferencePool", index: int, core: int | None, tasks, results):
+    """자식 프로세스: 코어 고정 + torch 스레드 수 제한 후 작업 큐에서 배치를 꺼내 실행"""
+    pool.in_worker = True
+    os.environ["TOKENIZERS_PARALLELISM"] = "false"
+    if core is not None:
+        os.sched_setaffinity(0, {core})
+    torch.set_num_threads(pool.threads)
+
+    # 워커마다 자기 프로세스에서 warmup 후 준비 완료 알림
+    try:
+        for warmup in pool.warmups:
+            warmup()
+        results.put((READY, None, index, None))
+    except Exception as e:
+        results.put((READY, None, index, f"{type(e).__name__}: {e}"))
+
+    while True:
+        message = tasks.get()
+        if message is None:
+            return
+        request_id, name, items = message
+        results.put((STARTED, request_id, index, None))
+        try:
+            results.put((DONE, request_id, index, pool.tasks[name](items)))
+        except Exception as e:
+            results.put((FAILED, request_id, index, f"{type(e).__name__}: {e}"))
+
+
+class InferencePool:
+    """
+    모델 추론 전용 워커 프로세스 풀 (GIL 밖에서 토크나이징 / forward / 후처리)
+    - 부모가 모델을 로드한 뒤 fork → 가중치 페이지는 워커끼리 공유, 워커마다 다시 로딩하지 않음
+      (ONNX Runtime 세션은 스레드 풀이 fork 로 넘어오지 않아 on_worker_start 훅에서 워커마다 새로 생성)
+    - 워커마다 코어 하나에 고정하고 torch.set_num_threads(threads) 로 intra-op 스레드 수 제한
+    - 작업은 공유 큐 하나에 넣고 먼저 비는 워커가 가져감, 결과는 결과 큐 → 리더 스레드가 Future 완료
+    - task(name, fn) 으로 등록한 함수는 풀이 켜져 있으면 워커에서, 아니면 현재 프로세스에서 그대로 실행
+    - 워커는 작업을 꺼낼 때 STARTED 를 먼저 보냄 (SimpleQueue → 피더 스레드 없이 바로 기록)
+      → 워커가 죽으면 감시 스레드가 DIED 를 같은 큐 뒤에 넣고, 리더가 그 워커가 잡고 있던 요청을 바로 실패 처리한 뒤 다시 fork
+    - 풀이 켜져 있으면 부모는 forward pass 를 하지 않음 (모든 추론 경로가 task 로 등록된 함수를 거침)
+      → 부모에는 torch/OpenMP 스레드 풀이 생기지 않아 재시작 fork 도 안전, start() 에서 부모 torch 스레드 수도 threads 로 제한
+    """
+
+    def __init__(self, workers: int, threads: int, pin_cores: bool, timeout_sec: float):
+        self.workers = max(0, workers)
+        self.threads = max(1, threads)
+        self.pin_cores = pin_cores
+        self.timeout = timeout_sec
+        self.tasks = {}
+        self.warmups = []
+        self.in_worker = False
+
+        self._processes = []
+        self._cores = []
+        self._tasks_queue = None
+        self._results_queue = None
+        self._pending = {}
+        self._running = {}  # 워커 index → 처리 중인 request_id
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._reader = None
+        self._warmed = set()
+        self._warm_errors = {}
+        self._all_warm = threading.Event()
+
+        self.requests = 0
+        self.items = 0
+        self.failures = 0
+        self.restarts = 0
+        self.per_worker = []
+
+    @property
+    def active(self) -> bool:
+        return bool(self._processes) and not self.in_worker
+
+    def task(self, name: str, fn):
+        """배치 함수 등록 → 풀 사용 여부에 따라 워커 / 현재 프로세스에서 실행하는 함수 반환"""
+        self.tasks[name] = fn
+
+        def dispatch(items):
+            if self.active:
+                return self.run(name, items)
+            return fn(items)
+
+        return dispatch
+
+    def on_worker_start(self, fn):
+        """워커 프로세스 시작 시 (작업을 받기 전) 실행할 warmup 함수 등록"""
+        self.warmups.append(fn)
+
+    def wait_warm(self, timeout: float) -> bool:
+        """모든 워커의 warmup 완료 대기 (실패한 워커가 있으면 RuntimeError)"""
+        if not self._all_warm.wait(timeout):
+            return False
+        if self._warm_errors:
+            raise RuntimeError(f"워커 warmup 실패: {self._warm_errors}")
+        return True
+
+    def _spawn(self, index: int):
+        process = _context.Process(
+            target=_worker_main,
+            args=(self, index, self._cores[index], self._tasks_queue, self._results_queue),
+            name=f"inference-worker-{index}",
+            daemon=True
+        )
+        process.start()
+        return process
+
+    def start(self):
+        """모델 로드 이후, 다른 추론이 시작되기 전에 호출 (fork 시점의 메모리를 워커가 공유)"""
+        if self.workers == 0 or self._processes or self.in_worker:
+            return
+
+        available = sorted(os.sched_getaffinity(0))
+        self._cores = [available[i % len(available)] if self.pin_cores else None for i in range(self.workers)]
+        self._tasks_queue = _context.Queue()
+        self._results_queue = _context.SimpleQueue()
+        self._running = {}
+        self.per_worker = [0] * self.workers
+        self._warmed = set()
+        self._warm_errors = {}
+        self._all_warm.clear()
+        self._stopped.clear()
+        self._processes = [self._spawn(i) for i in range(self.workers)]
+        # 부모는 추론하지 않지만, 혹시 남은 경로가 있어도 코어 전체를 쓰는 intra-op 스레드를 만들지 않도록 제한
+        torch.set_num_threads(self.threads)
+
+        self._reader = threading.Thread(target=self._read_results, name="inference-pool-results", daemon=True)
+        self._reader.start()
+        threading.Thread(target=self._watch_workers, name="inference-pool-watch", daemon=True).start()
+        print(f"✅ 추론 워커 프로세스 {self.workers}개 시작 (코어 {self._cores}, torch 스레드 {self.threads})")
+
+    def stop(self):
+        if not self._processes:
+            return
+        self._stopped.set()
+        for _ in self._processes:
+            self._tasks_queue.put(None)
+        for process in self._processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        self._processes = []
+        self._results_queue.put(None)
+        self._reader.join(timeout=5)
+
+    def submit(self, name: str, items: list) -> Future:
+        future = Future()
+        request_id = next(self._ids)
+        with self._lock:
+            self._pending[request_id] = future
+        self._tasks_queue.put((request_id, name, items))
+        return future
+
+    def run(self, name: str, items: list) -> list:
+        future = self.submit(name, items)
+        try:
+            result = future.result(timeout=self.timeout)
+        except TimeoutError:
+            with self._lock:
+                self._pending = {key: value for key, value in self._pending.items() if value is not future}
+                self.failures += 1
+            raise
+        with self._lock:
+            self.requests += 1
+            self.items += len(items)
+        return result
+
+    def _read_results(self):
+        while True:
+            message = self._results_queue.get()
+            if message is None:
+                return
+            kind, request_id, index, payload = message
+            if kind == READY:
+                self._warmed.add(index)
+                if payload is not None:
+                    self._warm_errors[index] = payload
+                if len(self._warmed) >= self.workers:
+                    self._all_warm.set()
+                continue
+
+            if kind == STARTED:
+                with self._lock:
+                    self._running[index] = request_id
+                continue
+
+            if kind == DIED:
+                # 죽기 전에 보낸 메시지는 모두 이 앞에 있음 → 아직 끝나지 않은 요청만 남아 있음
+                with self._lock:
+                    request_id = self._running.pop(index, None)
+                    future = self._pending.pop(request_id, None)
+                    if future is not None:
+                        self.failures += 1
+                if future is not None:
+                    future.set_exception(RuntimeError(f"추론 워커 {index} 종료 (exit {payload})"))
+                continue
+
+            with self._lock:
+                if self._running.get(index) == request_id:
+                    del self._running[index]
+                future = self._pending.pop(request_id, None)
+                if index < len(self.per_worker):
+                    self.per_worker[index] += 1
+                if kind == FAILED:
+                    self.failures += 1
+            if future is None:
+                continue
+            if kind == DONE:
+                future.set_result(payload)
+            else:
+                future.set_exception(RuntimeError(payload))
+
+    def _watch_workers(self):
+        """죽은 워커가 처리 중이던 요청 실패 처리 + 재시작"""
+        while not self._stopped.wait(1.0):
+            for i, process in enumerate(self._processes):
+                if process.is_alive():
+                    continue
+                print(f"⚠️ [주의] 추론 워커 {i} 종료됨 (exit {process.exitcode}) → 재시작")
+                self._results_queue.put((DIED, None, i, process.exitcode))
+                self._processes[i] = self._spawn(i)
+                with self._lock:
+                    self.restarts += 1
+
+    def stats(self) -> dict:
+        workers = []
+        for i, process in enumerate(self._processes):
+            workers.append({
+                "index": i,
+                "pid": process.pid,
+                "alive": process.is_alive(),
+                "core": self._cores[i],
+                "batches": self.per_worker[i],
+                **read_memory(process.pid),
+            })
+        return {
+            "enabled": bool(self._processes),
+            "workers": len(self._processes),
+            "torch_threads": self.threads,
+            "requests": self.requests,
+            "items": self.items,
+            "failures": self.failures,
+            "restarts": self.restarts,
+            "warmed": len(self._warmed),
+            "pending": len(self._pending),
+            "running": len(self._running),
+            "parent": {"pid": os.getpid(), **read_memory(os.getpid())},
+            "shared_mb_total": round(sum(worker.get("shared_mb", 0.0) for worker in workers), 1),
+            "worker_detail": workers,
+        }
+
+
+inference_pool = InferencePool(
+    workers=INFERENCE_POOL_WORKERS,
+    threads=INFERENCE_POOL_THREADS,
+    pin_cores=INFERENCE_POOL_PIN_CORES,
+    timeout_sec=INFERENCE_POOL_TIMEOUT_SEC
+)
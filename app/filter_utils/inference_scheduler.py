@@ -0,0 +1,160 @@
+# app/filter_utils/inference_scheduler.py
+
+import queue
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import Future
+
+import numpy as np
+
+
+class _PendingRequest:
+    __slots__ = ("item", "future", "enqueued_at")
+
+    def __init__(self, item):
+        self.item = item
+        self.future = Future()
+        self.enqueued_at = time.monotonic()
+
+
+def _percentiles(values) -> dict:
+    if not values:
+        return {"p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+    arr = np.fromiter(values, dtype=np.float64)
+    p50, p95, p99 = np.percentile(arr, [50, 95, 99])
+    return {
+        "p50": round(float(p50), 3),
+        "p95": round(float(p95), 3),
+        "p99": round(float(p99), 3),
+        "max": round(float(arr.max()), 3),
+    }
+
+
+class MicroBatchScheduler:
+    """
+    단건 추론 요청을 모아 한 번의 forward pass로 처리하는 마이크로 배치 스케줄러
+    - 첫 요청이 들어온 뒤 max_wait_ms 이내에 도착한 요청을 최대 max_batch_size 개까지 묶음
+    - batch_fn(items) 는 입력과 같은 순서/길이의 결과 리스트를 반환해야 함
+    - 전용 워커 스레드가 forward pass를 전담 → 요청 스레드끼리 torch intra-op 풀을 두고 경쟁하지 않음
+    - workers > 1 이면 워커 스레드 여러 개가 각자 배치를 모아 동시에 batch_fn 호출 (추론 프로세스 풀로 넘길 때)
+    """
+
+    def __init__(self, name: str, batch_fn, max_batch_size: int, max_wait_ms: float, workers: int = 1, stats_window: int = 2048):
+        self.name = name
+        self.batch_fn = batch_fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+        self.workers = max(1, workers)
+        self._queue: queue.Queue[_PendingRequest] = queue.Queue()
+        self._threads = []
+        self._start_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+
+        # 통계 (워커 스레드에서 _stats_lock 으로 갱신)
+        self.batches = 0
+        self.items = 0
+        self.failures = 0
+        self.batch_size_histogram = Counter()
+        self._wait_ms = deque(maxlen=stats_window)
+        self._batch_ms = deque(maxlen=stats_window)
+
+    def submit(self, item) -> Future:
+        self._ensure_started()
+        request = _PendingRequest(item)
+        self._queue.put(request)
+        return request.future
+
+    def run(self, item, timeout: float | None = None):
+        """단건 요청을 큐에 넣고 배치 처리 결과를 기다림"""
+        return self.submit(item).result(timeout=timeout)
+
+    def _ensure_started(self):
+        if self._threads:
+            return
+        with self._start_lock:
+            if not self._threads:
+                for i in range(self.workers):
+                    thread = threading.Thread(target=self._worker, name=f"{self.name}-batcher-{i}", daemon=True)
+                    thread.start()
+                    self._threads.append(thread)
+
+    def _collect_batch(self) -> list[_PendingRequest]:
+        first = self._queue.get()
+        batch = [first]
+        deadline = first.enqueued_at + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining > 0:
+                    batch.append(self._queue.get(timeout=remaining))
+                else:
+                    # 대기 시간이 지났어도 이미 큐에 쌓인 요청은 함께 처리
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _worker(self):
+        while True:
+            batch = self._collect_batch()
+            started = time.monotonic()
+
+            with self._stats_lock:
+                for request in batch:
+                    self._wait_ms.append((started - request.enqueued_at) * 1000)
+
+            try:
+                outputs = self.batch_fn([request.item for request in batch])
+                if len(outputs) != len(batch):
+                    # zip 으로 짝지으면 남는 요청의 Future 가 영원히 끝나지 않음 → 배치 전체를 실패 처리
+                    raise RuntimeError(f"{self.name} 배치 결과 수 불일치: 입력 {len(batch)}개, 결과 {len(outputs)}개")
+            except Exception as e:
+                with self._stats_lock:
+                    self.failures += 1
+                for request in batch:
+                    request.future.set_exception(e)
+                continue
+
+            for request, output in zip(batch, outputs):
+                request.future.set_result(output)
+
+            with self._stats_lock:
+                self.batches += 1
+                self.items += len(batch)
+                self.batch_size_histogram[len(batch)] += 1
+                self._batch_ms.append((time.monotonic() - started) * 1000)
+
+    def stats(self) -> dict:
+        with self._stats_lock:
+            wait_ms = list(self._wait_ms)
+            batch_ms = list(self._batch_ms)
+        return {
+            "name": self.name,
+            "workers": self.workers,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": round(self.max_wait * 1000, 3),
+            "queue_depth": self._queue.qsize(),
+            "batches": self.batches,
+            "items": self.items,
+            "failures": self.failures,
+            "avg_batch_size": round(self.items / self.batches, 3) if self.batches else 0.0,
+            "batch_size_histogram": {str(size): count for size, count in sorted(self.batch_size_histogram.items())},
+            "queue_wait_ms": _percentiles(wait_ms),
+            "batch_time_ms": _percentiles(batch_ms),
+        }
+
+
+# 이름별 스케줄러 등록 (통계 조회용)
+schedulers: dict[str, MicroBatchScheduler] = {}
+
+
+def create_scheduler(name: str, batch_fn, max_batch_size: int, max_wait_ms: float, workers: int = 1) -> MicroBatchScheduler:
+    scheduler = MicroBatchScheduler(name, batch_fn, max_batch_size, max_wait_ms, workers)
+    schedulers[name] = scheduler
+    return scheduler
+
+
+def get_scheduler_stats() -> dict:
+    return {name: scheduler.stats() for name, scheduler in schedulers.items()}
@@ -0,0 +1,201 @@
+# app/filter_utils/reembed_job.py
+
+import threading
+import time
+from sqlalchemy import func, text, update
+from app.database import db_session, engine
+from app.filter_utils.embedding_codec import encode_embedding
+from db_models.similarity import SensitiveWord
+
+# uvicorn 워커 여러 개 중 한 곳에서만 실행 (세션 소유 applock, 실행하는 동안 전용 연결로 보유)
+LOCK_RESOURCE = "sensitive_reembed"
+LOCK_WAIT_MS = 5000
+
+_GET_APPLOCK = """
+    SET NOCOUNT ON;
+    DECLARE @result INT;
+    EXEC @result = sp_getapplock @Resource = :resource, @LockMode = 'Exclusive', @LockOwner = 'Session', @LockTimeout = :timeout_ms;
+    SELECT @result;
+"""
+_RELEASE_APPLOCK = "EXEC sp_releaseapplock @Resource = :resource, @LockOwner = 'Session'"
+
+
+class ReembedJob:
+    """
+    임베딩 모델 변경 시 민감 단어 재임베딩 백그라운드 작업
+    - model_name 이 현재 모델과 다른 행만 word_id 순서로 스트리밍 (word_id 커서 keyset 페이지 + yield_per)
+    - fetch_size 행마다 embed_fn 으로 한 번에 재인코딩하고 PK 기준 bulk UPDATE (묶음마다 커밋)
+    - 갱신된 행은 더 이상 대상이 아니므로 중단/재시작 후 다시 실행하면 남은 행부터 이어서 진행
+    - on_batch(word_ids, words, embeddings) 는 커밋 이후 호출 (유저 캐시 무효화 + 벡터 인덱스 갱신용)
+    - sp_getapplock 으로 한 번에 한 워커만 실행, 나머지는 잠금이 풀릴 때까지 대기(waiting)
+      → 잠금을 얻으면 on_follow() 로 다른 워커가 갱신한 행을 반영하고, 남은 행이 있으면 (실행하던 워커가 죽은 경우) 이어서 처리
+    """
+
+    def __init__(self, model_name: str, embed_fn, fetch_size: int, encoding: str, on_batch=None, on_follow=None):
+        self.model_name = model_name
+        self.encoding = encoding
+        self.embed_fn = embed_fn
+        self.fetch_size = max(1, fetch_size)
+        self.on_batch = on_batch
+        self.on_follow = on_follow
+
+        self.state = "idle"
+        self.total = 0
+        self.processed = 0
+        self.batches = 0
+        self.last_word_id = 0
+        self.started_at = None
+        self.finished_at = None
+        self.last_error = None
+
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def count_stale(self) -> int:
+        with db_session() as session:
+            return session.query(func.count(SensitiveWord.word_id)).filter(
+                SensitiveWord.model_name != self.model_name
+            ).scalar() or 0
+
+    def start(self) -> bool:
+        """작업 시작 (이미 실행 중이면 False)"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return False
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._worker, name="sensitive-reembed", daemon=True)
+            self._thread.start()
+            return True
+
+    def stop(self):
+        """현재 묶음까지 반영 후 중단"""
+        self._stop.set()
+
+    def _iter_stale_batches(self):
+        """
+        대상 행을 fetch_size 단위로 스트리밍 (word_id 커서 keyset 페이지)
+        - 페이지마다 짧은 조회로 커서를 닫은 뒤 갱신 → 읽기 커서가 UPDATE 와 잠금을 두고 엉키지 않음
+        """
+        while not self._stop.is_set():
+            with db_session() as session:
+                rows = (
+                    session.query(SensitiveWord.word_id, SensitiveWord.word)
+                    .filter(SensitiveWord.model_name != self.model_name, SensitiveWord.word_id > self.last_word_id)
+                    .order_by(SensitiveWord.word_id)
+                    .limit(self.fetch_size)
+                    .yield_per(self.fetch_size)
+                )
+                batch = [(row[0], row[1]) for row in rows]
+
+            if not batch:
+                return
+            yield batch
+            if len(batch) < self.fetch_size:
+                return
+
+    def _acquire_lock(self, conn) -> bool | None:
+        """applock 획득 → 다른 워커를 기다렸으면 True, 기다리다 stop() 되면 None"""
+        waited = False
+        while not self._stop.is_set():
+            result = conn.execute(
+                text(_GET_APPLOCK),
+                {"resource": LOCK_RESOURCE, "timeout_ms": LOCK_WAIT_MS if waited else 0}
+            ).scalar()
+            if result >= 0:
+                return waited
+            if result < -1:
+                raise RuntimeError(f"sp_getapplock 실패 (반환값 {result})")
+            if not waited:
+                self.state = "waiting"
+                print("⚠️ [주의] 다른 워커가 민감 단어 재임베딩 중 → 끝날 때까지 대기")
+                waited = True
+        return None
+
+    def _worker(self):
+        self.state = "running"
+        self.started_at = time.time()
+        self.finished_at = None
+        self.last_error = None
+        self.processed = 0
+        self.batches = 0
+        self.last_word_id = 0
+
+        try:
+            with engine.connect() as conn:
+                waited = self._acquire_lock(conn)
+                if waited is None:
+                    self.state = "stopped"
+                    return
+                try:
+                    self.state = "running"
+                    if waited and self.on_follow:
+                        self.on_follow()
+                    self._run()
+                finally:
+                    conn.execute(text(_RELEASE_APPLOCK), {"resource": LOCK_RESOURCE})
+                    conn.commit()
+        except Exception as e:
+            self.state = "error"
+            self.last_error = str(e)
+            print(f"❌ [오류] 민감 단어 재임베딩 실패: {e}")
+        finally:
+            self.finished_at = time.time()
+
+    def _run(self):
+        self.total = self.count_stale()
+        if self.total == 0:
+            self.state = "done"
+            return
+
+        print(f"🔄 민감 단어 재임베딩 시작: {self.total}개 → {self.model_name}")
+
+        for batch in self._iter_stale_batches():
+            embeddings = self.embed_fn([word for _, word in batch])
+            with db_session() as session:
+                session.execute(
+                    update(SensitiveWord),
+                    [
+                        {
+                            "word_id": word_id,
+                            "embedding": encode_embedding(embedding, self.encoding),
+                            "embedding_encoding": self.encoding,
+                            "model_name": self.model_name
+                        }
+                        for (word_id, _), embedding in zip(batch, embeddings)
+                    ]
+                )
+
+            word_ids = [word_id for word_id, _ in batch]
+            self.last_word_id = word_ids[-1]
+            self.processed += len(batch)
+            self.batches += 1
+            if self.on_batch:
+                self.on_batch(word_ids, [word for _, word in batch], embeddings)
+
+            if self._stop.is_set():
+                break
+
+        self.state = "stopped" if self._stop.is_set() else "done"
+        print(f"✅ 민감 단어 재임베딩 {self.state}: {self.processed}/{self.total}개")
+
+    def stats(self) -> dict:
+        end = self.finished_at or time.time()
+        elapsed = end - self.started_at if self.started_at else 0.0
+        rate = self.processed / elapsed if elapsed > 0 else 0.0
+        remaining = max(0, self.total - self.processed)
+        return {
+            "state": self.state,
+            "model_name": self.model_name,
+            "total": self.total,
+            "processed": self.processed,
+            "remaining": remaining,
+            "progress": round(self.processed / self.total, 4) if self.total else 1.0,
+            "batches": self.batches,
+            "rows_per_sec": round(rate, 2),
+            "eta_sec": round(remaining / rate, 1) if rate > 0 and self.state == "running" else None,
+            "elapsed_sec": round(elapsed, 3),
+            "last_word_id": self.last_word_id,
+            "fetch_size": self.fetch_size,
+            "last_error": self.last_error,
+        }
@@ -0,0 +1,122 @@
+# app/filter_utils/sensitive_gc.py
+
+import threading
+import time
+from sqlalchemy import text
+from app.database import db_session
+
+_DELETE_ORPHANS = """
+    DELETE TOP ({batch_size}) FROM sensitive_words
+    OUTPUT deleted.word_id
+    WHERE NOT EXISTS (
+        SELECT 1 FROM user_sensitive_words u WHERE u.word_id = sensitive_words.word_id
+    )
+"""
+
+_COUNT_ORPHANS = """
+    SELECT COUNT(*) FROM sensitive_words s
+    WHERE NOT EXISTS (
+        SELECT 1 FROM user_sensitive_words u WHERE u.word_id = s.word_id
+    )
+"""
+
+
+def count_orphans() -> int:
+    """어느 유저도 참조하지 않는 민감 단어 수"""
+    with db_session() as session:
+        return session.execute(text(_COUNT_ORPHANS)).scalar() or 0
+
+
+class SensitiveWordGC:
+    """
+    고아 민감 단어(+ 임베딩) 정리 백그라운드 작업
+    - 삭제 요청은 유저-단어 링크만 지우고, 참조가 사라진 sensitive_words 행은 여기서 회수
+    - DELETE TOP(batch_size) 를 배치마다 별도 트랜잭션으로 반복 → 긴 잠금 없이 조금씩 정리
+    - 삭제 API 호출 시 notify() 로 깨우고, 그 외에는 interval_sec 주기로 실행
+    - 정리와 동시에 같은 단어를 다시 연결하면 잠금 때문에 둘 중 하나가 기다림 → 커밋된 링크가 있는 단어는 지우지 않고, 늦게 온 링크 INSERT 는 FK 오류로 실패 (RCSI 미사용 기준)
+    - on_collect(word_ids) 는 배치 커밋 이후 호출 (벡터 인덱스 정리용)
+    """
+
+    def __init__(self, batch_size: int, interval_sec: float, on_collect=None):
+        self.batch_size = max(1, batch_size)
+        self.interval = max(1.0, interval_sec)
+        self.on_collect = on_collect
+
+        self.runs = 0
+        self.deleted_total = 0
+        self.last_run_deleted = 0
+        self.last_run_batches = 0
+        self.last_run_ms = 0.0
+        self.last_run_at = None
+        self.last_error = None
+
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+    def start(self):
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._worker, name="sensitive-gc", daemon=True)
+                self._thread.start()
+
+    def notify(self):
+        """링크 삭제 발생 → 다음 틱에 정리"""
+        self.start()
+        self._wakeup.set()
+
+    def _worker(self):
+        while True:
+            self._wakeup.wait(timeout=self.interval)
+            self._wakeup.clear()
+            try:
+                self.collect()
+                self.last_error = None
+            except Exception as e:
+                self.last_error = str(e)
+                print(f"❌ [오류] 민감 단어 정리 실패: {e}")
+
+    def collect(self) -> int:
+        """고아 단어가 없을 때까지 배치 단위로 삭제하고 삭제한 개수 반환"""
+        with self._lock:
+            started = time.time()
+            deleted = 0
+            batches = 0
+            statement = text(_DELETE_ORPHANS.format(batch_size=self.batch_size))
+
+            while True:
+                with db_session() as session:
+                    word_ids = [row[0] for row in session.execute(statement).fetchall()]
+                removed = len(word_ids)
+                if word_ids and self.on_collect:
+                    self.on_collect(word_ids)
+                deleted += removed
+                batches += 1
+                if removed < self.batch_size:
+                    break
+
+            self.runs += 1
+            self.deleted_total += deleted
+            self.last_run_deleted = deleted
+            self.last_run_batches = batches
+            self.last_run_ms = round((time.time() - started) * 1000, 3)
+            self.last_run_at = time.time()
+            if deleted:
+                print(f"🧹 고아 민감 단어 {deleted}개 정리 ({batches}회, {self.last_run_ms}ms)")
+            return deleted
+
+    def stats(self) -> dict:
+        return {
+            "runs": self.runs,
+            "deleted_total": self.deleted_total,
+            "last_run_deleted": self.last_run_deleted,
+            "last_run_batches": self.last_run_batches,
+            "last_run_ms": self.last_run_ms,
+            "last_run_at": self.last_run_at,
+            "last_error": self.last_error,
+            "batch_size": self.batch_size,
+            "interval_sec": self.interval,
+        }
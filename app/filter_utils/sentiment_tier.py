@@ -0,0 +1,171 @@
+# app/filter_utils/sentiment_tier.py
+
+import os
+import re
+import threading
+import unicodedata
+import zlib
+import numpy as np
+
+FORMAT_VERSION = 1
+
+
+def extract_ngrams(text: str, ngram_min: int, ngram_max: int) -> list[str]:
+    """공백 정리 + 소문자 후 글자 n-gram (앞뒤에 공백을 붙여 어절 경계도 특징으로 사용)"""
+    text = " " + re.sub(r"\s+", " ", unicodedata.normalize("NFC", text)).strip().lower() + " "
+    return [text[i:i + n] for n in range(ngram_min, ngram_max + 1) for i in range(len(text) - n + 1)]
+
+
+def hash_features(text: str, n_features: int, ngram_min: int, ngram_max: int) -> np.ndarray:
+    """n-gram → 해시 버킷 번호 (중복 제거, 이진 특징)"""
+    buckets = {zlib.crc32(gram.encode("utf-8")) % n_features for gram in extract_ngrams(text, ngram_min, ngram_max)}
+    return np.fromiter(buckets, dtype=np.int64, count=len(buckets))
+
+
+class HashedNgramClassifier:
+    """
+    해시 글자 n-gram 로지스틱 회귀 (감성 1단계 분류기)
+    - 특징: 글자 n-gram 존재 여부를 n_features 버킷으로 해싱, 1/sqrt(특징 수) 로 길이 정규화
+    - predict() 는 (class_id, confidence) 로 transformer 경로(_classify) 와 같은 형태 (1 = positive)
+    - min_confidence: held-out 셋에서 측정한 escalation 기준 (평가 스크립트가 저장, 측정 전이면 None)
+    """
+
+    def __init__(self, weights: np.ndarray, bias: float, ngram_min: int = 1, ngram_max: int = 3, min_confidence: float | None = None):
+        self.weights = np.asarray(weights, dtype=np.float32)
+        self.bias = float(bias)
+        self.ngram_min = ngram_min
+        self.ngram_max = ngram_max
+        self.min_confidence = min_confidence
+
+    @property
+    def n_features(self) -> int:
+        return len(self.weights)
+
+    def features(self, text: str) -> np.ndarray:
+        return hash_features(text, self.n_features, self.ngram_min, self.ngram_max)
+
+    def predict_proba(self, text: str) -> float:
+        """positive 확률"""
+        idx = self.features(text)
+        if not len(idx):
+            return float(1 / (1 + np.exp(-self.bias)))
+        z = self.weights[idx].sum() / np.sqrt(len(idx)) + self.bias
+        return float(1 / (1 + np.exp(-z)))
+
+    def predict(self, text: str) -> tuple[int, float]:
+        p = self.predict_proba(text)
+        return (1, p) if p >= 0.5 else (0, 1 - p)
+
+    def save(self, path: str):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        extra = {} if self.min_confidence is None else {"min_confidence": self.min_confidence}
+        with open(path, "wb") as f:
+            np.savez(
+                f,
+                format_version=FORMAT_VERSION,
+                weights=self.weights,
+                bias=self.bias,
+                ngram_range=np.array([self.ngram_min, self.ngram_max]),
+                **extra
+            )
+
+    @classmethod
+    def load(cls, path: str) -> "HashedNgramClassifier":
+        with np.load(path) as data:
+            if int(data["format_version"]) != FORMAT_VERSION:
+                raise ValueError(f"지원하지 않는 형식 버전: {int(data['format_version'])}")
+            ngram_min, ngram_max = (int(n) for n in data["ngram_range"])
+            min_confidence = float(data["min_confidence"]) if "min_confidence" in data.files else None
+            return cls(data["weights"], float(data["bias"]), ngram_min, ngram_max, min_confidence)
+
+
+def train_hashed_ngram(
+    texts: list[str],
+    labels: list[int],
+    n_features: int = 2 ** 20,
+    ngram_min: int = 1,
+    ngram_max: int = 3,
+    epochs: int = 5,
+    batch_size: int = 256,
+    learning_rate: float = 0.5,
+    l2: float = 1e-6,
+    seed: int = 0
+) -> HashedNgramClassifier:
+    """미니 배치 SGD 로 로지스틱 회귀 학습 (오프라인 학습 스크립트용)"""
+    features = [hash_features(text, n_features, ngram_min, ngram_max) for text in texts]
+    labels = np.asarray(labels, dtype=np.float32)
+    weights = np.zeros(n_features, dtype=np.float32)
+    bias = 0.0
+    rng = np.random.default_rng(seed)
+
+    for epoch in range(epochs):
+        order = rng.permutation(len(features))
+        lr = learning_rate / (1 + epoch)
+        loss = 0.0
+        for start in range(0, len(order), batch_size):
+            batch = order[start:start + batch_size]
+            idx = [features[i] for i in batch]
+            rows = np.repeat(np.arange(len(batch)), [len(f) for f in idx])
+            flat = np.concatenate(idx) if idx else np.empty(0, dtype=np.int64)
+            scale = np.repeat([1 / np.sqrt(max(1, len(f))) for f in idx], [len(f) for f in idx]).astype(np.float32)
+
+            z = np.bincount(rows, weights=weights[flat] * scale, minlength=len(batch)) + bias
+            p = 1 / (1 + np.exp(-z))
+            y = labels[batch]
+            loss += float(-(y * np.log(p + 1e-9) + (1 - y) * np.log(1 - p + 1e-9)).sum())
+
+            grad = (p - y).astype(np.float32)
+            if l2:
+                weights[flat] *= 1 - lr * l2
+            np.add.at(weights, flat, -lr * grad[rows] * scale / len(batch))
+            bias -= lr * float(grad.mean())
+
+        print(f"🔁 epoch {epoch + 1}/{epochs} loss={loss / len(features):.4f}")
+
+    return HashedNgramClassifier(weights, bias, ngram_min, ngram_max)
+
+
+def load_tier_model(path: str) -> HashedNgramClassifier | None:
+    """1단계 분류기 로드 (파일이 없거나 읽을 수 없으면 None → transformer 만 사용)"""
+    if not path or not os.path.exists(path):
+        print(f"⚠️ [주의] 감성 1단계 분류기 파일 없음 → transformer 단일 경로 사용 ({path})")
+        return None
+    try:
+        classifier = HashedNgramClassifier.load(path)
+        print(f"✅ 감성 1단계 분류기 로드: {path} (특징 {classifier.n_features}개)")
+        return classifier
+    except Exception as e:
+        print(f"❌ [오류] 감성 1단계 분류기 로드 실패: {e}")
+        return None
+
+
+class TierStats:
+    """1단계에서 끝난 요청 / transformer 로 넘긴 요청 수와 시간 집계"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.fast = 0
+        self.escalated = 0
+        self.fast_time = 0.0
+        self.model_time = 0.0
+
+    def record(self, tier: str, elapsed: float):
+        with self._lock:
+            if tier == "fast":
+                self.fast += 1
+                self.fast_time += elapsed
+            else:
+                self.escalated += 1
+                self.model_time += elapsed
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.fast + self.escalated
+            return {
+                "total": total,
+                "fast": self.fast,
+                "escalated": self.escalated,
+                "escalation_rate": round(self.escalated / total, 4) if total else 0.0,
+                "avg_fast_ms": round(self.fast_time / self.fast * 1000, 3) if self.fast else 0.0,
+                "avg_model_ms": round(self.model_time / self.escalated * 1000, 3) if self.escalated else 0.0,
+            }
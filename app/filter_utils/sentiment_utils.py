@@ -1,28 +1,172 @@
-from transformers import AutoTokenizer, AutoModelForSequenceClassification
+from transformers import AutoTokenizer
 import torch
 import time
 import os
 
+from app.config import (
+    INFERENCE_BATCHING_ENABLED,
+    INFERENCE_MAX_BATCH_SIZE,
+    INFERENCE_MAX_WAIT_MS,
+    INFERENCE_POOL_WORKERS,
+    INFERENCE_WARMUP_SEQ_LENGTHS,
+    SENTIMENT_TIER_ENABLED,
+    SENTIMENT_TIER_MODEL_PATH,
+    SENTIMENT_TIER_MIN_CONFIDENCE
+)
+from app.filter_utils.inference_backend import SEQUENCE_CLASSIFICATION, load_model, reload_for_worker, warmup_model
+from app.filter_utils.inference_pool import inference_pool
+from app.filter_utils.inference_scheduler import create_scheduler
+from app.filter_utils.sentiment_tier import TierStats, load_tier_model
+
 sentiment_model_path = os.getenv("SENTIMENT_MODEL_PATH")
-tokenizer = AutoTokenizer.from_pretrained(sentiment_model_path)
-model = AutoModelForSequenceClassification.from_pretrained(sentiment_model_path)
+# 기동 lifecycle 에서 load_sentiment_model() 로 로딩 (import 시점에는 None)
+tokenizer = None
+model = None
 
-def predict_sentiment(text: str) -> dict:
-    start_time = time.time()
+def load_sentiment_model():
+    global tokenizer, model
+    tokenizer = AutoTokenizer.from_pretrained(sentiment_model_path)
+    model = load_model(sentiment_model_path, SEQUENCE_CLASSIFICATION)
+
+def reload_sentiment_model_in_worker():
+    global model
+    model = reload_for_worker(model, inference_pool.threads)
 
-    inputs = tokenizer(text, return_tensors="pt", truncation=True, padding=True)
+def warmup_sentiment_model():
+    warmup_model(model, tokenizer, INFERENCE_WARMUP_SEQ_LENGTHS, INFERENCE_MAX_BATCH_SIZE)
+
+def _classify(inputs) -> list[tuple[int, float]]:
+    """토크나이징된 배치 입력에 대해 forward pass → (class_id, confidence) 리스트"""
     with torch.no_grad():
         outputs = model(**inputs)
 
-    logits = outputs.logits
-    probs = torch.nn.functional.softmax(logits, dim=1)
-    predicted_class_id = torch.argmax(probs, dim=1).item()
-    confidence = probs[0][predicted_class_id].item()
+    probs = torch.nn.functional.softmax(outputs.logits, dim=1)
+    confidences, class_ids = torch.max(probs, dim=1)
+    return list(zip(class_ids.tolist(), confidences.tolist()))
+
+def _predict_sentiment_batch(texts: list[str]) -> list[tuple[int, float]]:
+    """여러 문장을 한 번의 forward pass로 분류"""
+    inputs = tokenizer(texts, return_tensors="pt", truncation=True, padding=True)
+    return _classify(inputs)
+
+def _to_label(class_id: int) -> str:
+    return "positive" if class_id == 1 else "negative"
+
+# 배치 분류 (추론 프로세스 풀이 켜져 있으면 워커에서 실행) - 모든 추론 경로는 이 함수를 거침
+classify_batch = inference_pool.task("sentiment", _predict_sentiment_batch)
+
+# 동시 요청을 모아 배치로 추론 (추론 프로세스 풀이 켜져 있으면 배치를 워커 수만큼 동시에 넘김)
+sentiment_scheduler = create_scheduler(
+    "sentiment",
+    classify_batch,
+    max_batch_size=INFERENCE_MAX_BATCH_SIZE,
+    max_wait_ms=INFERENCE_MAX_WAIT_MS,
+    workers=max(1, INFERENCE_POOL_WORKERS)
+)
+
+# 1단계 분류기 (없으면 None → 항상 transformer)
+tier_model = load_tier_model(SENTIMENT_TIER_MODEL_PATH) if SENTIMENT_TIER_ENABLED else None
+
+# escalation 기준: 환경변수 → 평가 스크립트가 모델 파일에 저장한 측정값 순 (둘 다 없으면 1단계 사용 안 함)
+tier_min_confidence = SENTIMENT_TIER_MIN_CONFIDENCE
+if tier_model is not None and tier_min_confidence is None:
+    tier_min_confidence = tier_model.min_confidence
+    if tier_min_confidence is None:
+        print("⚠️ [주의] 감성 1단계 기준 미측정 → transformer 단일 경로 사용 (python -m benchmarks.eval_sentiment_tier --write 로 측정)")
+        tier_model = None
+tier_stats = TierStats()
+
+def predict_sentiment(text: str) -> dict:
+    """
+    단일 문장 감성 분석
+    - 1단계 분류기가 있으면 먼저 실행하고, confidence 가 tier_min_confidence 이상이면 그대로 반환 (tier="fast")
+    - 기준 미만이거나 1단계 분류기가 없으면 transformer 로 추론 (tier="model")
+    """
+    start_time = time.time()
+
+    if tier_model is not None:
+        predicted_class_id, confidence = tier_model.predict(text)
+        if confidence >= tier_min_confidence:
+            elapsed_time = time.time() - start_time
+            tier_stats.record("fast", elapsed_time)
+            return {
+                "label": _to_label(predicted_class_id),
+                "confidence": confidence,
+                "inference_time": round(elapsed_time, 4),
+                "tier": "fast"
+            }
 
-    elapsed_time = round(time.time() - start_time, 4)
+    if INFERENCE_BATCHING_ENABLED:
+        predicted_class_id, confidence = sentiment_scheduler.run(text)
+    else:
+        predicted_class_id, confidence = classify_batch([text])[0]
+
+    elapsed_time = time.time() - start_time
+    if tier_model is not None:
+        tier_stats.record("model", elapsed_time)
 
     return {
-        "label": "positive" if predicted_class_id == 1 else "negative",
+        "label": _to_label(predicted_class_id),
         "confidence": confidence,
-        "inference_time": elapsed_time
-    }
\ No newline at end of file
+        "inference_time": round(elapsed_time, 4),
+        "tier": "model"
+    }
+
+def get_sentiment_tier_stats() -> dict:
+    return {
+        "enabled": tier_model is not None,
+        "model_path": SENTIMENT_TIER_MODEL_PATH,
+        "min_confidence": tier_min_confidence,
+        **tier_stats.stats()
+    }
+
+def iter_sentiment_buckets(texts: list[str], bucket_size: int):
+    """
+    길이 기준 버킷 배치 추론 (제너레이터)
+    - 토큰 길이로 정렬 후 bucket_size 단위로 묶어 패딩 낭비 최소화
+    - 버킷 하나가 끝날 때마다 [(원래 인덱스, 결과 dict), ...] 를 yield
+    - 길이 정렬용 토크나이징만 여기서 하고, 버킷 추론은 classify_batch 로 (풀 사용 시 워커에서, 버킷 안 최대 길이로 패딩)
+    """
+    if not texts:
+        return
+
+    start_time = time.time()
+
+    encoded = tokenizer(texts, truncation=True)
+    lengths = [len(ids) for ids in encoded["input_ids"]]
+    order = sorted(range(len(texts)), key=lambda i: lengths[i])
+
+    for offset in range(0, len(order), bucket_size):
+        indices = order[offset:offset + bucket_size]
+        predictions = classify_batch([texts[i] for i in indices])
+        elapsed = round(time.time() - start_time, 4)
+
+        yield [
+            (i, {"label": _to_label(class_id), "confidence": confidence, "inference_time": elapsed})
+            for i, (class_id, confidence) in zip(indices, predictions)
+        ], {
+            "real_tokens": sum(lengths[i] for i in indices),
+            "padded_tokens": max(lengths[i] for i in indices) * len(indices)
+        }
+
+def predict_sentiment_batch(texts: list[str], bucket_size: int) -> dict:
+    """길이 버킷 배치 추론 결과를 원래 순서로 정렬해 반환"""
+    start_time = time.time()
+    results = [None] * len(texts)
+    buckets = 0
+    real_tokens = 0
+    padded_tokens = 0
+
+    for bucket, usage in iter_sentiment_buckets(texts, bucket_size):
+        for i, result in bucket:
+            results[i] = result
+        buckets += 1
+        real_tokens += usage["real_tokens"]
+        padded_tokens += usage["padded_tokens"]
+
+    return {
+        "results": results,
+        "buckets": buckets,
+        "padding_efficiency": round(real_tokens / padded_tokens, 4) if padded_tokens else 1.0,
+        "inference_time": round(time.time() - start_time, 4)
+    }
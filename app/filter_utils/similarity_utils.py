@@ -4,52 +4,188 @@ import torch
 import time
 import os
 
+from app.config import (
+    SIMILARITY_CACHE_MAX_BYTES,
+    SIMILARITY_CACHE_MAX_USERS,
+    SIMILARITY_CACHE_TTL_SEC,
+    MESSAGE_EMBEDDING_CACHE_MAX_BYTES,
+    MESSAGE_EMBEDDING_CACHE_MAX_ENTRIES,
+    MESSAGE_EMBEDDING_CACHE_TTL_SEC,
+    SIMILARITY_REGISTER_BATCH_SIZE,
+    SIMILARITY_BULK_CHUNK_SIZE,
+    SIMILARITY_REEMBED_FETCH_SIZE,
+    SIMILARITY_REEMBED_BATCH_SIZE,
+    INFERENCE_BATCHING_ENABLED,
+    INFERENCE_MAX_BATCH_SIZE,
+    INFERENCE_MAX_WAIT_MS,
+    INFERENCE_POOL_WORKERS,
+    INFERENCE_WARMUP_SEQ_LENGTHS,
+    SENSITIVE_GC_BATCH_SIZE,
+    SENSITIVE_GC_INTERVAL_SEC,
+    SIMILARITY_INDEX_PATH,
+    SIMILARITY_INDEX_NLIST,
+    SIMILARITY_INDEX_NPROBE,
+    SIMILARITY_INDEX_SAVE_INTERVAL_SEC,
+    SIMILARITY_EMBEDDING_ENCODING,
+    SIMILARITY_CACHE_ENCODING
+)
 from app.database import db_session
+from app.filter_utils.cache_utils import (
+    EmbeddingCache,
+    UserMatrixCache,
+    build_user_matrix,
+    message_cache_key,
+    normalize_message,
+    normalize_rows
+)
+from app.filter_utils.embedding_codec import ENCODINGS, CompactMatrix, encode_embedding, decode_embedding
+from app.filter_utils.inference_backend import FEATURE_EXTRACTION, load_model, reload_for_worker, warmup_model
+from app.filter_utils.inference_pool import inference_pool
+from app.filter_utils.inference_scheduler import create_scheduler
+from app.filter_utils.sensitive_gc import SensitiveWordGC, count_orphans
+from app.filter_utils.reembed_job import ReembedJob
+from app.filter_utils.vector_index import IVFIndex
 from db_models.similarity import SensitiveWord, UserSensitiveWord
+from sqlalchemy import delete, insert, select
+from sqlalchemy.exc import IntegrityError
 
-from scipy.spatial.distance import cdist
-from transformers import AutoTokenizer, AutoModel
+from transformers import AutoTokenizer
 
 
+for _encoding in (SIMILARITY_EMBEDDING_ENCODING, SIMILARITY_CACHE_ENCODING):
+    if _encoding not in ENCODINGS:
+        raise ValueError(f"지원하지 않는 임베딩 형식: {_encoding} (가능: {', '.join(ENCODINGS)})")
+
 # 사전 로딩
 embedding_model_path = os.getenv("EMBEDDING_MODEL_PATH")
 
 # 모델 경로에서 이름만 추출
 model_name = embedding_model_path.split("/")[-1]
 
-tokenizer = AutoTokenizer.from_pretrained(embedding_model_path)
-model = AutoModel.from_pretrained(embedding_model_path)
-
-def get_sentence_embedding(model, tokenizer, sentence):
-    inputs = tokenizer(sentence, return_tensors="pt", truncation=True, padding=True)
+# 저장된 임베딩의 model_name / 캐시 키에 쓰는 모델 식별자 (from_pretrained 의 name_or_path 와 같은 값 → 기존 행과 호환)
+embedding_model_id = embedding_model_path
+
+# 기동 lifecycle 에서 load_embedding_model() 로 로딩 (import 시점에는 None)
+tokenizer = None
+model = None
+
+def load_embedding_model():
+    global tokenizer, model
+    tokenizer = AutoTokenizer.from_pretrained(embedding_model_path)
+    model = load_model(embedding_model_path, FEATURE_EXTRACTION)
+
+def reload_embedding_model_in_worker():
+    global model
+    model = reload_for_worker(model, inference_pool.threads)
+
+def warmup_embedding_model():
+    warmup_model(model, tokenizer, INFERENCE_WARMUP_SEQ_LENGTHS, INFERENCE_MAX_BATCH_SIZE)
+
+# 유저별 민감 단어 행렬 캐시 (등록/삭제 시 해당 유저만 무효화, 다른 워커의 변경은 TTL 로 반영)
+user_matrix_cache = UserMatrixCache(
+    max_bytes=SIMILARITY_CACHE_MAX_BYTES,
+    max_entries=SIMILARITY_CACHE_MAX_USERS,
+    ttl_sec=SIMILARITY_CACHE_TTL_SEC
+)
+
+# 검사 메시지 임베딩 캐시 (도배/복붙 메시지는 추론 없이 재사용)
+message_embedding_cache = EmbeddingCache(
+    max_bytes=MESSAGE_EMBEDDING_CACHE_MAX_BYTES,
+    max_entries=MESSAGE_EMBEDDING_CACHE_MAX_ENTRIES,
+    ttl_sec=MESSAGE_EMBEDDING_CACHE_TTL_SEC
+)
+
+# 전체 민감 단어 근사 검색 인덱스 (등록/재임베딩/정리 시 증분 반영)
+vector_index = IVFIndex(nprobe=SIMILARITY_INDEX_NPROBE, nlist=SIMILARITY_INDEX_NLIST or None, encoding=SIMILARITY_CACHE_ENCODING)
+vector_index.model_name = embedding_model_id
+
+# 링크가 모두 사라진 민감 단어는 요청 경로가 아닌 백그라운드에서 회수
+sensitive_gc = SensitiveWordGC(
+    batch_size=SENSITIVE_GC_BATCH_SIZE,
+    interval_sec=SENSITIVE_GC_INTERVAL_SEC,
+    on_collect=vector_index.remove
+)
+
+def mean_pooling(last_hidden_state: torch.Tensor, attention_mask: torch.Tensor) -> torch.Tensor:
+    """attention mask 기반 평균 풀링 - 패딩 토큰은 평균에서 제외"""
+    mask = attention_mask.unsqueeze(-1).to(last_hidden_state.dtype)
+    summed = (last_hidden_state * mask).sum(dim=1)
+    counts = mask.sum(dim=1).clamp(min=1e-9)
+    return summed / counts
+
+def get_sentence_embeddings(model, tokenizer, sentences: list[str]) -> np.ndarray:
+    """여러 문장을 한 번에 토크나이징 + 단일 forward pass로 임베딩 (n, dim)"""
+    inputs = tokenizer(sentences, return_tensors="pt", truncation=True, padding=True)
     with torch.no_grad():
         outputs = model(**inputs)
-        embeddings = outputs.last_hidden_state.mean(dim=1)
-    return embeddings.squeeze().numpy()
+        embeddings = mean_pooling(outputs.last_hidden_state, inputs["attention_mask"])
+    return embeddings.numpy()
+
+def _embed_sentences_batch(sentences: list[str]) -> list[np.ndarray]:
+    return list(get_sentence_embeddings(model, tokenizer, sentences))
+
+# 배치 임베딩 (추론 프로세스 풀이 켜져 있으면 워커에서 실행)
+embed_batch = inference_pool.task("embedding", _embed_sentences_batch)
+
+# 동시 요청을 모아 배치로 임베딩
+embedding_scheduler = create_scheduler(
+    "embedding",
+    embed_batch,
+    max_batch_size=INFERENCE_MAX_BATCH_SIZE,
+    max_wait_ms=INFERENCE_MAX_WAIT_MS,
+    workers=max(1, INFERENCE_POOL_WORKERS)
+)
+
+def encode_sentence(sentence: str) -> np.ndarray:
+    """단일 문장 임베딩 - 배치 스케줄러 사용 시 동시 요청과 묶어서 추론"""
+    if INFERENCE_BATCHING_ENABLED:
+        return embedding_scheduler.run(sentence)
+    return embed_batch([sentence])[0]
+
+def encode_message(message: str) -> np.ndarray:
+    """검사용 메시지 임베딩 (정규화된 벡터) - 정규화된 문구 + 모델 이름 기준 캐시 우선"""
+    normalized = normalize_message(message)
+    key = message_cache_key(normalized, embedding_model_id)
+    return message_embedding_cache.get_or_compute(
+        key, lambda: normalize_rows(encode_sentence(normalized).reshape(1, -1))[0]
+    )
 
 def insert_sensitive_word(user_id: str, sentence: str):
+    """
+    민감 단어 등록 + 유저 연결
+    - 고아 정리(GC)가 같은 단어를 지우는 중이면 링크 INSERT 가 FK 오류로 실패 → 새 단어로 한 번 더 시도
+    - 같은 단어를 동시에 새로 등록해 unique 오류가 난 경우도 재시도에서 기존 단어로 연결
+    """
+    try:
+        return _insert_sensitive_word(user_id, sentence)
+    except IntegrityError as e:
+        print(f"🔁 민감 단어 등록 충돌 → 재시도: {sentence} ({type(e.orig).__name__})")
+        return _insert_sensitive_word(user_id, sentence)
+
+def _insert_sensitive_word(user_id: str, sentence: str):
     created = False
 
     with db_session() as session:
-        # 1. 단어 존재 확인
-        existing_word = session.query(SensitiveWord).filter_by(
-            word=sentence,
-            model_name=model.name_or_path  # 혹은 고정된 model_name 값
-        ).first()
+        # 1. 단어 존재 확인 (word 는 모델과 무관하게 unique - 다른 모델 임베딩이면 재임베딩 작업이 갱신)
+        existing_word = session.query(SensitiveWord).filter_by(word=sentence).first()
 
         if existing_word:
             word_id = existing_word.word_id
+            stale = existing_word.model_name != embedding_model_id
         else:
-            embedding = get_sentence_embedding(model, tokenizer, sentence)
+            # 등록 시 한 번만 정규화해서 저장 (검사는 내적만으로 cosine 유사도)
+            embedding = normalize_rows(encode_sentence(sentence).reshape(1, -1))[0]
             new_word = SensitiveWord(
                 word=sentence,
-                embedding=embedding.tobytes(),
-                model_name=model.name_or_path  # 혹은 고정 문자열
+                embedding=encode_embedding(embedding, SIMILARITY_EMBEDDING_ENCODING),
+                embedding_encoding=SIMILARITY_EMBEDDING_ENCODING,
+                model_name=embedding_model_id  # 혹은 고정 문자열
             )
             session.add(new_word)
             session.flush()  # word_id 가져오기 위해 flush
             word_id = new_word.word_id
             created = True
+            stale = False
 
         # 2. 관계 테이블 중복 확인 및 삽입
         exists = session.query(UserSensitiveWord).filter_by(
@@ -61,10 +197,212 @@ def insert_sensitive_word(user_id: str, sentence: str):
             link = UserSensitiveWord(user_id=user_id, word_id=word_id)
             session.add(link)
 
+    # 커밋 이후 무효화해야 다른 요청이 커밋 전 데이터를 캐시에 다시 올리지 않음
+    user_matrix_cache.invalidate(user_id)
+    if created:
+        vector_index.add([word_id], [sentence], embedding.reshape(1, -1))
+    if stale:
+        reembed_job.start()
+
+    return {
+        "word_id": word_id,
+        "created": created
+    }
+        
+def _chunks(values: list, size: int):
+    for i in range(0, len(values), size):
+        yield values[i:i + size]
+
+def embed_sentences_bucketed(sentences: list[str], batch_size: int) -> list[np.ndarray]:
+    """
+    여러 문장을 길이 기준 미니 배치로 임베딩 (입력 순서대로 반환)
+    - 토큰 길이로 정렬 후 batch_size 단위로 묶어 패딩 낭비 최소화 (mask 기반 풀링이라 결과는 배치 구성과 무관)
+    """
+    if not sentences:
+        return []
+
+    lengths = [len(ids) for ids in tokenizer(sentences, truncation=True)["input_ids"]]
+    order = sorted(range(len(sentences)), key=lambda i: lengths[i])
+
+    embeddings = [None] * len(sentences)
+    for indices in _chunks(order, max(1, batch_size)):
+        batch = embed_batch([sentences[i] for i in indices])
+        for i, embedding in zip(indices, batch):
+            embeddings[i] = embedding
+    return embeddings
+
+def _on_reembed_batch(word_ids: list[int], words: list[str], embeddings: list[np.ndarray]):
+    """재임베딩된 단어를 가진 유저들의 행렬 캐시 무효화 + 벡터 인덱스 갱신"""
+    vector_index.add(word_ids, words, np.stack(embeddings))
+    with db_session() as session:
+        user_ids = [
+            row[0] for row in session.query(UserSensitiveWord.user_id)
+            .filter(UserSensitiveWord.word_id.in_(word_ids))
+            .distinct()
+            .all()
+        ]
+    for user_id in user_ids:
+        user_matrix_cache.invalidate(user_id)
+
+def _on_reembed_follow():
+    """다른 워커가 재임베딩한 단어 반영 (인덱스에 없는 현재 모델 단어 추가 + 유저 행렬 캐시 비움)"""
+    diff = sync_vector_index()
+    user_matrix_cache.clear()
+    print(f"🔄 다른 워커의 재임베딩 반영: 인덱스 {diff}")
+
+# 다른 모델로 만든 임베딩을 현재 모델로 다시 계산하는 백그라운드 작업 (uvicorn 워커 중 한 곳에서만 실행)
+reembed_job = ReembedJob(
+    model_name=embedding_model_id,
+    embed_fn=lambda sentences: normalize_rows(np.stack(embed_sentences_bucketed(sentences, SIMILARITY_REEMBED_BATCH_SIZE))),
+    fetch_size=min(SIMILARITY_REEMBED_FETCH_SIZE, SIMILARITY_BULK_CHUNK_SIZE),
+    encoding=SIMILARITY_EMBEDDING_ENCODING,
+    on_batch=_on_reembed_batch,
+    on_follow=_on_reembed_follow
+)
+
+def _find_sensitive_words(sentences: list[str]) -> dict[str, tuple[int, str]]:
+    """이미 등록된 문장 조회 → {word: (word_id, model_name)} (word 는 모델과 무관하게 unique)"""
+    existing = {}
+    with db_session() as session:
+        for chunk in _chunks(sentences, SIMILARITY_BULK_CHUNK_SIZE):
+            rows = session.query(SensitiveWord.word_id, SensitiveWord.word, SensitiveWord.model_name).filter(
+                SensitiveWord.word.in_(chunk)
+            ).all()
+            existing.update({word: (word_id, model_name) for word_id, word, model_name in rows})
+    return existing
+
+def _insert_sensitive_words_bulk(
+    user_ids: list[str],
+    sentences: list[str],
+    existing: dict[str, tuple[int, str]],
+    embeddings: dict[str, np.ndarray]
+) -> tuple[dict[str, int], int, int]:
+    """
+    새 문장 단어 일괄 INSERT + 링크 일괄 INSERT (단일 트랜잭션, 임베딩은 호출 전에 끝나 있어야 함)
+    :return: ({word: word_id}, 새 링크 수, 이미 있던 링크 수)
+    """
+    word_ids = {word: word_id for word, (word_id, _) in existing.items()}
+    new_sentences = [s for s in sentences if s not in existing]
+
+    with db_session() as session:
+        # 1. 단어 일괄 INSERT (OUTPUT 으로 word_id 회수)
+        if new_sentences:
+            inserted = session.execute(
+                insert(SensitiveWord).returning(SensitiveWord.word_id, SensitiveWord.word),
+                [
+                    {
+                        "word": sentence,
+                        "embedding": encode_embedding(embeddings[sentence], SIMILARITY_EMBEDDING_ENCODING),
+                        "embedding_encoding": SIMILARITY_EMBEDDING_ENCODING,
+                        "model_name": embedding_model_id
+                    }
+                    for sentence in new_sentences
+                ]
+            ).fetchall()
+            word_ids.update({word: word_id for word_id, word in inserted})
+
+        # 2. 링크 일괄 INSERT (이미 연결된 쌍은 제외)
+        linked_ids = set(word_ids.values())
+        existing_links = set()
+        for chunk in _chunks(user_ids, SIMILARITY_BULK_CHUNK_SIZE):
+            rows = session.query(UserSensitiveWord.user_id, UserSensitiveWord.word_id).filter(
+                UserSensitiveWord.user_id.in_(chunk)
+            ).all()
+            existing_links.update((user_id, word_id) for user_id, word_id in rows if word_id in linked_ids)
+
+        new_links = [
+            {"user_id": user_id, "word_id": word_id}
+            for user_id in user_ids
+            for word_id in dict.fromkeys(word_ids[s] for s in sentences if s in word_ids)
+            if (user_id, word_id) not in existing_links
+        ]
+        if new_links:
+            session.execute(insert(UserSensitiveWord), new_links)
+
+    return word_ids, len(new_links), len(existing_links)
+
+def insert_sensitive_words_bulk(user_ids: list[str], sentences: list[str]) -> dict:
+    """
+    여러 유저에게 여러 민감 문장을 한 번에 등록
+    - 현재 모델로 이미 임베딩된 문장은 한 번의 조회로 걸러 재사용
+    - 새 문장만 길이 버킷 미니 배치로 임베딩 (DB 세션 밖) 후 단어/링크를 일괄 INSERT (단일 트랜잭션)
+    - 다른 모델로 저장된 문장은 연결만 하고 stale 로 안내 (재임베딩 작업이 끝날 때까지 검사에서 제외)
+    - 단일 등록과 같은 경합(GC 가 기존 단어를 지워 FK 오류, 같은 문장 동시 등록으로 unique 오류)은
+      기존 단어를 다시 조회해 한 번 더 시도 (새로 필요해진 문장만 추가 임베딩)
+    """
+    start_time = time.time()
+
+    user_ids = list(dict.fromkeys(u.strip() for u in user_ids if u.strip()))
+    sentences = list(dict.fromkeys(s.strip() for s in sentences if s.strip()))
+
+    if not user_ids or not sentences:
         return {
-            "word_id": word_id,
-            "created": created
+            "registered": [],
+            "reused": [],
+            "stale": [],
+            "linked": 0,
+            "already_linked": 0,
+            "message": "⚠️ 등록할 유효한 유저 또는 문장이 없습니다.",
+            "timing": None
         }
+
+    embeddings: dict[str, np.ndarray] = {}
+    dedup_time = embed_time = insert_time = 0.0
+
+    for attempt in range(2):
+        # 1. 기존 단어 조회
+        started = time.time()
+        existing = _find_sensitive_words(sentences)
+        new_sentences = [s for s in sentences if s not in existing]
+        dedup_time += time.time() - started
+
+        # 2. 아직 임베딩하지 않은 새 문장만 미니 배치 임베딩 (트랜잭션을 잡지 않은 상태에서)
+        started = time.time()
+        to_embed = [s for s in new_sentences if s not in embeddings]
+        if to_embed:
+            vectors = normalize_rows(np.stack(embed_sentences_bucketed(to_embed, SIMILARITY_REGISTER_BATCH_SIZE)))
+            embeddings.update(zip(to_embed, vectors))
+        embed_time += time.time() - started
+
+        # 3. 단어 / 링크 일괄 INSERT
+        started = time.time()
+        try:
+            word_ids, linked, already_linked = _insert_sensitive_words_bulk(user_ids, sentences, existing, embeddings)
+            insert_time += time.time() - started
+            break
+        except IntegrityError as e:
+            insert_time += time.time() - started
+            if attempt:
+                raise
+            print(f"🔁 민감 단어 일괄 등록 충돌 → 재시도: {len(sentences)}개 문장 ({type(e.orig).__name__})")
+
+    stale = [s for s in sentences if s in existing and existing[s][1] != embedding_model_id]
+    reused = [s for s in sentences if s in existing and existing[s][1] == embedding_model_id]
+
+    # 커밋 이후 대상 유저 캐시 무효화
+    for user_id in user_ids:
+        user_matrix_cache.invalidate(user_id)
+    # 재시도 전에 autocommit 으로 남은 단어(이번에 임베딩했지만 재시도에서 기존 단어로 잡힌 문장)도 인덱스에 반영
+    indexed = [s for s in embeddings if s in word_ids]
+    if indexed:
+        vector_index.add([word_ids[s] for s in indexed], indexed, np.stack([embeddings[s] for s in indexed]))
+    if stale:
+        reembed_job.start()
+
+    return {
+        "registered": new_sentences,
+        "reused": reused,
+        "stale": stale,
+        "linked": linked,
+        "already_linked": already_linked,
+        "message": f"✅ 신규 {len(new_sentences)}개 / 재사용 {len(reused)}개 / 연결 {linked}건",
+        "timing": {
+            "dedup": round(dedup_time, 4),
+            "embed": round(embed_time, 4),
+            "insert": round(insert_time, 4),
+            "total": round(time.time() - start_time, 4)
+        }
+    }
         
 def get_sensitive_words_by_user(user_id: str) -> list[str]:
     with db_session() as session:
@@ -80,115 +418,376 @@ def get_sensitive_words_by_user(user_id: str) -> list[str]:
             "count": len(words)
         }
 
-def compute_similarity(message_embedding: np.ndarray, embeddings: list[np.ndarray]) -> tuple[float, int]:
+def _load_user_matrix(user_id: str):
     """
-    메시지 임베딩과 민감 단어 임베딩들 간의 유사도 계산
-    - cosine 유사도 기준
-    - 가장 높은 유사도와 해당 인덱스 반환
+    DB에서 유저 민감 단어 + 임베딩을 읽어 정규화된 행렬로 변환 (캐시 miss 시 호출)
+    - 현재 모델로 만든 임베딩만 사용 (재임베딩 전 행은 벡터 공간이 달라 제외)
     """
-    similarities = 1 - cdist(message_embedding, embeddings, metric='cosine')[0]
-    max_index = int(np.argmax(similarities))
-    max_similarity = float(similarities[max_index])
-    return max_similarity, max_index
-
-def check_message_similarity(user_id: str, message: str, threshold: float):
-    with db_session() as session:  # SQLAlchemy 세션 사용
-        start_time = time.time()
-
-        # 1. 사용자 민감 단어 조회
+    with db_session() as session:
         results = (
-            session.query(SensitiveWord.word, SensitiveWord.embedding)
+            session.query(SensitiveWord.word_id, SensitiveWord.word, SensitiveWord.embedding, SensitiveWord.embedding_encoding)
             .join(UserSensitiveWord, SensitiveWord.word_id == UserSensitiveWord.word_id)
-            .filter(UserSensitiveWord.user_id == user_id)
+            .filter(UserSensitiveWord.user_id == user_id, SensitiveWord.model_name == embedding_model_id)
             .all()
         )
-        if not results:
-            return None
+    return build_user_matrix(results, SIMILARITY_CACHE_ENCODING)
 
-        # 2. 단어 리스트, 임베딩 파싱
-        words = [row[0] for row in results]
-        embeddings = [np.frombuffer(row[1], dtype=np.float32) for row in results]
+def get_user_matrix(user_id: str):
+    return user_matrix_cache.get_or_load(user_id, _load_user_matrix)
 
-        # 3. 입력 메시지 임베딩
-        message_embedding = get_sentence_embedding(model, tokenizer, message).reshape(1, -1)
+def get_similarity_cache_stats() -> dict:
+    return user_matrix_cache.stats()
 
-        # 4. 유사도 계산
-        max_similarity, max_index = compute_similarity(message_embedding, embeddings)
-        most_similar_word = words[max_index]
-        elapsed = time.time() - start_time
+def get_message_embedding_cache_stats() -> dict:
+    return message_embedding_cache.stats()
 
-        return {
-            "max_similarity": max_similarity,
-            "most_similar_word": most_similar_word,
-            "threshold": float(threshold),
-            "match": max_similarity >= threshold,
-            "inference_time": round(elapsed, 4)
+def _summarize_scores(similarities: np.ndarray, words: list[str], threshold: float, top_k: int | None = None, all_matches: bool = False) -> dict:
+    """
+    점수 벡터 → 결과 dict
+    - top_k: 점수 상위 k개 문구를 matches 로 반환
+    - all_matches: threshold 이상인 문구를 모두 matches 로 반환 (top_k 와 함께 주면 그중 상위 k개)
+    """
+    max_index = int(np.argmax(similarities))
+    max_similarity = float(similarities[max_index])
+    top_k = max(top_k or 0, 0)
+
+    matches = []
+    if top_k or all_matches:
+        candidates = np.flatnonzero(similarities >= threshold) if all_matches else np.arange(len(similarities))
+        if top_k and len(candidates) > top_k:
+            candidates = candidates[np.argpartition(-similarities[candidates], top_k)[:top_k]]
+        candidates = candidates[np.argsort(-similarities[candidates])]
+        matches = [{"word": words[i], "score": float(similarities[i])} for i in candidates]
+
+    return {
+        "max_similarity": max_similarity,
+        "most_similar_word": words[max_index],
+        "threshold": float(threshold),
+        "match": max_similarity >= threshold,
+        "matches": matches
+    }
+
+def _score_user_matrix(entry, message_embedding: np.ndarray, threshold: float, top_k: int | None = None, all_matches: bool = False) -> dict:
+    """정규화된 메시지 임베딩과 유저 행렬의 행렬-벡터 곱 한 번 (내적 = cosine 유사도, 압축 형식 그대로 계산)"""
+    return _summarize_scores(entry.matrix.matvec(message_embedding), entry.words, threshold, top_k, all_matches)
+
+def check_message_similarity(user_id: str, message: str, threshold: float, top_k: int | None = None, all_matches: bool = False):
+    start_time = time.time()
+
+    # 1. 사용자 민감 단어 행렬 조회 (캐시 우선)
+    entry = get_user_matrix(user_id)
+    if not entry.words:
+        return None
+
+    # 2. 입력 메시지 임베딩 (정규화, 캐시 우선)
+    message_embedding = encode_message(message)
+
+    # 3. 유사도 계산
+    result = _score_user_matrix(entry, message_embedding, threshold, top_k, all_matches)
+    result["inference_time"] = round(time.time() - start_time, 4)
+    return result
+
+def check_message_similarity_multi(user_ids: list[str], message: str, threshold: float, top_k: int | None = None, all_matches: bool = False) -> dict:
+    """
+    한 메시지를 여러 수신 유저의 민감 단어와 비교 (단체 채팅 등)
+    - 메시지는 한 번만 임베딩
+    - 유저들 단어의 합집합(word_id 기준 중복 제거)으로 행렬을 만들어 행렬-벡터 곱 한 번으로 점수 계산
+    - 유저별 결과는 합집합 점수에서 자기 단어 위치만 골라 집계 (민감 단어가 없는 유저는 None)
+    """
+    start_time = time.time()
+
+    # 1. 유저별 행렬 조회 (캐시 우선, 중복 유저는 한 번만)
+    entries = {user_id: get_user_matrix(user_id) for user_id in dict.fromkeys(user_ids)}
+    t_loaded = time.time()
+
+    # 2. 단어 합집합 (여러 유저가 공유하는 단어는 한 행만)
+    positions = {}
+    parts = []
+    for entry in entries.values():
+        local = []
+        for i, word_id in enumerate(entry.word_ids):
+            if word_id not in positions:
+                positions[word_id] = len(positions)
+                local.append(i)
+        if local:
+            parts.append(entry.matrix.take(local))
+    total_words = sum(len(entry.word_ids) for entry in entries.values())
+
+    results = {user_id: None for user_id in entries}
+    t_encoded = t_scored = t_loaded
+    if parts:
+        # 3. 메시지 임베딩 1회 + 합집합 행렬과 곱 1회
+        message_embedding = encode_message(message)
+        t_encoded = time.time()
+        scores = CompactMatrix.concat(parts, SIMILARITY_CACHE_ENCODING).matvec(message_embedding)
+
+        # 4. 유저별 집계
+        for user_id, entry in entries.items():
+            if entry.word_ids:
+                index = np.fromiter((positions[word_id] for word_id in entry.word_ids), dtype=np.int64)
+                results[user_id] = _summarize_scores(scores[index], entry.words, threshold, top_k, all_matches)
+        t_scored = time.time()
+
+    elapsed = round(t_scored - start_time, 4)
+    for result in results.values():
+        if result is not None:
+            result["inference_time"] = elapsed
+
+    return {
+        "results": results,
+        "unique_words": len(positions),
+        "total_words": total_words,
+        "timing": {
+            "load_matrices": round(t_loaded - start_time, 4),
+            "encode": round(t_encoded - t_loaded, 4),
+            "scoring": round(t_scored - t_encoded, 4),
+            "total": elapsed
+        }
+    }
+
+def check_messages_similarity_batch(items: list[dict]) -> dict:
+    """
+    여러 (user_id, message, threshold) 항목을 한 번에 검사
+    - 민감 단어가 있는 항목의 메시지 중 캐시에 없는 문구만 모아 embed_batch 한 번으로 임베딩 (풀 사용 시 워커에서)
+    - 결과는 입력 순서 그대로 반환 (민감 단어가 없는 유저는 None)
+    """
+    start_time = time.time()
+
+    # 1. 유저별 행렬 조회 (중복 유저는 한 번만)
+    entries = {user_id: get_user_matrix(user_id) for user_id in dict.fromkeys(item["user_id"] for item in items)}
+    targets = [i for i, item in enumerate(items) if entries[item["user_id"]].words]
+    t_loaded = time.time()
+
+    # 2. 메시지 임베딩 캐시 조회 (배치 안의 같은 문구는 한 번만)
+    keys = {}
+    texts = {}
+    for i in targets:
+        normalized = normalize_message(items[i]["message"])
+        keys[i] = message_cache_key(normalized, embedding_model_id)
+        texts.setdefault(keys[i], normalized)
+
+    vectors = {}
+    for key in texts:
+        vector = message_embedding_cache.get(key)
+        if vector is not None:
+            vectors[key] = vector
+    missing = [key for key in texts if key not in vectors]
+    cache_hits = sum(1 for i in targets if keys[i] in vectors)
+    t_looked_up = time.time()
+
+    # 3~4. 캐시에 없는 문구만 토크나이징 + 단일 forward pass + mask 기반 평균 풀링
+    #      (토크나이징은 임베딩 함수 안에서 함께 실행 → 소요 시간은 forward 에 포함)
+    if missing:
+        pooled = np.stack(embed_batch([texts[key] for key in missing]))
+        message_embedding_cache.record_misses(len(missing))
+        for key, vector in zip(missing, normalize_rows(pooled)):
+            vectors[key] = vector
+            message_embedding_cache.put(key, vector)
+    t_forward = time.time()
+
+    # 5. 항목별 유사도 계산
+    results = [None] * len(items)
+    for i in targets:
+        item = items[i]
+        results[i] = _score_user_matrix(
+            entries[item["user_id"]], vectors[keys[i]], item["threshold"], item.get("top_k"), item.get("all_matches", False)
+        )
+    t_scored = time.time()
+
+    elapsed = round(t_scored - start_time, 4)
+    for result in results:
+        if result is not None:
+            result["inference_time"] = elapsed
+
+    return {
+        "results": results,
+        "cache_hits": cache_hits,
+        "timing": {
+            "load_matrices": round(t_loaded - start_time, 4),
+            "cache_lookup": round(t_looked_up - t_loaded, 4),
+            "forward": round(t_forward - t_looked_up, 4),
+            "scoring": round(t_scored - t_forward, 4),
+            "total": elapsed
         }
+    }
         
 def remove_user_sensitive_word(user_id: str, sentence: str) -> dict:
-    with db_session() as session:
-        try:
-            # 1. 민감 단어 조회
-            word_obj = session.query(SensitiveWord).filter_by(word=sentence).first()
-            if not word_obj:
-                return {"deleted": False, "reason": "not_found"}
+    """유저-단어 링크만 삭제 (단일 트랜잭션), 고아 단어는 sensitive_gc 가 정리"""
+    try:
+        with db_session() as session:
+            # 1. 관계 삭제 (단어 조회를 서브쿼리로 묶어 한 번에)
+            deleted = session.execute(
+                delete(UserSensitiveWord)
+                .where(
+                    UserSensitiveWord.user_id == user_id,
+                    UserSensitiveWord.word_id.in_(select(SensitiveWord.word_id).where(SensitiveWord.word == sentence))
+                )
+                .returning(UserSensitiveWord.word_id),
+                execution_options={"synchronize_session": False}
+            ).fetchall()
+
+            # 2. 삭제된 링크가 없을 때만 원인 확인
+            if not deleted:
+                exists = session.query(SensitiveWord.word_id).filter_by(word=sentence).first()
+                return {"deleted": False, "reason": "not_registered" if exists else "not_found"}
+
+    except Exception as e:
+        return {"deleted": False, "reason": str(e)}
+
+    # 커밋 이후 해당 유저 행렬 캐시 무효화
+    user_matrix_cache.invalidate(user_id)
+    sensitive_gc.notify()
+
+    return {"deleted": True, "word": sentence}
+        
+        
+        
+def remove_all_user_sensitive_words(user_id: str) -> dict:
+    """유저의 모든 링크를 set 기반으로 삭제 (단어 목록 조회 1회 + DELETE 1회), 고아 단어는 sensitive_gc 가 정리"""
+    try:
+        with db_session() as session:
+            # 1. 유저가 등록한 단어 목록 (응답용)
+            deleted_words = [
+                row[0] for row in (
+                    session.query(SensitiveWord.word)
+                    .join(UserSensitiveWord, SensitiveWord.word_id == UserSensitiveWord.word_id)
+                    .filter(UserSensitiveWord.user_id == user_id)
+                    .all()
+                )
+            ]
+            if not deleted_words:
+                return {"deleted": False, "reason": "no_words"}
 
-            word_id = word_obj.word_id
+            # 2. 링크 일괄 삭제
+            session.execute(
+                delete(UserSensitiveWord).where(UserSensitiveWord.user_id == user_id),
+                execution_options={"synchronize_session": False}
+            )
 
-            # 2. 관계 삭제
-            link = session.query(UserSensitiveWord).filter_by(user_id=user_id, word_id=word_id).first()
-            if not link:
-                return {"deleted": False, "reason": "not_registered"}
+    except Exception as e:
+        return {"deleted": False, "reason": str(e)}
 
-            session.delete(link)
-            session.commit()  # 커밋해야 rowcount 반영됨
+    user_matrix_cache.invalidate(user_id)
+    sensitive_gc.notify()
 
-            # 3. 다른 유저가 사용하는지 확인
-            count = session.query(UserSensitiveWord).filter_by(word_id=word_id).count()
-            if count == 0:
-                session.delete(word_obj)
-                session.commit()
+    return {
+        "deleted": True, 
+        "words": deleted_words,
+        "count": len(deleted_words)
+    }
 
-            return {"deleted": True, "word": sentence}
 
-        except Exception as e:
-            session.rollback()
-            return {"deleted": False, "reason": str(e)}
-        
-        
-        
-def remove_all_user_sensitive_words(user_id: str) -> dict:
+def get_sensitive_gc_stats() -> dict:
+    return {**sensitive_gc.stats(), "orphans": count_orphans()}
+
+
+def _load_embeddings(session, word_ids=None):
+    """현재 모델 임베딩 (word_id, word, embedding bytes, embedding_encoding) 스트리밍 조회"""
+    query = session.query(SensitiveWord.word_id, SensitiveWord.word, SensitiveWord.embedding, SensitiveWord.embedding_encoding).filter(
+        SensitiveWord.model_name == embedding_model_id
+    )
+    if word_ids is not None:
+        query = query.filter(SensitiveWord.word_id.in_(word_ids))
+    return query.yield_per(SIMILARITY_BULK_CHUNK_SIZE)
+
+
+def _rows_to_arrays(rows):
+    ids = [row[0] for row in rows]
+    words = [row[1] for row in rows]
+    vectors = np.stack([decode_embedding(row[2], row[3]) for row in rows]) if rows else np.empty((0, 0), dtype=np.float32)
+    return ids, words, vectors
+
+
+def rebuild_vector_index() -> dict:
+    """DB 전체로 벡터 인덱스 재학습 + 저장"""
     with db_session() as session:
-        try:
-            # 1. 유저가 등록한 모든 링크 조회
-            links = session.query(UserSensitiveWord).filter_by(user_id=user_id).all()
-            if not links:
-                return {"deleted": False, "reason": "no_words"}
+        rows = list(_load_embeddings(session))
+    vector_index.build(*_rows_to_arrays(rows), model_name=embedding_model_id)
+    if SIMILARITY_INDEX_PATH:
+        vector_index.save(SIMILARITY_INDEX_PATH)
+    return vector_index.stats()
+
+
+def sync_vector_index() -> dict:
+    """저장된 인덱스와 DB 차이만 반영 (word_id 목록 비교 → 없는 단어만 임베딩 조회)"""
+    with db_session() as session:
+        db_ids = {
+            row[0] for row in session.query(SensitiveWord.word_id).filter(SensitiveWord.model_name == embedding_model_id)
+        }
+        indexed_ids = vector_index.ids()
+        missing = sorted(db_ids - indexed_ids)
+        extra = list(indexed_ids - db_ids)
+
+        vector_index.remove(extra)
+        for chunk in _chunks(missing, SIMILARITY_BULK_CHUNK_SIZE):
+            rows = list(_load_embeddings(session, chunk))
+            ids, words, vectors = _rows_to_arrays(rows)
+            vector_index.add(ids, words, vectors)
+
+    if missing or extra:
+        print(f"🔄 민감 단어 벡터 인덱스 DB 동기화: +{len(missing)} / -{len(extra)}")
+    return {"added": len(missing), "removed": len(extra)}
+
+
+def load_vector_index() -> dict:
+    """
+    저장된 인덱스가 현재 모델과 맞으면 불러와서 DB 차이만 반영, 아니면 DB 전체로 재빌드
+    이후 변경 저장은 start_vector_index_autosave 로 시작
+    """
+    started = time.time()
+    loaded = vector_index.load(SIMILARITY_INDEX_PATH) and vector_index.model_name == embedding_model_id
+
+    if loaded:
+        source = "snapshot"
+        diff = sync_vector_index()
+        if vector_index.dirty and SIMILARITY_INDEX_PATH:
+            vector_index.save(SIMILARITY_INDEX_PATH)
+    else:
+        source = "db"
+        diff = None
+        rebuild_vector_index()
+
+    elapsed = round(time.time() - started, 4)
+    print(f"✅ 민감 단어 벡터 인덱스 로딩 경로: {source} ({elapsed}s, {len(vector_index)}개)")
+    return {"source": source, "diff": diff, "load_time": elapsed}
+
+
+def start_vector_index_autosave():
+    """
+    interval 마다 DB 와 차이 반영 + 변경이 있을 때만 인덱스 저장 (추론 워커 fork 이후에 호출)
+    - 인덱스는 uvicorn 워커마다 따로 있음 → 다른 워커에서 등록/삭제한 단어는 이 동기화로 반영
+    """
+    vector_index.start_autosave(SIMILARITY_INDEX_PATH, SIMILARITY_INDEX_SAVE_INTERVAL_SEC, sync=sync_vector_index)
+
+
+def search_sensitive_words(message: str, k: int, user_id: str | None = None, nprobe: int | None = None, exact: bool = False) -> dict:
+    """
+    메시지와 가장 가까운 민감 단어 top-k (전체 또는 user_id 가 등록한 단어 중)
+    - exact=True 면 전체 클러스터 스캔 (정확한 결과)
+    """
+    start_time = time.time()
+    allowed_ids = get_user_matrix(user_id).word_ids if user_id else None
+    query = encode_message(message)
+
+    if exact:
+        hits = vector_index.exact_search(query, k, allowed_ids)
+    else:
+        hits = vector_index.search(query, k, allowed_ids, nprobe)
 
-            deleted_words = []
+    return {
+        "results": [{"word_id": word_id, "word": word, "score": score} for word_id, word, score in hits],
+        "method": "exact" if exact else "ivf",
+        "inference_time": round(time.time() - start_time, 4)
+    }
 
-            for link in links:
-                word_id = link.word_id
-                word_obj = session.query(SensitiveWord).filter_by(word_id=word_id).first()
 
-                # 링크 삭제
-                session.delete(link)
+def evaluate_vector_index_recall(samples: int, k: int, nprobe: int | None = None) -> dict:
+    return vector_index.evaluate_recall(samples, k, nprobe)
 
-                # 단어가 다른 유저에게 사용되는지 확인
-                remaining_links = session.query(UserSensitiveWord).filter_by(word_id=word_id).count()
-                if remaining_links == 0 and word_obj:
-                    session.delete(word_obj)
 
-                if word_obj:
-                    deleted_words.append(word_obj.word)
+def get_vector_index_stats() -> dict:
+    return vector_index.stats()
 
-            session.commit()
-            return {
-                "deleted": True, 
-                "words": deleted_words,
-                "count": len(deleted_words)
-            }
 
-        except Exception as e:
-            session.rollback()
-            return {"deleted": False, "reason": str(e)}
\ No newline at end of file
+def get_reembed_status() -> dict:
+    return {**reembed_job.stats(), "stale_rows": reembed_job.count_stale()}
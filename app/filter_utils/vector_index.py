@@ -0,0 +1,434 @@
+# app/filter_utils/vector_index.py
+
+import os
+import threading
+import time
+import numpy as np
+
+from app.filter_utils.cache_utils import normalize_rows
+from app.filter_utils.embedding_codec import FLOAT32, INT8, CompactMatrix
+
+# 2: 클러스터 벡터를 인덱스 인코딩(float32/float16/int8) 그대로 저장 (1 은 float32, 읽기만 지원)
+INDEX_FORMAT_VERSION = 2
+KMEANS_MAX_TRAIN = 50000
+KMEANS_ITERATIONS = 10
+ASSIGN_BLOCK_ROWS = 8192
+# 학습 시점보다 이 배수 넘게 커지면 백그라운드에서 centroid 재학습
+RETRAIN_GROWTH_FACTOR = 2
+
+
+def _assign(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """정규화된 벡터마다 가장 가까운(내적 최대) centroid 번호 (블록 단위로 메모리 제한)"""
+    labels = np.empty(len(vectors), dtype=np.int64)
+    for start in range(0, len(vectors), ASSIGN_BLOCK_ROWS):
+        block = vectors[start:start + ASSIGN_BLOCK_ROWS]
+        labels[start:start + len(block)] = np.argmax(block @ centroids.T, axis=1)
+    return labels
+
+
+def train_centroids(vectors: np.ndarray, nlist: int, seed: int = 0) -> np.ndarray:
+    """spherical k-means (cosine) - 최대 KMEANS_MAX_TRAIN 개 샘플로 학습"""
+    rng = np.random.default_rng(seed)
+    if len(vectors) > KMEANS_MAX_TRAIN:
+        vectors = vectors[rng.choice(len(vectors), KMEANS_MAX_TRAIN, replace=False)]
+
+    nlist = max(1, min(nlist, len(vectors)))
+    centroids = vectors[rng.choice(len(vectors), nlist, replace=False)].copy()
+
+    for _ in range(KMEANS_ITERATIONS):
+        labels = _assign(vectors, centroids)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, labels, vectors)
+        counts = np.bincount(labels, minlength=nlist)
+
+        # 빈 클러스터는 임의의 벡터로 다시 시작
+        empty = counts == 0
+        if empty.any():
+            sums[empty] = vectors[rng.choice(len(vectors), int(empty.sum()), replace=False)]
+        centroids = normalize_rows(sums)
+
+    return centroids
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """점수 내림차순 상위 k 개 위치"""
+    if len(scores) <= k:
+        return np.argsort(-scores)
+    top = np.argpartition(-scores, k)[:k]
+    return top[np.argsort(-scores[top])]
+
+
+class IVFIndex:
+    """
+    전체 민감 단어 임베딩에 대한 IVF(inverted file) 근사 최근접 탐색 인덱스 (NumPy 전용)
+    - 정규화된 벡터를 k-means centroid 기준 nlist 개 클러스터로 나누고, 검색 시 가까운 nprobe 개 클러스터만 스캔
+    - 클러스터마다 (ids, vectors) 튜플을 통째로 교체 (copy-on-write) → 검색은 잠금 안에서 목록 참조만 복사하고 점수 계산은 잠금 밖에서
+    - 등록/삭제는 학습된 centroid 에 그대로 배정, 학습 시점보다 RETRAIN_GROWTH_FACTOR 배 커지면 백그라운드에서 재학습
+    - 클러스터 벡터는 encoding(float32/float16/int8) 의 CompactMatrix 로 보관 (centroid 는 float32), 점수는 클러스터별 matvec
+    """
+
+    def __init__(self, nprobe: int, nlist: int | None = None, encoding: str = FLOAT32):
+        self.nprobe = max(1, nprobe)
+        self.nlist_setting = nlist
+        self.encoding = encoding
+        self.model_name = None
+        self.centroids = None
+        self._lists: list[tuple[np.ndarray, CompactMatrix]] = []
+        self._cluster_of: dict[int, int] = {}
+        self._words: dict[int, str] = {}
+        self._lock = threading.Lock()
+
+        self._autosave_thread = None
+        self._retrain_thread = None
+
+        self.trained_size = 0
+        self.dirty = False
+        self.last_build_ms = 0.0
+        self.last_build_at = None
+
+    def __len__(self) -> int:
+        return len(self._cluster_of)
+
+    @property
+    def ready(self) -> bool:
+        return self.centroids is not None
+
+    def build(self, ids: list[int], words: list[str], vectors: np.ndarray, model_name: str):
+        """전체 목록으로 centroid 학습 + 배정 (기존 내용 교체)"""
+        started = time.time()
+        vectors = normalize_rows(vectors)
+        ids = np.asarray(ids, dtype=np.int64)
+
+        if len(ids) == 0:
+            centroids, labels = None, np.empty(0, dtype=np.int64)
+        else:
+            centroids = train_centroids(vectors, self._nlist_for(len(ids)))
+            labels = _assign(vectors, centroids)
+
+        lists = []
+        for c in range(0 if centroids is None else len(centroids)):
+            mask = labels == c
+            lists.append((ids[mask], CompactMatrix.from_float32(vectors[mask], self.encoding)))
+
+        with self._lock:
+            self.model_name = model_name
+            self.centroids = centroids
+            self._lists = lists
+            self._cluster_of = {int(i): int(c) for i, c in zip(ids, labels)}
+            self._words = {int(i): w for i, w in zip(ids, words)}
+            self.trained_size = len(ids)
+            self.dirty = True
+            self.last_build_ms = round((time.time() - started) * 1000, 3)
+            self.last_build_at = time.time()
+        print(f"🧭 민감 단어 벡터 인덱스 빌드 완료: {len(ids)}개, 클러스터 {len(lists)}개, {self.last_build_ms}ms")
+
+    def _nlist_for(self, size: int) -> int:
+        nlist = self.nlist_setting or int(np.sqrt(size))
+        return max(1, min(nlist, 4096))
+
+    def retrain(self):
+        """
+        현재 내용으로 centroid 재학습 후 재배정 (학습은 잠금 밖, 재배정은 그 사이 변경까지 포함해 잠금 안에서)
+        - 저장된 인코딩 값은 그대로 옮겨 담음 → 재학습으로 int8 오차가 쌓이지 않음
+        """
+        started = time.time()
+        with self._lock:
+            snapshot = [list_vectors for _, list_vectors in self._lists if len(list_vectors)]
+        if not snapshot:
+            return
+        sample = CompactMatrix.concat(snapshot, self.encoding).to_float32()
+        centroids = train_centroids(sample, self._nlist_for(len(sample)))
+
+        with self._lock:
+            ids = np.concatenate([list_ids for list_ids, _ in self._lists])
+            vectors = CompactMatrix.concat([list_vectors for _, list_vectors in self._lists], self.encoding)
+            labels = _assign(vectors.to_float32(), centroids)
+            self.centroids = centroids
+            self._lists = [(ids[labels == c], vectors.take(labels == c)) for c in range(len(centroids))]
+            self._cluster_of = {int(i): int(c) for i, c in zip(ids, labels)}
+            self.trained_size = len(ids)
+            self.dirty = True
+            self.last_build_ms = round((time.time() - started) * 1000, 3)
+            self.last_build_at = time.time()
+        print(f"🔁 민감 단어 벡터 인덱스 재학습 완료: {len(ids)}개, 클러스터 {len(centroids)}개, {self.last_build_ms}ms")
+
+    def _maybe_retrain(self):
+        """학습 시점보다 RETRAIN_GROWTH_FACTOR 배 넘게 커졌으면 백그라운드 재학습 시작 (이미 도는 중이면 건너뜀)"""
+        if len(self) <= self.trained_size * RETRAIN_GROWTH_FACTOR:
+            return
+        if self._retrain_thread is not None and self._retrain_thread.is_alive():
+            return
+
+        def worker():
+            try:
+                self.retrain()
+            except Exception as e:
+                print(f"❌ [오류] 벡터 인덱스 재학습 실패: {e}")
+
+        self._retrain_thread = threading.Thread(target=worker, name="vector-index-retrain", daemon=True)
+        self._retrain_thread.start()
+
+    def add(self, ids: list[int], words: list[str], vectors: np.ndarray):
+        """학습된 centroid 에 배정해 추가 (이미 있는 id 는 교체)"""
+        if not len(ids):
+            return
+        if not self.ready:
+            # 아직 학습 전이면 이번 목록으로 바로 빌드 (이후 커지면 _maybe_retrain 이 재학습)
+            self.build(ids, words, vectors, self.model_name)
+            return
+
+        vectors = normalize_rows(vectors)
+        ids = np.asarray(ids, dtype=np.int64)
+
+        # 교체(삭제 + 추가)를 한 번에 → 중간에 검색해도 id 가 빠져 있거나 두 번 들어 있지 않음
+        with self._lock:
+            self._remove_locked(ids)
+            labels = _assign(vectors, self.centroids)
+            for c in np.unique(labels):
+                mask = labels == c
+                list_ids, list_vectors = self._lists[c]
+                self._lists[c] = (
+                    np.concatenate([list_ids, ids[mask]]),
+                    CompactMatrix.concat([list_vectors, CompactMatrix.from_float32(vectors[mask], self.encoding)], self.encoding)
+                )
+            for i, w, c in zip(ids, words, labels):
+                self._cluster_of[int(i)] = int(c)
+                self._words[int(i)] = w
+            self.dirty = True
+
+        self._maybe_retrain()
+
+    def remove(self, ids: list[int]):
+        with self._lock:
+            self._remove_locked(ids)
+
+    def _remove_locked(self, ids):
+        by_cluster: dict[int, list[int]] = {}
+        for i in ids:
+            c = self._cluster_of.pop(int(i), None)
+            self._words.pop(int(i), None)
+            if c is not None:
+                by_cluster.setdefault(c, []).append(int(i))
+
+        for c, removed in by_cluster.items():
+            list_ids, list_vectors = self._lists[c]
+            keep = ~np.isin(list_ids, removed)
+            self._lists[c] = (list_ids[keep], list_vectors.take(keep))
+        if by_cluster:
+            self.dirty = True
+
+    def ids(self) -> set[int]:
+        with self._lock:
+            return set(self._cluster_of)
+
+    def search(self, query: np.ndarray, k: int, allowed_ids=None, nprobe: int | None = None) -> list[tuple[int, str, float]]:
+        """
+        근사 top-k 검색
+        :param query: 정규화된 메시지 임베딩 (dim,)
+        :param allowed_ids: 지정 시 해당 word_id 만 결과에 포함 (유저별 필터, 유저 단어가 있는 클러스터만 탐색)
+        :return: [(word_id, word, score), ...] 점수 내림차순
+        """
+        # build / load 가 centroid 와 목록을 바꾸는 중에도 서로 맞는 한 벌을 읽도록 잠금 안에서 참조만 복사
+        with self._lock:
+            if self.centroids is None or not self._cluster_of:
+                return []
+            centroids = self.centroids
+            lists = list(self._lists)
+            if allowed_ids is not None:
+                clusters = np.fromiter({self._cluster_of[i] for i in allowed_ids if i in self._cluster_of}, dtype=np.int64)
+
+        centroid_scores = centroids @ query
+        if allowed_ids is not None:
+            # 유저 필터가 있으면 해당 유저 단어가 들어 있는 클러스터 중에서만 nprobe 개 선택
+            if not len(clusters):
+                return []
+            probes = clusters[_top_k(centroid_scores[clusters], nprobe or self.nprobe)]
+        else:
+            probes = _top_k(centroid_scores, nprobe or self.nprobe)
+
+        return self._rank([lists[c] for c in probes], query, k, allowed_ids)
+
+    def exact_search(self, query: np.ndarray, k: int, allowed_ids=None) -> list[tuple[int, str, float]]:
+        """전체 클러스터를 스캔하는 정확한 top-k (recall 기준값)"""
+        with self._lock:
+            if self.centroids is None or not self._cluster_of:
+                return []
+            lists = list(self._lists)
+        return self._rank(lists, query, k, allowed_ids)
+
+    def _rank(self, lists, query: np.ndarray, k: int, allowed_ids) -> list[tuple[int, str, float]]:
+        ids = np.concatenate([list_ids for list_ids, _ in lists])
+        scores = np.concatenate([list_vectors.matvec(query) for _, list_vectors in lists])
+
+        if allowed_ids is not None:
+            mask = np.isin(ids, np.fromiter(allowed_ids, dtype=np.int64))
+            ids, scores = ids[mask], scores[mask]
+        if not len(ids):
+            return []
+
+        top = _top_k(scores, k)
+        with self._lock:
+            return [(int(ids[i]), self._words.get(int(ids[i]), ""), float(scores[i])) for i in top]
+
+    def evaluate_recall(self, samples: int, k: int, nprobe: int | None = None, noise: float = 0.3, seed: int = 0) -> dict:
+        """
+        저장된 벡터에 잡음을 섞은 질의로 IVF 결과와 정확한 결과 비교
+        - 잡음은 성분마다 N(0, noise / sqrt(dim)) → 차원과 무관하게 잡음 벡터 크기가 약 noise (단위 벡터 기준)
+        :return: recall@k 평균 + 질의당 평균 지연 (ms)
+        """
+        with self._lock:
+            all_vectors = [list_vectors.to_float32() for _, list_vectors in self._lists if len(list_vectors)]
+        if not all_vectors:
+            return {"samples": 0, "k": k, "recall": None}
+
+        vectors = np.concatenate(all_vectors)
+        rng = np.random.default_rng(seed)
+        picked = vectors[rng.choice(len(vectors), min(samples, len(vectors)), replace=False)]
+        queries = normalize_rows(picked + rng.normal(0, noise / np.sqrt(picked.shape[1]), picked.shape).astype(np.float32))
+
+        hits = 0
+        ivf_time = 0.0
+        exact_time = 0.0
+        for query in queries:
+            started = time.time()
+            approx = {word_id for word_id, _, _ in self.search(query, k, nprobe=nprobe)}
+            ivf_time += time.time() - started
+
+            started = time.time()
+            exact = [word_id for word_id, _, _ in self.exact_search(query, k)]
+            exact_time += time.time() - started
+
+            hits += len(approx.intersection(exact)) / max(1, len(exact))
+
+        return {
+            "samples": len(queries),
+            "k": k,
+            "nprobe": nprobe or self.nprobe,
+            "recall": round(hits / len(queries), 4),
+            "ivf_ms": round(ivf_time / len(queries) * 1000, 3),
+            "exact_ms": round(exact_time / len(queries) * 1000, 3),
+        }
+
+    def save(self, path: str):
+        """npz 로 저장 (임시 파일에 쓰고 교체)"""
+        with self._lock:
+            if not self.ready:
+                return
+            ids = np.concatenate([list_ids for list_ids, _ in self._lists])
+            vectors = CompactMatrix.concat([list_vectors for _, list_vectors in self._lists], self.encoding)
+            labels = np.concatenate([np.full(len(list_ids), c, dtype=np.int64) for c, (list_ids, _) in enumerate(self._lists)])
+            words = np.array([self._words.get(int(i), "") for i in ids], dtype=str)
+            centroids = self.centroids
+            model_name = self.model_name
+            trained_size = self.trained_size
+            # 스냅샷 이후 변경은 다시 dirty 로 표시됨 → 저장에 실패하면 아래에서 되돌림
+            self.dirty = False
+
+        try:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp.npz"
+            np.savez(
+                tmp_path,
+                format_version=INDEX_FORMAT_VERSION,
+                model_name=np.array(model_name or ""),
+                trained_size=trained_size,
+                centroids=centroids,
+                ids=ids,
+                labels=labels,
+                encoding=np.array(vectors.encoding),
+                vectors=vectors.data,
+                scales=vectors.scales if vectors.scales is not None else np.empty(0, dtype=np.float32),
+                words=words
+            )
+            os.replace(tmp_path, path)
+        except Exception:
+            with self._lock:
+                self.dirty = True
+            raise
+
+    def load(self, path: str) -> bool:
+        """저장된 인덱스 로딩 (형식이 다르거나 파일이 없으면 False)"""
+        if not path or not os.path.exists(path):
+            return False
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                version = int(data["format_version"])
+                if version not in (1, INDEX_FORMAT_VERSION):
+                    return False
+                centroids = data["centroids"]
+                ids = data["ids"]
+                labels = data["labels"]
+                encoding = str(data["encoding"]) if version >= 2 else FLOAT32
+                vectors = CompactMatrix(data["vectors"], encoding, data["scales"] if encoding == INT8 else None)
+                words = data["words"]
+                model_name = str(data["model_name"])
+                trained_size = int(data["trained_size"])
+        except Exception as e:
+            print(f"⚠️ [주의] 벡터 인덱스 읽기 실패 → DB에서 재빌드: {e}")
+            return False
+
+        if vectors.encoding != self.encoding:
+            # 저장 후 인코딩 설정이 바뀐 경우 (int8 로 저장된 값을 다시 풀면 그 오차는 남음)
+            vectors = CompactMatrix.from_float32(vectors.to_float32(), self.encoding)
+
+        lists = []
+        for c in range(len(centroids)):
+            mask = labels == c
+            lists.append((ids[mask], vectors.take(mask)))
+
+        with self._lock:
+            self.model_name = model_name
+            self.centroids = centroids
+            self._lists = lists
+            self._cluster_of = {int(i): int(c) for i, c in zip(ids, labels)}
+            self._words = {int(i): str(w) for i, w in zip(ids, words)}
+            self.trained_size = trained_size
+            self.dirty = False
+        return True
+
+    def start_autosave(self, path: str, interval_sec: float, sync=None):
+        """
+        interval_sec 마다 sync() 로 원본과 차이를 반영한 뒤 변경이 있을 때만 저장하는 백그라운드 스레드
+        - sync: 다른 프로세스(uvicorn 워커)가 원본에 반영한 등록/삭제를 가져오는 함수 (없으면 저장만)
+        """
+        if (not path and sync is None) or interval_sec <= 0 or self._autosave_thread is not None:
+            return
+
+        def worker():
+            while True:
+                time.sleep(interval_sec)
+                if sync is not None:
+                    try:
+                        sync()
+                    except Exception as e:
+                        print(f"❌ [오류] 벡터 인덱스 동기화 실패: {e}")
+                if path and self.dirty:
+                    try:
+                        self.save(path)
+                    except Exception as e:
+                        print(f"❌ [오류] 벡터 인덱스 저장 실패: {e}")
+
+        self._autosave_thread = threading.Thread(target=worker, name="vector-index-autosave", daemon=True)
+        self._autosave_thread.start()
+
+    def stats(self) -> dict:
+        with self._lock:
+            sizes = [len(list_ids) for list_ids, _ in self._lists]
+            nbytes = sum(list_ids.nbytes + list_vectors.nbytes for list_ids, list_vectors in self._lists)
+        return {
+            "ready": self.ready,
+            "model_name": self.model_name,
+            "encoding": self.encoding,
+            "size": sum(sizes),
+            "trained_size": self.trained_size,
+            "retraining": self._retrain_thread is not None and self._retrain_thread.is_alive(),
+            "nlist": len(sizes),
+            "nprobe": self.nprobe,
+            "max_list_size": max(sizes) if sizes else 0,
+            "bytes": nbytes,
+            "dirty": self.dirty,
+            "last_build_ms": self.last_build_ms,
+            "last_build_at": self.last_build_at,
+        }
@@ -0,0 +1,129 @@
+# app/lifecycle.py
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.config import STARTUP_RETRY_ATTEMPTS, STARTUP_RETRY_BACKOFF_SEC, STARTUP_RETRY_MAX_BACKOFF_SEC
+
+PENDING = "pending"
+LOADING = "loading"
+READY = "ready"
+ERROR = "error"
+
+
+class Component:
+    __slots__ = ("name", "required", "state", "started_at", "finished_at", "error", "attempts")
+
+    def __init__(self, name: str, required: bool):
+        self.name = name
+        self.required = required
+        self.state = PENDING
+        self.started_at = None
+        self.finished_at = None
+        self.error = None
+        self.attempts = 0
+
+    def stats(self) -> dict:
+        end = self.finished_at or time.time()
+        return {
+            "state": self.state,
+            "required": self.required,
+            "duration_sec": round(end - self.started_at, 3) if self.started_at else None,
+            "attempts": self.attempts,
+            "error": self.error,
+        }
+
+
+class Lifecycle:
+    """
+    기동 시 구성 요소 로딩 상태 관리 (/health/ready 판단 기준)
+    - register 로 등록한 구성 요소마다 pending → loading → ready | error 상태와 소요 시간 기록
+    - run_parallel 은 서로 의존하지 않는 로딩(모델 2개, 금칙어 트라이 등)을 스레드로 동시에 실행
+    - required 구성 요소가 모두 ready 이면 준비 완료 (optional 은 실패해도 트래픽을 받음)
+    - start(plan) 은 별도 스레드에서 실행 → 로딩 중에도 /health/live 는 바로 응답
+    - required 구성 요소는 실패 시 backoff 를 두고 최대 retry_attempts 번 시도 (기동 중 DB 일시 장애 등)
+    - 재시도까지 모두 실패한 채 기동이 끝나면 failed → /health/live 도 실패로 응답해 프로세스 재시작 유도
+    """
+
+    def __init__(self, retry_attempts: int = 1, retry_backoff_sec: float = 0.0, retry_max_backoff_sec: float = 0.0):
+        self.retry_attempts = max(1, retry_attempts)
+        self.retry_backoff = retry_backoff_sec
+        self.retry_max_backoff = retry_max_backoff_sec
+        self.components: dict[str, Component] = {}
+        self.started_at = time.time()
+        self.finished_at = None
+        self._thread = None
+
+    def register(self, name: str, required: bool = True):
+        self.components[name] = Component(name, required)
+
+    def run(self, name: str, fn) -> bool:
+        component = self.components[name]
+        component.state = LOADING
+        component.started_at = time.time()
+        attempts = self.retry_attempts if component.required else 1
+        backoff = self.retry_backoff
+        while True:
+            component.attempts += 1
+            try:
+                fn()
+                component.state = READY
+                component.error = None
+                print(f"✅ [기동] {name} 준비 완료 ({time.time() - component.started_at:.2f}s)")
+                break
+            except Exception as e:
+                component.error = str(e)
+                if component.attempts >= attempts:
+                    component.state = ERROR
+                    print(f"❌ [오류] [기동] {name} 실패: {e}")
+                    break
+                print(f"🔁 [기동] {name} 실패 ({component.attempts}/{attempts}) → {backoff:.1f}s 후 재시도: {e}")
+                time.sleep(backoff)
+                backoff = min(backoff * 2, self.retry_max_backoff)
+        component.finished_at = time.time()
+        return component.state == READY
+
+    def run_parallel(self, steps: dict) -> bool:
+        with ThreadPoolExecutor(max_workers=len(steps), thread_name_prefix="startup") as executor:
+            results = list(executor.map(lambda item: self.run(*item), steps.items()))
+        return all(results)
+
+    def start(self, plan):
+        """plan() 을 백그라운드 스레드에서 실행"""
+        def target():
+            try:
+                plan()
+            finally:
+                self.finished_at = time.time()
+                state = "준비 완료" if self.ready else "일부 구성 요소 실패"
+                print(f"🧭 기동 {state} ({self.finished_at - self.started_at:.2f}s)")
+
+        self._thread = threading.Thread(target=target, name="startup", daemon=True)
+        self._thread.start()
+
+    @property
+    def ready(self) -> bool:
+        return all(component.state == READY for component in self.components.values() if component.required)
+
+    @property
+    def failed(self) -> bool:
+        """기동이 끝났는데 required 구성 요소가 준비되지 않음 (재시도 소진)"""
+        return self.finished_at is not None and not self.ready
+
+    def stats(self) -> dict:
+        end = self.finished_at or time.time()
+        return {
+            "ready": self.ready,
+            "finished": self.finished_at is not None,
+            "failed": self.failed,
+            "elapsed_sec": round(end - self.started_at, 3),
+            "components": {name: component.stats() for name, component in self.components.items()},
+        }
+
+
+lifecycle = Lifecycle(
+    retry_attempts=STARTUP_RETRY_ATTEMPTS,
+    retry_backoff_sec=STARTUP_RETRY_BACKOFF_SEC,
+    retry_max_backoff_sec=STARTUP_RETRY_MAX_BACKOFF_SEC
+)
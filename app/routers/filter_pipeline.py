@@ -0,0 +1,41 @@
+# app/routers/filter_pipeline.py
+from fastapi import APIRouter
+from app.schemas.common import StandardResponse, StatusEnum
+from app.schemas.filter_schema import FilterRequest, FilterResult
+from app.filter_utils.filter_pipeline import run_filter_pipeline, BLOCK, ERROR
+
+router = APIRouter()
+
+
+@router.post("", response_model=StandardResponse)
+def filter_message(request: FilterRequest):
+    try:
+        result = run_filter_pipeline(
+            request.message,
+            user_id=request.user_id,
+            stages=request.stages,
+            concurrent=request.concurrent,
+            early_exit=request.early_exit,
+            similarity_threshold=request.similarity_threshold,
+            sentiment_min_confidence=request.sentiment_min_confidence
+        )
+    except ValueError as e:
+        return StandardResponse(
+            status=StatusEnum.ERROR,
+            message=str(e),
+            data={"stages": request.stages}
+        )
+    except Exception as e:
+        return StandardResponse(
+            status=StatusEnum.ERROR,
+            message="필터 파이프라인 실행 중 오류 발생",
+            data={"error": str(e)}
+        )
+
+    failed = [stage["stage"] for stage in result["stages"] if stage["verdict"] == ERROR]
+    return StandardResponse(
+        status=StatusEnum.WARNING if failed else StatusEnum.SUCCESS,
+        message=f"필터 검사 완료 (실패 단계: {', '.join(failed)})" if failed else "필터 검사 완료",
+        detected=result["verdict"] == BLOCK,
+        data=FilterResult(**result)
+    )
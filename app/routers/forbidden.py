@@ -1,19 +1,32 @@
-from fastapi import APIRouter
+import json
+from typing import Optional
+from fastapi import APIRouter, Request
+from fastapi.responses import StreamingResponse
+from app.config import FORBIDDEN_BATCH_MAX_ITEMS
 from app.schemas.common import StandardResponse, StatusEnum
 from app.filter_utils.forbidden_utils import (
     register_forbidden_word,
     insert_bulk_forbidden_words,
     check_forbidden_message,
+    mask_forbidden_message,
+    iter_check_forbidden_messages,
     delete_forbidden_word,
+    delete_forbidden_words,
     delete_forbidden_words_by_date,
     get_all_forbidden_words,
-    is_forbidden_word
+    is_forbidden_word,
+    get_automaton_status,
+    get_forbidden_list_version,
+    get_check_stats
 )
 from app.schemas.forbidden_schema import (
     ForbiddenWord, 
     ForbiddenWordList,
     ForbiddenCheckResult,
-    MessageInput
+    ForbiddenMaskResult,
+    MessageInput,
+    MessageListInput,
+    MaskInput
 )
 
 router = APIRouter()
@@ -79,6 +92,24 @@ def fetch_all_forbidden_words():
         )
         
         
+@router.get("/automaton/status", response_model=StandardResponse)
+def fetch_automaton_status():
+    return StandardResponse(
+        status=StatusEnum.SUCCESS,
+        message="금칙어 트라이 상태 조회 성공",
+        data=get_automaton_status()
+    )
+
+
+@router.get("/version", response_model=StandardResponse)
+def fetch_forbidden_list_version():
+    return StandardResponse(
+        status=StatusEnum.SUCCESS,
+        message="금칙어 목록 버전 조회 성공",
+        data=get_forbidden_list_version()
+    )
+
+
 @router.get("/check/{word}", response_model=StandardResponse)
 def check_forbidden_word(word: str):
     try:
@@ -106,6 +137,98 @@ def check_message(data: MessageInput):
         data=ForbiddenCheckResult(**result)
     )
 
+def _parse_ndjson_messages(body: bytes) -> list[str]:
+    """NDJSON 본문 → 메시지 목록 (각 줄은 문자열 또는 {"message": ...})"""
+    messages = []
+    for line in body.decode("utf-8").splitlines():
+        if not line.strip():
+            continue
+        row = json.loads(line)
+        messages.append(row["message"] if isinstance(row, dict) else str(row))
+    return messages
+
+
+def _stream_check_results(messages: list[str], concurrency: Optional[int]):
+    for index, result, error in iter_check_forbidden_messages(messages, concurrency):
+        if error is not None:
+            # 실패한 메시지만 오류 레코드로 내보내고 스트림은 계속
+            yield json.dumps({"index": index, "error": error}, ensure_ascii=False) + "\n"
+            continue
+        yield json.dumps({"index": index, "detected": bool(result["detected_words"]), **result}, ensure_ascii=False) + "\n"
+
+
+# 여러 메시지 검사 - JSON {"messages": [...]} 또는 NDJSON 본문, 결과는 완료 순서대로 NDJSON 스트리밍
+@router.post("/check-messages")
+async def check_messages(request: Request, concurrency: Optional[int] = None):
+    try:
+        body = await request.body()
+        if "ndjson" in request.headers.get("content-type", ""):
+            messages = _parse_ndjson_messages(body)
+        else:
+            data = MessageListInput(**json.loads(body))
+            messages = data.messages
+            concurrency = data.concurrency or concurrency
+    except Exception as e:
+        return StandardResponse(
+            status=StatusEnum.ERROR,
+            message="요청 본문을 읽을 수 없습니다.",
+            data={"error": str(e)}
+        )
+
+    if len(messages) > FORBIDDEN_BATCH_MAX_ITEMS:
+        return StandardResponse(
+            status=StatusEnum.ERROR,
+            message=f"한 번에 최대 {FORBIDDEN_BATCH_MAX_ITEMS}개까지 검사할 수 있습니다.",
+            data={"count": len(messages)}
+        )
+
+    return StreamingResponse(_stream_check_results(messages, concurrency), media_type="application/x-ndjson")
+
+@router.post("/mask", response_model=StandardResponse)
+def mask_message(data: MaskInput):
+    result = mask_forbidden_message(data.message, data.mask_char or "*")
+
+    return StandardResponse(
+        status=StatusEnum.SUCCESS,
+        message="금칙어 마스킹 완료",
+        detected=bool(result["detected_words"]),
+        data=ForbiddenMaskResult(**result)
+    )
+
+@router.get("/check-stats", response_model=StandardResponse)
+def fetch_check_stats():
+    return StandardResponse(
+        status=StatusEnum.SUCCESS,
+        message="금칙어 검사 통계 조회 성공",
+        data=get_check_stats()
+    )
+
+# 여러 금칙어 일괄 삭제 - /{word} 보다 먼저 선언해야 "bulk" 가 단어로 매칭되지 않음
+@router.delete("/bulk", response_model=StandardResponse)
+def remove_forbidden_bulk(data: ForbiddenWordList):
+    try:
+        result = delete_forbidden_words(data.words)
+
+        if result["deleted"]:
+            return StandardResponse(
+                status=StatusEnum.SUCCESS,
+                message=f"{len(result['deleted'])}개의 금칙어가 삭제되었습니다.",
+                data=result
+            )
+        else:
+            return StandardResponse(
+                status=StatusEnum.NOT_FOUND,
+                message="삭제할 금칙어가 존재하지 않습니다.",
+                data=result
+            )
+
+    except Exception as e:
+        return StandardResponse(
+            status=StatusEnum.ERROR,
+            message="금칙어 일괄 삭제 중 오류 발생",
+            data={"error": str(e)}
+        )
+
 @router.delete("/{word}", response_model=StandardResponse)
 def remove_forbidden_word(word: str):
     try:
@@ -0,0 +1,42 @@
+# app/routers/health.py
+from fastapi import APIRouter, Response
+from app.lifecycle import lifecycle
+from app.schemas.common import StandardResponse, StatusEnum
+
+router = APIRouter()
+
+
+@router.get("/live", response_model=StandardResponse)
+def liveness(response: Response):
+    if lifecycle.failed:
+        # 재시도까지 실패한 채 기동이 끝남 → 프로세스 재시작 필요
+        response.status_code = 503
+        return StandardResponse(
+            status=StatusEnum.ERROR,
+            message="필수 구성 요소 기동 실패",
+            data=lifecycle.stats()
+        )
+
+    return StandardResponse(
+        status=StatusEnum.SUCCESS,
+        message="프로세스 동작 중",
+        data={"elapsed_sec": lifecycle.stats()["elapsed_sec"]}
+    )
+
+
+@router.get("/ready", response_model=StandardResponse)
+def readiness(response: Response):
+    stats = lifecycle.stats()
+    if not stats["ready"]:
+        response.status_code = 503
+        return StandardResponse(
+            status=StatusEnum.WARNING,
+            message="구성 요소 로딩 중이거나 실패했습니다.",
+            data=stats
+        )
+
+    return StandardResponse(
+        status=StatusEnum.SUCCESS,
+        message="트래픽 수신 준비 완료",
+        data=stats
+    )
@@ -0,0 +1,25 @@
+# app/routers/inference.py
+from fastapi import APIRouter
+from app.schemas.common import StandardResponse, StatusEnum
+from app.filter_utils.inference_scheduler import get_scheduler_stats
+from app.filter_utils.inference_pool import inference_pool
+
+router = APIRouter()
+
+
+@router.get("/stats", response_model=StandardResponse)
+def fetch_inference_stats():
+    return StandardResponse(
+        status=StatusEnum.SUCCESS,
+        message="추론 스케줄러 통계 조회 성공",
+        data=get_scheduler_stats()
+    )
+
+
+@router.get("/pool/stats", response_model=StandardResponse)
+def fetch_inference_pool_stats():
+    return StandardResponse(
+        status=StatusEnum.SUCCESS,
+        message="추론 워커 프로세스 풀 통계 조회 성공",
+        data=inference_pool.stats()
+    )
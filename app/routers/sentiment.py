@@ -1,8 +1,22 @@
 # app/routers/sentiment.py
 
+import json
 from fastapi import APIRouter
-from app.filter_utils.sentiment_utils import predict_sentiment
-from app.schemas.sentiment_schema import SentimentRequest, SentimentResult
+from fastapi.responses import StreamingResponse
+from app.config import SENTIMENT_BATCH_BUCKET_SIZE, SENTIMENT_BATCH_MAX_ITEMS
+from app.filter_utils.sentiment_utils import (
+    predict_sentiment,
+    predict_sentiment_batch,
+    iter_sentiment_buckets,
+    get_sentiment_tier_stats
+)
+from app.schemas.sentiment_schema import (
+    SentimentRequest,
+    SentimentResult,
+    SentimentBatchRequest,
+    SentimentBatchItem,
+    SentimentBatchResult
+)
 from app.schemas.common import StandardResponse, StatusEnum
 
 router = APIRouter()
@@ -18,6 +32,64 @@ def analyze_sentiment(request: SentimentRequest):
         data=SentimentResult(
             sentiment=result["label"],
             confidence=result["confidence"],
+            inference_time=result["inference_time"],
+            tier=result["tier"]
+        )
+    )
+
+
+@router.get("/tier/stats", response_model=StandardResponse)
+def fetch_sentiment_tier_stats():
+    return StandardResponse(
+        status=StatusEnum.SUCCESS,
+        message="감성 2단계 추론 통계 조회 성공",
+        data=get_sentiment_tier_stats()
+    )
+
+
+def _stream_sentiment_ndjson(messages: list[str]):
+    """버킷 단위로 완료되는 즉시 한 줄씩 내보냄 (index 로 원래 순서 복원)"""
+    for bucket, _ in iter_sentiment_buckets(messages, SENTIMENT_BATCH_BUCKET_SIZE):
+        for i, result in bucket:
+            yield json.dumps({
+                "index": i,
+                "sentiment": result["label"],
+                "confidence": result["confidence"],
+                "inference_time": result["inference_time"]
+            }, ensure_ascii=False) + "\n"
+
+
+@router.post("/analyze-batch", response_model=StandardResponse)
+def analyze_sentiment_batch(request: SentimentBatchRequest):
+    if len(request.messages) > SENTIMENT_BATCH_MAX_ITEMS:
+        return StandardResponse(
+            status=StatusEnum.ERROR,
+            message=f"한 번에 최대 {SENTIMENT_BATCH_MAX_ITEMS}개까지 분석할 수 있습니다.",
+            data={"count": len(request.messages)}
+        )
+
+    if request.stream:
+        return StreamingResponse(_stream_sentiment_ndjson(request.messages), media_type="application/x-ndjson")
+
+    result = predict_sentiment_batch(request.messages, SENTIMENT_BATCH_BUCKET_SIZE)
+    items = [
+        SentimentBatchItem(
+            index=i,
+            sentiment=item["label"],
+            confidence=item["confidence"],
+            inference_time=item["inference_time"]
+        )
+        for i, item in enumerate(result["results"])
+    ]
+
+    return StandardResponse(
+        status=StatusEnum.SUCCESS,
+        message="배치 감성 분석 완료",
+        detected=any(item.sentiment == "negative" for item in items),
+        data=SentimentBatchResult(
+            results=items,
+            buckets=result["buckets"],
+            padding_efficiency=result["padding_efficiency"],
             inference_time=result["inference_time"]
         )
-    )
\ No newline at end of file
+    )
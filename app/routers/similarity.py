@@ -1,37 +1,93 @@
 # ✅ routers/similarity.py
+from typing import Optional
 from fastapi import APIRouter
 from app.schemas.common import StandardResponse, StatusEnum
 from app.schemas.similarity_schema import (
     SensitiveWordRequest,
+    SensitiveWordBulkRequest,
     SimilarityCheckRequest,
     UserIdRequest,
-    SimilarityResult
+    SimilarityResult,
+    SimilarityBatchRequest,
+    SimilarityBatchItemResult,
+    SimilarityBatchResult,
+    SimilarityMultiCheckRequest,
+    SimilarityMultiCheckResult,
+    SimilaritySearchRequest,
+    SimilaritySearchResult
 )
+from app.config import SIMILARITY_BATCH_MAX_ITEMS, SIMILARITY_MULTI_MAX_USERS, SIMILARITY_REGISTER_MAX_ITEMS
 from app.filter_utils.similarity_utils import (
     insert_sensitive_word,
+    insert_sensitive_words_bulk,
     get_sensitive_words_by_user,
     check_message_similarity,
+    check_messages_similarity_batch,
+    check_message_similarity_multi,
     remove_user_sensitive_word,
-    remove_all_user_sensitive_words
+    remove_all_user_sensitive_words,
+    get_similarity_cache_stats,
+    get_message_embedding_cache_stats,
+    get_sensitive_gc_stats,
+    get_reembed_status,
+    search_sensitive_words,
+    evaluate_vector_index_recall,
+    get_vector_index_stats,
+    rebuild_vector_index,
+    sensitive_gc,
+    reembed_job
 )
 
 router = APIRouter()
 
 @router.post("/register", response_model=StandardResponse)
 def register_sensitive_word(request: SensitiveWordRequest):
-    result = insert_sensitive_word(request.user_id, request.sentence)
+    try:
+        result = insert_sensitive_word(request.user_id, request.sentence)
 
-    message = (
-        "새로운 민감 단어가 등록되었습니다."
-        if result.get("created")
-        else "이미 등록된 민감 단어입니다."
-    )
+        message = (
+            "새로운 민감 단어가 등록되었습니다."
+            if result.get("created")
+            else "이미 등록된 민감 단어입니다."
+        )
 
-    return StandardResponse(
-        status=StatusEnum.SUCCESS,
-        message=message,
-        data={"word_id": result["word_id"]}
-    )
+        return StandardResponse(
+            status=StatusEnum.SUCCESS,
+            message=message,
+            data={"word_id": result["word_id"]}
+        )
+
+    except Exception as e:
+        return StandardResponse(
+            status=StatusEnum.ERROR,
+            message="민감 단어 등록 중 오류 발생",
+            data={"error": str(e)}
+        )
+    
+@router.post("/register-bulk", response_model=StandardResponse)
+def register_sensitive_words_bulk(request: SensitiveWordBulkRequest):
+    if len(request.sentences) > SIMILARITY_REGISTER_MAX_ITEMS:
+        return StandardResponse(
+            status=StatusEnum.ERROR,
+            message=f"한 번에 최대 {SIMILARITY_REGISTER_MAX_ITEMS}개까지 등록할 수 있습니다.",
+            data={"count": len(request.sentences)}
+        )
+
+    try:
+        result = insert_sensitive_words_bulk(request.user_ids, request.sentences)
+
+        return StandardResponse(
+            status=StatusEnum.SUCCESS,
+            message=f"{len(result['registered'])}개의 민감 단어가 새로 등록되었습니다.",
+            data=result
+        )
+
+    except Exception as e:
+        return StandardResponse(
+            status=StatusEnum.ERROR,
+            message="민감 단어 일괄 등록 중 오류 발생",
+            data={"error": str(e)}
+        )
     
 @router.get("/sensitive-words/{user_id}", response_model=StandardResponse)
 def get_user_sensitive_words(user_id: str):
@@ -53,7 +109,9 @@ def check_sensitive_message(request: SimilarityCheckRequest):
     result = check_message_similarity(
         user_id=request.user_id,
         message=request.message,
-        threshold=request.threshold  
+        threshold=request.threshold,
+        top_k=request.top_k,
+        all_matches=request.all_matches
     )
 
     if result is None:
@@ -72,6 +130,79 @@ def check_sensitive_message(request: SimilarityCheckRequest):
     )
 
 
+@router.post("/check-batch", response_model=StandardResponse)
+def check_sensitive_messages_batch(request: SimilarityBatchRequest):
+    if len(request.items) > SIMILARITY_BATCH_MAX_ITEMS:
+        return StandardResponse(
+            status=StatusEnum.ERROR,
+            message=f"한 번에 최대 {SIMILARITY_BATCH_MAX_ITEMS}개까지 검사할 수 있습니다.",
+            data={"count": len(request.items)}
+        )
+
+    result = check_messages_similarity_batch([
+        {
+            "user_id": item.user_id,
+            "message": item.message,
+            "threshold": item.threshold,
+            "top_k": item.top_k,
+            "all_matches": item.all_matches
+        }
+        for item in request.items
+    ])
+
+    item_results = [
+        SimilarityBatchItemResult(
+            user_id=item.user_id,
+            detected=bool(item_result and item_result["match"]),
+            result=SimilarityResult(**item_result) if item_result else None
+        )
+        for item, item_result in zip(request.items, result["results"])
+    ]
+
+    return StandardResponse(
+        status=StatusEnum.SUCCESS,
+        message="배치 유사도 분석 완료",
+        detected=any(item.detected for item in item_results),
+        data=SimilarityBatchResult(results=item_results, cache_hits=result["cache_hits"], timing=result["timing"])
+    )
+
+
+# 한 메시지를 여러 수신 유저 기준으로 검사 (메시지 임베딩 1회 + 단어 합집합 행렬 곱 1회)
+@router.post("/check-multi", response_model=StandardResponse)
+def check_sensitive_message_multi(request: SimilarityMultiCheckRequest):
+    if len(request.user_ids) > SIMILARITY_MULTI_MAX_USERS:
+        return StandardResponse(
+            status=StatusEnum.ERROR,
+            message=f"한 번에 최대 {SIMILARITY_MULTI_MAX_USERS}명까지 검사할 수 있습니다.",
+            data={"count": len(request.user_ids)}
+        )
+
+    result = check_message_similarity_multi(
+        request.user_ids, request.message, request.threshold, request.top_k, request.all_matches
+    )
+
+    item_results = [
+        SimilarityBatchItemResult(
+            user_id=user_id,
+            detected=bool(user_result and user_result["match"]),
+            result=SimilarityResult(**user_result) if user_result else None
+        )
+        for user_id, user_result in result["results"].items()
+    ]
+
+    return StandardResponse(
+        status=StatusEnum.SUCCESS,
+        message="다중 수신자 유사도 분석 완료",
+        detected=any(item.detected for item in item_results),
+        data=SimilarityMultiCheckResult(
+            results=item_results,
+            unique_words=result["unique_words"],
+            total_words=result["total_words"],
+            timing=result["timing"]
+        )
+    )
+
+
 @router.delete("/sensitive-word", response_model=StandardResponse)
 def delete_sensitive_word(request: SensitiveWordRequest):
     result = remove_user_sensitive_word(request.user_id, request.sentence)
@@ -119,4 +250,149 @@ def delete_all_sensitive_words(request: UserIdRequest):
             status=StatusEnum.ERROR,
             message="민감 단어 전체 삭제 중 오류 발생",
             data={"error": result.get("reason")}
-        )
\ No newline at end of file
+        )
+
+
+@router.get("/cache/stats", response_model=StandardResponse)
+def fetch_similarity_cache_stats():
+    return StandardResponse(
+        status=StatusEnum.SUCCESS,
+        message="민감 단어 캐시 통계 조회 성공",
+        data=get_similarity_cache_stats()
+    )
+
+
+@router.get("/cache/message-stats", response_model=StandardResponse)
+def fetch_message_embedding_cache_stats():
+    return StandardResponse(
+        status=StatusEnum.SUCCESS,
+        message="메시지 임베딩 캐시 통계 조회 성공",
+        data=get_message_embedding_cache_stats()
+    )
+
+
+@router.get("/gc/stats", response_model=StandardResponse)
+def fetch_sensitive_gc_stats():
+    try:
+        return StandardResponse(
+            status=StatusEnum.SUCCESS,
+            message="고아 민감 단어 정리 통계 조회 성공",
+            data=get_sensitive_gc_stats()
+        )
+    except Exception as e:
+        return StandardResponse(
+            status=StatusEnum.ERROR,
+            message="고아 민감 단어 통계 조회 중 오류 발생",
+            data={"error": str(e)}
+        )
+
+
+@router.post("/gc/run", response_model=StandardResponse)
+def run_sensitive_gc():
+    try:
+        deleted_count = sensitive_gc.collect()
+        return StandardResponse(
+            status=StatusEnum.SUCCESS,
+            message=f"고아 민감 단어 {deleted_count}개 정리 완료",
+            data={"deleted_count": deleted_count}
+        )
+    except Exception as e:
+        return StandardResponse(
+            status=StatusEnum.ERROR,
+            message="고아 민감 단어 정리 중 오류 발생",
+            data={"error": str(e)}
+        )
+
+
+@router.get("/reembed/status", response_model=StandardResponse)
+def fetch_reembed_status():
+    try:
+        return StandardResponse(
+            status=StatusEnum.SUCCESS,
+            message="재임베딩 작업 상태 조회 성공",
+            data=get_reembed_status()
+        )
+    except Exception as e:
+        return StandardResponse(
+            status=StatusEnum.ERROR,
+            message="재임베딩 작업 상태 조회 중 오류 발생",
+            data={"error": str(e)}
+        )
+
+
+@router.post("/reembed/start", response_model=StandardResponse)
+def start_reembed():
+    started = reembed_job.start()
+    return StandardResponse(
+        status=StatusEnum.SUCCESS,
+        message="재임베딩 작업을 시작했습니다." if started else "재임베딩 작업이 이미 실행 중입니다.",
+        data=reembed_job.stats()
+    )
+
+
+@router.post("/reembed/stop", response_model=StandardResponse)
+def stop_reembed():
+    reembed_job.stop()
+    return StandardResponse(
+        status=StatusEnum.SUCCESS,
+        message="현재 묶음까지 반영 후 재임베딩 작업을 중단합니다.",
+        data=reembed_job.stats()
+    )
+
+
+@router.post("/index/search", response_model=StandardResponse)
+def search_sensitive_index(request: SimilaritySearchRequest):
+    try:
+        result = search_sensitive_words(
+            message=request.message,
+            k=max(1, request.k),
+            user_id=request.user_id,
+            nprobe=request.nprobe,
+            exact=request.exact
+        )
+        return StandardResponse(
+            status=StatusEnum.SUCCESS,
+            message="민감 단어 근사 검색 완료",
+            data=SimilaritySearchResult(**result)
+        )
+    except Exception as e:
+        return StandardResponse(
+            status=StatusEnum.ERROR,
+            message="민감 단어 검색 중 오류 발생",
+            data={"error": str(e)}
+        )
+
+
+@router.get("/index/stats", response_model=StandardResponse)
+def fetch_vector_index_stats():
+    return StandardResponse(
+        status=StatusEnum.SUCCESS,
+        message="벡터 인덱스 상태 조회 성공",
+        data=get_vector_index_stats()
+    )
+
+
+# 근사 검색 품질 확인 (저장된 벡터 + 잡음 질의로 정확한 결과 대비 recall@k)
+@router.get("/index/recall", response_model=StandardResponse)
+def fetch_vector_index_recall(samples: int = 200, k: int = 10, nprobe: Optional[int] = None):
+    return StandardResponse(
+        status=StatusEnum.SUCCESS,
+        message="벡터 인덱스 recall 측정 완료",
+        data=evaluate_vector_index_recall(samples, k, nprobe)
+    )
+
+
+@router.post("/index/rebuild", response_model=StandardResponse)
+def rebuild_sensitive_index():
+    try:
+        return StandardResponse(
+            status=StatusEnum.SUCCESS,
+            message="벡터 인덱스 재빌드 완료",
+            data=rebuild_vector_index()
+        )
+    except Exception as e:
+        return StandardResponse(
+            status=StatusEnum.ERROR,
+            message="벡터 인덱스 재빌드 중 오류 발생",
+            data={"error": str(e)}
+        )
@@ -0,0 +1,28 @@
+# app/schemas/filter_schema.py
+from pydantic import BaseModel
+from typing import Any, Dict, List, Optional
+
+class FilterRequest(BaseModel):
+    message: str
+    user_id: Optional[str] = None
+    stages: Optional[List[str]] = None
+    concurrent: Optional[bool] = None
+    early_exit: Optional[bool] = None
+    similarity_threshold: Optional[float] = None
+    sentiment_min_confidence: Optional[float] = None
+
+class FilterStageResult(BaseModel):
+    stage: str
+    verdict: str
+    reason: Optional[str] = None
+    elapsed: float
+    data: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+class FilterResult(BaseModel):
+    message: str
+    user_id: Optional[str] = None
+    verdict: str
+    blocked_by: Optional[str] = None
+    stages: List[FilterStageResult]
+    timing: Dict[str, float]
@@ -1,6 +1,6 @@
 # app/schemas/forbidden_schema.py
-from pydantic import BaseModel
-from typing import List
+from pydantic import BaseModel, Field
+from typing import Dict, List, Optional
 
 class ForbiddenWord(BaseModel):
     word: str
@@ -11,9 +11,34 @@ class ForbiddenWordList(BaseModel):
 class MessageInput(BaseModel):
     message: str
     
+class MessageListInput(BaseModel):
+    messages: List[str]
+    concurrency: Optional[int] = None
+    
+class MaskInput(BaseModel):
+    message: str
+    # 글자 하나를 그대로 한 글자로 바꿔야 매칭 구간 길이/위치가 유지됨
+    mask_char: str = Field("*", min_length=1, max_length=1)
+    
+class ForbiddenMatch(BaseModel):
+    word: str
+    start: int
+    end: int
+    method: str
+    
 class ForbiddenCheckResult(BaseModel):
     message: str
     result: str
     detected_words: List[str]
     method: str
-    inference_time: float
\ No newline at end of file
+    matches: List[ForbiddenMatch] = []
+    inference_time: float
+    stage_times: Optional[Dict[str, float]] = None
+    
+class ForbiddenMaskResult(BaseModel):
+    message: str
+    masked_message: str
+    detected_words: List[str]
+    method: str
+    matches: List[ForbiddenMatch]
+    inference_time: float
@@ -1,4 +1,5 @@
 from pydantic import BaseModel
+from typing import List
 
 class SentimentRequest(BaseModel):
     message: str
@@ -6,4 +7,18 @@ class SentimentRequest(BaseModel):
 class SentimentResult(BaseModel):
     sentiment: str
     confidence: float
-    inference_time: float 
\ No newline at end of file
+    inference_time: float
+    tier: str = "model"
+
+class SentimentBatchRequest(BaseModel):
+    messages: List[str]
+    stream: bool = False
+
+class SentimentBatchItem(SentimentResult):
+    index: int
+
+class SentimentBatchResult(BaseModel):
+    results: List[SentimentBatchItem]
+    buckets: int
+    padding_efficiency: float
+    inference_time: float
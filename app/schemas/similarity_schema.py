@@ -1,21 +1,89 @@
 # ✅ schemas/similarity_schema.py
 from pydantic import BaseModel
+from typing import List, Optional
 
 class SensitiveWordRequest(BaseModel):
     user_id: str
     sentence: str
     
+class SensitiveWordBulkRequest(BaseModel):
+    user_ids: List[str]
+    sentences: List[str]
+    
 class SimilarityCheckRequest(BaseModel):
     user_id: str
     message: str
     threshold: float = 0.8 
+    top_k: Optional[int] = None
+    all_matches: bool = False
+    
+class SimilarityMatch(BaseModel):
+    word: str
+    score: float
     
 class SimilarityResult(BaseModel):
     max_similarity: float
     most_similar_word: str
     threshold: float
     match: bool
+    matches: List[SimilarityMatch] = []
     inference_time: float
     
 class UserIdRequest(BaseModel):
-    user_id: str
\ No newline at end of file
+    user_id: str
+    
+class SimilarityBatchRequest(BaseModel):
+    items: List[SimilarityCheckRequest]
+    
+class SimilarityBatchItemResult(BaseModel):
+    user_id: str
+    detected: bool
+    result: Optional[SimilarityResult] = None
+    
+class SimilarityBatchTiming(BaseModel):
+    load_matrices: float
+    cache_lookup: float
+    forward: float
+    scoring: float
+    total: float
+    
+class SimilarityBatchResult(BaseModel):
+    results: List[SimilarityBatchItemResult]
+    cache_hits: int = 0
+    timing: SimilarityBatchTiming
+    
+class SimilarityMultiCheckRequest(BaseModel):
+    user_ids: List[str]
+    message: str
+    threshold: float = 0.8
+    top_k: Optional[int] = None
+    all_matches: bool = False
+    
+class SimilarityMultiTiming(BaseModel):
+    load_matrices: float
+    encode: float
+    scoring: float
+    total: float
+    
+class SimilarityMultiCheckResult(BaseModel):
+    results: List[SimilarityBatchItemResult]
+    unique_words: int
+    total_words: int
+    timing: SimilarityMultiTiming
+    
+class SimilaritySearchRequest(BaseModel):
+    message: str
+    k: int = 10
+    user_id: Optional[str] = None
+    nprobe: Optional[int] = None
+    exact: bool = False
+    
+class SimilaritySearchHit(BaseModel):
+    word_id: int
+    word: str
+    score: float
+    
+class SimilaritySearchResult(BaseModel):
+    results: List[SimilaritySearchHit]
+    method: str
+    inference_time: float
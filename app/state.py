@@ -1,2 +1,5 @@
 # app/state.py
-forbidden_automaton = None
\ No newline at end of file
+forbidden_automaton = None
+
+# 기동 시 트라이 로딩 결과 (snapshot / database, 소요 시간)
+automaton_load_info = None
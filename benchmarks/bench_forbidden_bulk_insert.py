@@ -0,0 +1,69 @@
+# benchmarks/bench_forbidden_bulk_insert.py
+"""
+금칙어 일괄 등록 벤치마크: 기존 ORM 한 행씩 경로 vs set 기반 경로
+- .env 에 설정된 DB 에 '__bench_' 접두어 단어를 등록했다가 삭제하므로
+  API 워커가 붙어 있지 않은 개발 DB 에서만 실행 (변경 이력도 함께 정리)
+- 실행: python -m benchmarks.bench_forbidden_bulk_insert --count 2000
+"""
+
+import argparse
+import time
+import uuid
+
+import ahocorasick
+
+from app.database import db_session
+from app.filter_utils.forbidden_utils import decompose_text, insert_bulk_forbidden_words
+from db_models.forbidden import ForbiddenWord, ForbiddenWordChange
+
+
+def legacy_insert(words: list[str]) -> float:
+    """기존 경로 재현: 행마다 add + flush, 단어마다 트라이 전체 make_automaton"""
+    automaton = ahocorasick.Automaton()
+    started = time.time()
+    with db_session() as session:
+        for word in words:
+            decomposed = decompose_text(word)
+            session.add(ForbiddenWord(word=word, decomposed_word=decomposed))
+            session.flush()
+            automaton.add_word(word, (word, "original"))
+            automaton.make_automaton()
+    return time.time() - started
+
+
+def bulk_insert(words: list[str]) -> float:
+    started = time.time()
+    result = insert_bulk_forbidden_words(words)
+    assert len(result["registered"]) == len(words), result["message"]
+    return time.time() - started
+
+
+def cleanup(prefix: str):
+    with db_session() as session:
+        session.query(ForbiddenWord).filter(ForbiddenWord.word.like(f"{prefix}%")).delete(synchronize_session=False)
+        session.query(ForbiddenWordChange).filter(ForbiddenWordChange.word.like(f"{prefix}%")).delete(synchronize_session=False)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=2000)
+    args = parser.parse_args()
+
+    prefix = f"__bench_{uuid.uuid4().hex[:6]}_"
+    legacy_words = [f"{prefix}legacy_{i}금칙" for i in range(args.count)]
+    bulk_words = [f"{prefix}bulk_{i}금칙" for i in range(args.count)]
+
+    try:
+        legacy = legacy_insert(legacy_words)
+        bulk = bulk_insert(bulk_words)
+    finally:
+        cleanup(prefix)
+
+    print(f"단어 수: {args.count}")
+    print(f"기존 경로 : {legacy:.3f}s ({args.count / legacy:.1f} words/s)")
+    print(f"set 기반  : {bulk:.3f}s ({args.count / bulk:.1f} words/s)")
+    print(f"속도 향상 : x{legacy / bulk:.1f}")
+
+
+if __name__ == "__main__":
+    main()
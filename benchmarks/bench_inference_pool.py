@@ -0,0 +1,90 @@
+# benchmarks/bench_inference_pool.py
+"""
+추론 워커 프로세스 풀 확장성 / 메모리 벤치마크
+- 워커 수 1 → N 으로 늘리며 동시 배치 요청 처리량 (문장/초) 과 1개 대비 배율 측정
+- 비교용으로 현재 프로세스 스레드 풀에서 같은 부하를 돌린 처리량 (GIL + intra-op 경쟁) 도 측정
+- 워커별 RSS 중 부모와 공유 중인 페이지(shared) = 워커마다 모델을 따로 로딩했다면 추가로 들었을 메모리
+- 실행: python -m benchmarks.bench_inference_pool --task sentiment --max-workers 4
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import torch
+
+from app.filter_utils.inference_pool import InferencePool, read_memory
+
+SAMPLES = [
+    "사랑해요 ❤️",
+    "이 영화 진짜 최악이다 시간 아깝다",
+    "배우들 연기는 좋았는데 스토리가 너무 지루했어요",
+    "ㅋㅋㅋ 완전 웃김",
+    "다시는 보고 싶지 않은 영화",
+    "감동적이고 여운이 남는 작품입니다",
+]
+
+
+def load_task(name: str):
+    if name == "sentiment":
+        from app.filter_utils.sentiment_utils import _predict_sentiment_batch, load_sentiment_model
+        load_sentiment_model()
+        return _predict_sentiment_batch
+    from app.filter_utils.similarity_utils import _embed_sentences_batch, load_embedding_model
+    load_embedding_model()
+    return _embed_sentences_batch
+
+
+def drive(fn, clients: int, batches: int, batch_size: int) -> float:
+    """clients 개 스레드가 batch_size 문장 배치를 총 batches 번 호출 → 문장/초"""
+    batch = (SAMPLES * (batch_size // len(SAMPLES) + 1))[:batch_size]
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as executor:
+        list(executor.map(lambda _: fn(batch), range(batches)))
+    return batches * batch_size / (time.perf_counter() - started)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--task", choices=["sentiment", "embedding"], default="sentiment")
+    parser.add_argument("--max-workers", type=int, default=len(os.sched_getaffinity(0)))
+    parser.add_argument("--threads", type=int, default=1)
+    parser.add_argument("--batches", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, default=16)
+    args = parser.parse_args()
+
+    fn = load_task(args.task)
+    parent = read_memory(os.getpid())
+    print(f"[{args.task}] 부모 프로세스 RSS {parent.get('rss_mb')}MB, 배치 {args.batch_size}문장 x {args.batches}회")
+
+    # 풀 측정을 먼저: 부모가 torch 추론(OpenMP 스레드 풀)을 돌리기 전에 fork 해야 워커가 안전
+    rows = []
+    for workers in range(1, args.max_workers + 1):
+        pool = InferencePool(workers=workers, threads=args.threads, pin_cores=True, timeout_sec=120)
+        dispatch = pool.task(args.task, fn)
+        pool.start()
+        try:
+            drive(dispatch, workers * 2, workers * 2, args.batch_size)
+            pooled = drive(dispatch, workers * 2, args.batches, args.batch_size)
+            memory = [detail for detail in pool.stats()["worker_detail"] if detail.get("rss_mb") is not None]
+        finally:
+            pool.stop()
+        rows.append((workers, pooled, memory))
+
+    print(f"{'workers':>7} {'thread sent/s':>14} {'pool sent/s':>12} {'scaling':>8} {'worker rss':>11} {'shared':>8} {'private':>8}")
+    base = rows[0][1]
+    for workers, pooled, memory in rows:
+        torch.set_num_threads(workers * args.threads)
+        threaded = drive(fn, workers * 2, args.batches, args.batch_size)
+        avg = lambda key: sum(detail[key] for detail in memory) / len(memory) if memory else 0.0
+        print(
+            f"{workers:>7} {threaded:>14.1f} {pooled:>12.1f} {pooled / base:>7.2f}x "
+            f"{avg('rss_mb'):>9.1f}MB {avg('shared_mb'):>6.1f}MB {avg('private_mb'):>6.1f}MB"
+        )
+
+    print("\nshared = 워커당 절약한 메모리 (모델 가중치 등 부모와 공유 중인 페이지)")
+
+
+if __name__ == "__main__":
+    main()
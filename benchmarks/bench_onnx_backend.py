@@ -0,0 +1,128 @@
+# benchmarks/bench_onnx_backend.py
+"""
+추론 백엔드 비교: torch (fp32) vs ONNX Runtime (fp32 / int8 동적 양자화)
+- 정합성: 감성 라벨 일치율 + 확률 차이, 임베딩 코사인 drift (1 - cos) 평균/최대
+- 성능: 한 문장씩 호출 지연 (p50 / p95) + 배치 처리량
+- 라벨 일치율이 --min-agreement 미만이거나 코사인 drift 가 --max-drift 를 넘으면 종료 코드 1
+- 입력: NSMC 형식 TSV (없으면 내장 예문 반복)
+- 실행: python -m benchmarks.bench_onnx_backend --data ratings_test.txt --limit 1000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import torch
+from transformers import AutoTokenizer
+
+from app.filter_utils.inference_backend import (
+    FEATURE_EXTRACTION,
+    SEQUENCE_CLASSIFICATION,
+    TORCH,
+    ONNX,
+    ONNX_INT8,
+    OnnxModel,
+    load_model
+)
+
+SAMPLES = [
+    "사랑해요 ❤️",
+    "이 영화 진짜 최악이다 시간 아깝다",
+    "배우들 연기는 좋았는데 스토리가 너무 지루했어요",
+    "ㅋㅋㅋ 완전 웃김",
+    "다시는 보고 싶지 않은 영화",
+    "감동적이고 여운이 남는 작품입니다",
+    "그냥 그랬음",
+    "돈 주고 보기엔 아까운데 킬링타임용으로는 괜찮음",
+]
+
+
+def load_texts(path: str | None, limit: int) -> list[str]:
+    if not path:
+        return (SAMPLES * (limit // len(SAMPLES) + 1))[:limit]
+    from benchmarks.train_sentiment_tier import load_nsmc
+    return load_nsmc(path, limit)[0]
+
+
+def run(model, tokenizer, texts: list[str], task: str, batch_size: int) -> tuple[np.ndarray, float]:
+    """배치 단위 추론 → (출력, 초당 문장 수) - 분류는 확률, 임베딩은 mask 평균 풀링"""
+    outputs = []
+    started = time.perf_counter()
+    for start in range(0, len(texts), batch_size):
+        inputs = tokenizer(texts[start:start + batch_size], return_tensors="pt", truncation=True, padding=True)
+        with torch.no_grad():
+            result = model(**inputs)
+        if task == SEQUENCE_CLASSIFICATION:
+            outputs.append(torch.nn.functional.softmax(result.logits, dim=1).numpy())
+        else:
+            mask = inputs["attention_mask"].unsqueeze(-1).to(result.last_hidden_state.dtype)
+            outputs.append(((result.last_hidden_state * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1e-9)).numpy())
+    return np.concatenate(outputs), len(texts) / (time.perf_counter() - started)
+
+
+def single_latency(model, tokenizer, texts: list[str], count: int) -> tuple[float, float]:
+    times = []
+    for text in texts[:count]:
+        inputs = tokenizer([text], return_tensors="pt", truncation=True, padding=True)
+        started = time.perf_counter()
+        with torch.no_grad():
+            model(**inputs)
+        times.append((time.perf_counter() - started) * 1000)
+    return float(np.percentile(times, 50)), float(np.percentile(times, 95))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--data", default=None)
+    parser.add_argument("--limit", type=int, default=1000)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--latency-count", type=int, default=200)
+    parser.add_argument("--min-agreement", type=float, default=0.99)
+    parser.add_argument("--max-drift", type=float, default=0.01)
+    args = parser.parse_args()
+
+    texts = load_texts(args.data, args.limit)
+    failed = False
+
+    for model_path, task in (
+        (os.getenv("SENTIMENT_MODEL_PATH"), SEQUENCE_CLASSIFICATION),
+        (os.getenv("EMBEDDING_MODEL_PATH"), FEATURE_EXTRACTION),
+    ):
+        tokenizer = AutoTokenizer.from_pretrained(model_path)
+        reference, reference_tput = run(load_model(model_path, task, TORCH), tokenizer, texts, task, args.batch_size)
+        p50, p95 = single_latency(load_model(model_path, task, TORCH), tokenizer, texts, args.latency_count)
+        print(f"\n[{task}] {model_path} ({len(texts)}문장)")
+        print(f"{'backend':>10} {'p50 ms':>8} {'p95 ms':>8} {'batch/s':>9} {'parity':>30}")
+        print(f"{TORCH:>10} {p50:>8.2f} {p95:>8.2f} {reference_tput:>9.1f} {'-':>30}")
+
+        for backend in (ONNX, ONNX_INT8):
+            model = load_model(model_path, task, backend)
+            if not isinstance(model, OnnxModel):
+                print(f"{backend:>10} (ONNX 파일 없음 → 건너뜀)")
+                continue
+            output, tput = run(model, tokenizer, texts, task, args.batch_size)
+            p50, p95 = single_latency(model, tokenizer, texts, args.latency_count)
+
+            if task == SEQUENCE_CLASSIFICATION:
+                agreement = float(np.mean(output.argmax(axis=1) == reference.argmax(axis=1)))
+                prob_diff = float(np.abs(output - reference).max())
+                parity = f"label {agreement:.4f} / max|Δp| {prob_diff:.4f}"
+                failed |= agreement < args.min_agreement
+            else:
+                cos = (output * reference).sum(axis=1) / (np.linalg.norm(output, axis=1) * np.linalg.norm(reference, axis=1))
+                drift = 1 - cos
+                parity = f"drift mean {drift.mean():.5f} / max {drift.max():.5f}"
+                failed |= float(drift.max()) > args.max_drift
+
+            print(f"{backend:>10} {p50:>8.2f} {p95:>8.2f} {tput:>9.1f} {parity:>30}")
+
+    if failed:
+        print("\n❌ 정합성 기준 미달")
+        sys.exit(1)
+    print("\n✅ 정합성 기준 통과")
+
+
+if __name__ == "__main__":
+    main()
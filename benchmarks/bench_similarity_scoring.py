@@ -0,0 +1,68 @@
+# benchmarks/bench_similarity_scoring.py
+"""
+민감 단어 유사도 점수 계산 벤치마크: 기존 cdist(cosine) 경로 vs 미리 정규화된 float32 행렬-벡터 곱
+- DB/모델 없이 임의 벡터로 측정 (점수 계산 구간만 비교)
+- 실행: python -m benchmarks.bench_similarity_scoring --words 1000 --dim 768 --repeat 500
+"""
+
+import argparse
+import time
+
+import numpy as np
+from scipy.spatial.distance import cdist
+
+from app.filter_utils.cache_utils import normalize_rows
+
+
+def legacy_score(message_embedding: np.ndarray, embeddings: list[np.ndarray]) -> tuple[float, int]:
+    """기존 compute_similarity 재현: 요청마다 리스트 → 행렬 변환 + cdist 로 노름 재계산, 최댓값 하나만 반환"""
+    similarities = 1 - cdist(message_embedding.reshape(1, -1), np.stack(embeddings), metric="cosine")[0]
+    max_index = int(np.argmax(similarities))
+    return float(similarities[max_index]), max_index
+
+
+def matvec_score(message_embedding: np.ndarray, matrix: np.ndarray, top_k: int) -> tuple[float, int, np.ndarray]:
+    """현재 경로: 정규화된 행렬과 내적 한 번 + top-k"""
+    query = normalize_rows(message_embedding.reshape(1, -1))[0]
+    similarities = matrix @ query
+    top = np.argpartition(-similarities, top_k)[:top_k] if len(similarities) > top_k else np.arange(len(similarities))
+    top = top[np.argsort(-similarities[top])]
+    return float(similarities[top[0]]), int(top[0]), top
+
+
+def measure(fn, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--words", type=int, default=1000)
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--repeat", type=int, default=500)
+    parser.add_argument("--top-k", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    embeddings = [rng.normal(size=args.dim).astype(np.float32) for _ in range(args.words)]
+    matrix = normalize_rows(np.stack(embeddings))
+    message = rng.normal(size=args.dim).astype(np.float32)
+
+    # 두 경로의 최고 점수가 같은지 먼저 확인
+    legacy_max, legacy_index = legacy_score(message, embeddings)
+    new_max, new_index, _ = matvec_score(message, matrix, args.top_k)
+    assert legacy_index == new_index and abs(legacy_max - new_max) < 1e-4, (legacy_max, new_max)
+
+    legacy = measure(lambda: legacy_score(message, embeddings), args.repeat)
+    matvec = measure(lambda: matvec_score(message, matrix, args.top_k), args.repeat)
+
+    print(f"단어 수: {args.words}, 차원: {args.dim}, 반복: {args.repeat}")
+    print(f"cdist 경로      : {legacy:.4f} ms/요청 (최댓값 1개)")
+    print(f"정규화 행렬 곱  : {matvec:.4f} ms/요청 (top-{args.top_k})")
+    print(f"속도 향상       : x{legacy / matvec:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+# benchmarks/eval_sentiment_tier.py
+"""
+감성 2단계 추론 평가: held-out 셋에서 confidence 기준별로
+- escalation rate (transformer 로 넘어가는 비율)
+- 최종 결과와 transformer 단독 결과의 일치율 / 정답 정확도
+- 처리량 향상 (1단계 전체 시간 + 넘어간 문장의 transformer 시간 기준 추정)
+- --target-agreement 를 만족하는 가장 낮은 기준을 추천하고, --write 면 그 값을 모델 파일에 저장 (API 기본 기준)
+- 실행: python -m benchmarks.eval_sentiment_tier --test ratings_test.txt --limit 5000 --write
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from app.config import SENTIMENT_TIER_MODEL_PATH
+from app.filter_utils.sentiment_tier import HashedNgramClassifier
+from app.filter_utils.sentiment_utils import _predict_sentiment_batch, load_sentiment_model
+from benchmarks.train_sentiment_tier import load_nsmc
+
+
+def run_model(texts: list[str], batch_size: int) -> tuple[np.ndarray, np.ndarray]:
+    """transformer 단독 예측 + 문장별 소요 시간 (batch_size 1 = 실제 /sentiment/analyze 경로)"""
+    predictions = np.empty(len(texts), dtype=np.int64)
+    times = np.empty(len(texts))
+    for start in range(0, len(texts), batch_size):
+        chunk = texts[start:start + batch_size]
+        started = time.perf_counter()
+        result = _predict_sentiment_batch(chunk)
+        elapsed = (time.perf_counter() - started) / len(chunk)
+        predictions[start:start + len(chunk)] = [class_id for class_id, _ in result]
+        times[start:start + len(chunk)] = elapsed
+    return predictions, times
+
+
+def run_tier(classifier: HashedNgramClassifier, texts: list[str]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    predictions = np.empty(len(texts), dtype=np.int64)
+    confidences = np.empty(len(texts))
+    times = np.empty(len(texts))
+    for i, text in enumerate(texts):
+        started = time.perf_counter()
+        predictions[i], confidences[i] = classifier.predict(text)
+        times[i] = time.perf_counter() - started
+    return predictions, confidences, times
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--test", required=True)
+    parser.add_argument("--model", default=SENTIMENT_TIER_MODEL_PATH)
+    parser.add_argument("--limit", type=int, default=5000)
+    parser.add_argument("--batch-size", type=int, default=1)
+    parser.add_argument("--margins", default="0.8,0.85,0.9,0.95,0.97,0.99")
+    parser.add_argument("--target-agreement", type=float, default=0.99, help="transformer 단독 결과와의 최소 일치율")
+    parser.add_argument("--write", action="store_true", help="추천 기준을 모델 파일의 min_confidence 로 저장")
+    args = parser.parse_args()
+
+    texts, labels = load_nsmc(args.test, args.limit)
+    labels = np.asarray(labels)
+    classifier = HashedNgramClassifier.load(args.model)
+    load_sentiment_model()
+
+    model_pred, model_times = run_model(texts, args.batch_size)
+    tier_pred, tier_conf, tier_times = run_tier(classifier, texts)
+
+    print(f"평가 문장 수: {len(texts)}")
+    print(f"transformer 단독 : 정확도 {np.mean(model_pred == labels):.4f}, 평균 {model_times.mean() * 1000:.2f}ms/문장")
+    print(f"1단계 단독       : 정확도 {np.mean(tier_pred == labels):.4f}, 평균 {tier_times.mean() * 1000:.3f}ms/문장, "
+          f"transformer 일치율 {np.mean(tier_pred == model_pred):.4f}")
+    print()
+    print(f"{'margin':>7} {'escalation':>11} {'agreement':>10} {'accuracy':>9} {'speedup':>8}")
+
+    recommended = None
+    for margin in sorted(float(m) for m in args.margins.split(",")):
+        escalated = tier_conf < margin
+        final = np.where(escalated, model_pred, tier_pred)
+        agreement = np.mean(final == model_pred)
+        tiered_time = tier_times.sum() + model_times[escalated].sum()
+        print(
+            f"{margin:>7.2f} {escalated.mean():>11.2%} {agreement:>10.4f} "
+            f"{np.mean(final == labels):>9.4f} {model_times.sum() / tiered_time:>7.1f}x"
+        )
+        if recommended is None and agreement >= args.target_agreement:
+            recommended = margin
+
+    print()
+    if recommended is None:
+        print(f"⚠️ [주의] 일치율 {args.target_agreement} 이상인 기준 없음 → 더 높은 --margins 로 다시 측정")
+        return
+    print(f"✅ 추천 기준: {recommended} (일치율 {args.target_agreement} 이상 중 가장 낮은 값)")
+    if args.write:
+        classifier.min_confidence = recommended
+        classifier.save(args.model)
+        print(f"✅ 저장: {args.model} (min_confidence={recommended})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+# benchmarks/export_onnx.py
+"""
+감성 / 임베딩 모델 ONNX export (+ int8 동적 양자화)
+- 결과는 각 모델 경로 아래 ONNX_MODEL_SUBDIR 에 저장 → INFERENCE_BACKEND=onnx | onnx-int8 로 사용
+- 필요 패키지: onnx, onnxruntime (API 이미지에는 onnxruntime 만 있으면 됨)
+- 실행: python -m benchmarks.export_onnx [--no-quantize]
+"""
+
+import argparse
+import os
+
+from app.filter_utils.inference_backend import FEATURE_EXTRACTION, SEQUENCE_CLASSIFICATION, export_onnx
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sentiment-model", default=os.getenv("SENTIMENT_MODEL_PATH"))
+    parser.add_argument("--embedding-model", default=os.getenv("EMBEDDING_MODEL_PATH"))
+    parser.add_argument("--no-quantize", action="store_true")
+    args = parser.parse_args()
+
+    for model_path, task in ((args.sentiment_model, SEQUENCE_CLASSIFICATION), (args.embedding_model, FEATURE_EXTRACTION)):
+        if not model_path:
+            print(f"⚠️ [주의] {task} 모델 경로 없음 → 건너뜀")
+            continue
+        export_onnx(model_path, task, quantize=not args.no_quantize)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+# benchmarks/report_embedding_encoding.py
+"""
+민감 단어 임베딩 저장 형식별 정확도 vs 메모리 리포트 (float32 기준)
+- 기본: 군집 구조가 있는 임의 벡터 / --from-db: .env 의 DB 에서 현재 저장된 임베딩 사용
+- 질의는 저장된 벡터에 잡음을 섞어 만든 '비슷한 메시지' 임베딩
+- 실행: python -m benchmarks.report_embedding_encoding --words 5000 --dim 768
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from app.filter_utils.cache_utils import normalize_rows
+from app.filter_utils.embedding_codec import ENCODINGS, FLOAT32, CompactMatrix, decode_embedding, encode_embedding
+
+
+def synthetic_vectors(words: int, dim: int, rng) -> np.ndarray:
+    centers = rng.normal(size=(max(1, words // 50), dim))
+    return normalize_rows(centers[rng.integers(0, len(centers), words)] + rng.normal(scale=0.6, size=(words, dim)))
+
+
+def db_vectors() -> np.ndarray:
+    from app.database import db_session
+    from db_models.similarity import SensitiveWord
+
+    with db_session() as session:
+        rows = session.query(SensitiveWord.embedding, SensitiveWord.embedding_encoding).all()
+    return normalize_rows(np.stack([decode_embedding(blob, encoding) for blob, encoding in rows]))
+
+
+def top_k(scores: np.ndarray, k: int) -> set[int]:
+    return set(np.argpartition(-scores, k)[:k].tolist()) if len(scores) > k else set(range(len(scores)))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--words", type=int, default=5000)
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--threshold", type=float, default=0.8)
+    parser.add_argument("--from-db", action="store_true")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    vectors = db_vectors() if args.from_db else synthetic_vectors(args.words, args.dim, rng)
+    picked = vectors[rng.choice(len(vectors), min(args.queries, len(vectors)), replace=False)]
+    queries = normalize_rows(picked + rng.normal(scale=0.02, size=picked.shape))
+
+    reference = CompactMatrix.from_float32(vectors, FLOAT32)
+    expected = [reference.matvec(q) for q in queries]
+
+    print(f"벡터 수: {len(vectors)}, 차원: {vectors.shape[1]}, 질의: {len(queries)}, k={args.k}, threshold={args.threshold}")
+    print(f"{'형식':<8} {'bytes/행':>9} {'행렬 MB':>9} {'최대 오차':>10} {'평균 오차':>10} {'top1 일치':>9} {'recall@k':>9} {'판정 일치':>9} {'ms/질의':>8}")
+
+    for encoding in ENCODINGS:
+        # 저장 bytes → 캐시 행렬 경로 그대로 재현
+        blobs = [encode_embedding(v, encoding) for v in vectors]
+        matrix = CompactMatrix.from_blobs(blobs, encoding)
+
+        errors = []
+        top1 = 0
+        recall = 0.0
+        decisions = 0
+        started = time.perf_counter()
+        scores_list = [matrix.matvec(q) for q in queries]
+        elapsed = (time.perf_counter() - started) / len(queries) * 1000
+
+        for scores, exact in zip(scores_list, expected):
+            errors.append(np.abs(scores - exact))
+            top1 += int(np.argmax(scores) == np.argmax(exact))
+            recall += len(top_k(scores, args.k) & top_k(exact, args.k)) / min(args.k, len(exact))
+            decisions += int((scores.max() >= args.threshold) == (exact.max() >= args.threshold))
+
+        errors = np.concatenate(errors)
+        n = len(queries)
+        print(
+            f"{encoding:<8} {len(blobs[0]):>9} {matrix.nbytes / 1024 / 1024:>9.2f} {errors.max():>10.5f} {errors.mean():>10.6f}"
+            f" {top1 / n:>9.3f} {recall / n:>9.3f} {decisions / n:>9.3f} {elapsed:>8.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
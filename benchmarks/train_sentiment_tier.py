@@ -0,0 +1,52 @@
+# benchmarks/train_sentiment_tier.py
+"""
+감성 1단계 분류기(해시 글자 n-gram 로지스틱 회귀) 오프라인 학습
+- 입력: NSMC 형식 TSV (id \t document \t label, 첫 줄 헤더, label 1 = positive)
+- 출력: SENTIMENT_TIER_MODEL_PATH 에 npz 저장 → API 재시작 시 자동 사용
+- 실행: python -m benchmarks.train_sentiment_tier --train ratings_train.txt
+"""
+
+import argparse
+import csv
+import time
+
+from app.config import SENTIMENT_TIER_MODEL_PATH
+from app.filter_utils.sentiment_tier import train_hashed_ngram
+
+
+def load_nsmc(path: str, limit: int | None = None) -> tuple[list[str], list[int]]:
+    texts, labels = [], []
+    with open(path, encoding="utf-8") as f:
+        reader = csv.reader(f, delimiter="\t", quoting=csv.QUOTE_NONE)
+        next(reader, None)
+        for row in reader:
+            if len(row) < 3 or not row[1].strip():
+                continue
+            texts.append(row[1])
+            labels.append(int(row[2]))
+            if limit and len(texts) >= limit:
+                break
+    return texts, labels
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--train", required=True)
+    parser.add_argument("--output", default=SENTIMENT_TIER_MODEL_PATH)
+    parser.add_argument("--n-features", type=int, default=2 ** 20)
+    parser.add_argument("--ngram-max", type=int, default=3)
+    parser.add_argument("--epochs", type=int, default=5)
+    parser.add_argument("--limit", type=int, default=None)
+    args = parser.parse_args()
+
+    texts, labels = load_nsmc(args.train, args.limit)
+    print(f"학습 문장 수: {len(texts)} (positive {sum(labels)} / negative {len(labels) - sum(labels)})")
+
+    started = time.time()
+    classifier = train_hashed_ngram(texts, labels, n_features=args.n_features, ngram_max=args.ngram_max, epochs=args.epochs)
+    classifier.save(args.output)
+    print(f"✅ 저장: {args.output} ({time.time() - started:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
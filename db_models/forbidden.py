@@ -9,4 +9,14 @@ class ForbiddenWord(Base):
     id = Column(Integer, primary_key=True, index=True)
     word = Column(Unicode(100), nullable=False, unique=True)
     decomposed_word = Column(Unicode(255), nullable=False)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
\ No newline at end of file
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+class ForbiddenWordChange(Base):
+    """금칙어 변경 이력 (워커 간 트라이 동기화용 change feed, id = 목록 버전)"""
+    __tablename__ = "forbidden_word_changes"
+
+    id = Column(Integer, primary_key=True, index=True)
+    word = Column(Unicode(100), nullable=False)
+    decomposed_word = Column(Unicode(255), nullable=True)
+    operation = Column(Unicode(10), nullable=False)  # "add" / "remove"
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
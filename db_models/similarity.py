@@ -10,6 +10,7 @@ class SensitiveWord(Base):
     word = Column(Unicode(100), nullable=False, unique=True)        
     embedding = Column(LargeBinary, nullable=False)
     model_name = Column(Unicode(100), nullable=False)                
+    embedding_encoding = Column(Unicode(10), nullable=True)  # NULL = float32 (기존 행)
 
 class UserSensitiveWord(Base):
     __tablename__ = "user_sensitive_words"
@@ -15,6 +15,7 @@ CREATE TABLE sensitive_words (
     word NVARCHAR(255) NOT NULL,
     embedding VARBINARY(MAX) NOT NULL,
     model_name NVARCHAR(100) NOT NULL,
+    embedding_encoding NVARCHAR(10) NULL,
     created_at DATETIME DEFAULT GETDATE()
 );
 GO
@@ -35,4 +36,14 @@ CREATE TABLE forbidden_words (
     decomposed_word NVARCHAR(255) NULL,
     created_at DATETIME DEFAULT GETDATE()
 );
+GO
+
+-- 🔁 금칙어 변경 이력 (워커 간 동기화용)
+CREATE TABLE forbidden_word_changes (
+    id INT IDENTITY(1,1) PRIMARY KEY,
+    word NVARCHAR(100) NOT NULL,
+    decomposed_word NVARCHAR(255) NULL,
+    operation NVARCHAR(10) NOT NULL,
+    created_at DATETIME DEFAULT GETDATE()
+);
 GO
\ No newline at end of file
@@ -1,13 +1,34 @@
 # main.py
 from fastapi import FastAPI
 import app.state as state  
-from app.routers import forbidden, sentiment, similarity, db
-from app.filter_utils.forbidden_utils import load_automaton_from_db
+from fastapi import Request
+from fastapi.responses import JSONResponse
+from app.routers import forbidden, sentiment, similarity, db, inference, filter_pipeline, health
+from app.lifecycle import lifecycle, READY
+from app.filter_utils.forbidden_utils import load_automaton, start_forbidden_sync
+from app.filter_utils.sentiment_utils import (
+    load_sentiment_model,
+    reload_sentiment_model_in_worker,
+    warmup_sentiment_model
+)
+from app.filter_utils.similarity_utils import (
+    sensitive_gc,
+    reembed_job,
+    load_vector_index,
+    start_vector_index_autosave,
+    load_embedding_model,
+    reload_embedding_model_in_worker,
+    warmup_embedding_model
+)
+from app.filter_utils.inference_pool import inference_pool
+from app.schemas.common import StandardResponse, StatusEnum
+from app.config import SIMILARITY_REEMBED_AUTO_START, INFERENCE_WARMUP_TIMEOUT_SEC
 
 # ✅ 추가: ORM 테이블 생성용 import
+from sqlalchemy import text
 from app.database import engine
 from db_models.similarity import SensitiveWord, UserSensitiveWord
-from db_models.forbidden import ForbiddenWord
+from db_models.forbidden import ForbiddenWord, ForbiddenWordChange
 
 app = FastAPI()
 
@@ -15,25 +36,124 @@ app.include_router(forbidden.router, prefix="/forbidden")
 app.include_router(sentiment.router, prefix="/sentiment")
 app.include_router(similarity.router, prefix="/similarity")
 app.include_router(db.router, prefix="/db")  
+app.include_router(inference.router, prefix="/inference")
+app.include_router(filter_pipeline.router, prefix="/filter")
+app.include_router(health.router, prefix="/health")
+
+# 준비 전에도 응답하는 경로 (헬스 체크, 문서, 통계)
+UNGATED_PATHS = ("/health", "/docs", "/redoc", "/openapi.json", "/inference", "/db")
+
+
+@app.middleware("http")
+async def readiness_gate(request: Request, call_next):
+    """모델 / 트라이 로딩이 끝나기 전 요청은 503 (로드 밸런서는 /health/ready 로 판단)"""
+    path = request.url.path
+    if not lifecycle.ready and path != "/" and not path.startswith(UNGATED_PATHS):
+        return JSONResponse(
+            status_code=503,
+            content=StandardResponse(
+                status=StatusEnum.ERROR,
+                message="서비스 준비 중입니다.",
+                data=lifecycle.stats()
+            ).model_dump()
+        )
+    return await call_next(request)
 
 @app.get("/")
 def read_root():
     return {"message": "Hello, FastAPI!!!"}
 
 
+# 기동 구성 요소 (required=False 는 실패해도 트래픽을 받음)
+lifecycle.register("database")
+lifecycle.register("sentiment_model")
+lifecycle.register("embedding_model")
+lifecycle.register("forbidden_automaton")
+lifecycle.register("vector_index", required=False)
+lifecycle.register("warmup")
+lifecycle.register("background_jobs", required=False)
+
+# 추론 워커는 시작 시 자기 프로세스에서 (ONNX 세션 재생성 후) warmup (재시도해도 한 번만 등록)
+inference_pool.on_worker_start(reload_sentiment_model_in_worker)
+inference_pool.on_worker_start(reload_embedding_model_in_worker)
+inference_pool.on_worker_start(warmup_sentiment_model)
+inference_pool.on_worker_start(warmup_embedding_model)
+
+
+def _prepare_database():
+    # ORM 테이블 생성 (존재하지 않을 경우만)
+    ForbiddenWord.metadata.create_all(bind=engine)
+    ForbiddenWordChange.metadata.create_all(bind=engine)
+    SensitiveWord.metadata.create_all(bind=engine)
+    UserSensitiveWord.metadata.create_all(bind=engine)
+
+    # 기존 테이블에 임베딩 형식 컬럼 추가 (NULL = float32)
+    with engine.begin() as conn:
+        conn.execute(text(
+            "IF COL_LENGTH('sensitive_words', 'embedding_encoding') IS NULL "
+            "ALTER TABLE sensitive_words ADD embedding_encoding NVARCHAR(10) NULL"
+        ))
+
+
+def _load_forbidden():
+    # 스냅샷 우선, 불일치 시 DB 전체 재빌드
+    load_automaton()
+
+    if state.forbidden_automaton:
+        print("✅ 금칙어 로딩 완료.")
+    else:
+        print("⚠️ [주의] 금칙어가 DB에 존재하지 않아 트라이가 비어 있습니다. → 금칙어를 먼저 등록하세요.")
+
+
+def _warmup_models():
+    if inference_pool.workers:
+        # 로드된 모델을 fork 로 공유하는 워커를 띄우고, 워커마다 자기 프로세스에서 warmup
+        # (부모가 torch 추론을 먼저 돌리면 fork 된 워커의 OpenMP 스레드 풀이 망가질 수 있어 부모에서는 하지 않음)
+        inference_pool.start()
+        if not inference_pool.wait_warm(INFERENCE_WARMUP_TIMEOUT_SEC):
+            raise TimeoutError(f"추론 워커 warmup 이 {INFERENCE_WARMUP_TIMEOUT_SEC}s 안에 끝나지 않았습니다.")
+    else:
+        warmup_sentiment_model()
+        warmup_embedding_model()
+
+
+def _start_background_jobs():
+    # 스레드를 만드는 작업은 모두 여기서 시작 (추론 워커 fork 이후 → 자식이 다른 스레드가 잡은 락을 물려받지 않음)
+    if lifecycle.components["forbidden_automaton"].state == READY:
+        start_forbidden_sync()
+    if lifecycle.components["vector_index"].state == READY:
+        start_vector_index_autosave()
+
+    # 고아 민감 단어 정리 작업 (삭제 요청 시 즉시 + 주기 실행)
+    sensitive_gc.start()
+
+    # 다른 모델로 만든 민감 단어 임베딩이 남아 있으면 재임베딩 시작 (applock 으로 한 워커만 실행, 나머지는 끝날 때까지 대기 후 반영)
+    if SIMILARITY_REEMBED_AUTO_START and reembed_job.count_stale() > 0:
+        reembed_job.start()
+
+
+def _startup_plan():
+    # ✅ 1단계: DB 스키마 준비
+    lifecycle.run("database", _prepare_database)
+
+    # ✅ 2단계: 모델 2개 + 금칙어 트라이 + 벡터 인덱스 병렬 로딩
+    lifecycle.run_parallel({
+        "sentiment_model": load_sentiment_model,
+        "embedding_model": load_embedding_model,
+        "forbidden_automaton": _load_forbidden,
+        "vector_index": load_vector_index,
+    })
+
+    # ✅ 3단계: 대표 길이 forward pass 로 warmup (추론 워커 풀 사용 시 워커 fork 후 워커에서)
+    #    2단계는 로딩 스레드가 모두 끝난 뒤 반환 → 이 시점 부모에는 백그라운드 스레드가 없음
+    if lifecycle.components["sentiment_model"].state == READY and lifecycle.components["embedding_model"].state == READY:
+        lifecycle.run("warmup", _warmup_models)
+
+    # ✅ 4단계: 백그라운드 작업 (금칙어 동기화, 인덱스 자동 저장, 고아 단어 정리, 재임베딩)
+    lifecycle.run("background_jobs", _start_background_jobs)
+
+
 @app.on_event("startup")
 def on_startup():
-    try:
-        # ✅ 1단계: ORM 테이블 생성 (존재하지 않을 경우만)
-        ForbiddenWord.metadata.create_all(bind=engine)
-        SensitiveWord.metadata.create_all(bind=engine)
-        UserSensitiveWord.metadata.create_all(bind=engine)
-
-        state.forbidden_automaton = load_automaton_from_db()
-
-        if state.forbidden_automaton:
-            print("✅ 금칙어 로딩 완료.")
-        else:
-            print("⚠️ [주의] 금칙어가 DB에 존재하지 않아 트라이가 비어 있습니다. → 금칙어를 먼저 등록하세요.")
-    except Exception as e:
-        print(f"❌ [오류] 금칙어 로딩 중 예외 발생: {e}")
\ No newline at end of file
+    # 로딩은 백그라운드에서 진행 → /health/live 는 바로 응답, /health/ready 는 준비 완료 후 200
+    lifecycle.start(_startup_plan)
@@ -0,0 +1,67 @@
+# tests/test_forbidden_confirm.py
+"""자모 후보 확정 규칙 회귀 케이스 (띄어 쓴 구간이 다른 어절에 걸치는 오탐)"""
+
+import pytest
+
+for _module in ("hgtk", "ahocorasick", "konlpy", "pyodbc", "sqlalchemy"):
+    pytest.importorskip(_module)
+
+from app.filter_utils.forbidden_utils import _confirm_candidates
+
+
+def _jamo_candidate(message: str, word: str, start: int, end: int) -> dict:
+    return {"word": word, "start": start, "end": end, "method": "자모"}
+
+
+def _no_tokens(text: str) -> list[str]:
+    return []
+
+
+class _RecordingTokenizer:
+    def __init__(self, tokens: dict[str, list[str]]):
+        self.tokens = tokens
+        self.calls = []
+
+    def __call__(self, text: str) -> list[str]:
+        self.calls.append(text)
+        return self.tokens.get(text, [])
+
+
+@pytest.mark.parametrize("message, word, start, end, collapsed", [
+    ("이거 바 보면 알아", "바보", 3, 6, "바보면"),
+    ("이 개 새로 샀어", "개새", 2, 5, "개새로"),
+    ("시 발점에서 출발", "시발", 0, 3, "시발점에서"),
+])
+def test_spaced_span_inside_eojeol_needs_token(message, word, start, end, collapsed):
+    tokenizer = _RecordingTokenizer({})
+    matches = _confirm_candidates(message, [_jamo_candidate(message, word, start, end)], set(), tokenizer)
+    assert matches == []
+    assert tokenizer.calls == [collapsed]
+
+
+def test_spaced_span_inside_eojeol_accepted_when_token():
+    message = "너 바 보야"
+    tokenizer = _RecordingTokenizer({"바보야": ["바보"]})
+    matches = _confirm_candidates(message, [_jamo_candidate(message, "바보", 2, 5)], set(), tokenizer)
+    assert [m["word"] for m in matches] == ["바보"]
+
+
+@pytest.mark.parametrize("message, word, start, end", [
+    ("너 바 보", "바보", 2, 5),
+    ("시 발 진짜", "시발", 0, 3),
+])
+def test_spaced_span_on_eojeol_boundaries_accepted(message, word, start, end):
+    matches = _confirm_candidates(message, [_jamo_candidate(message, word, start, end)], set(), _no_tokens)
+    assert [(m["word"], m["start"], m["end"]) for m in matches] == [(word, start, end)]
+
+
+def test_jamo_span_accepted():
+    message = "ㅅㅣ발 뭐야"
+    matches = _confirm_candidates(message, [_jamo_candidate(message, "시발", 0, 3)], set(), _no_tokens)
+    assert [m["word"] for m in matches] == ["시발"]
+
+
+def test_complete_syllables_left_to_original_check():
+    message = "시발점"
+    matches = _confirm_candidates(message, [_jamo_candidate(message, "시발", 0, 2)], set(), _no_tokens)
+    assert matches == []